@@ -5,12 +5,23 @@
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PATH
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 
-from .const import CONFIG_FLOW_VERSION, DEFAULT_PATH, LOGGER, PLATFORMS
+from .const import (
+    CONFIG_FLOW_VERSION,
+    DEFAULT_PATH,
+    DOMAIN,
+    LOGGER,
+    PLATFORMS,
+    STORAGE_VERSION,
+)
 from .coordinator import BabyBuddyConfigEntry, BabyBuddyCoordinator, BabyBuddyData
 from .services import async_setup_services
 
+# Stores kept per config entry.
+STORES = ("endpoints", "history", "snapshot", "write_queue")
+
 
 # async_setup is for the initial setup of the integration itself
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
@@ -27,15 +38,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: BabyBuddyConfigEntry) ->
     coordinator = BabyBuddyCoordinator(hass, entry)
     entry.runtime_data = BabyBuddyData(coordinator=coordinator, entities={})
 
-    # Fetch initial data so we have data when entities subscribe
+    # Entities start from the data of the last run, if saved, while the
+    # first refresh runs in the background.
     #
+    # Otherwise fetch initial data so we have data when entities subscribe.
     # If the refresh fails, async_config_entry_first_refresh will
     # raise ConfigEntryNotReady and setup will try again later
-    #
-    # If you do not want to retry setup on failure, use
-    # coordinator.async_refresh() instead
 
-    await coordinator.async_config_entry_first_refresh()
+    if await coordinator.async_restore_snapshot():
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+    if coordinator.history.enabled:
+        await coordinator.history.async_start()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
@@ -46,6 +63,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: BabyBuddyConfigEntry) -
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the data stored for a babybuddy config entry."""
+    for name in STORES:
+        await Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.{name}"
+        ).async_remove()
+
+
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle migration of config entries."""
 
@@ -0,0 +1,51 @@
+"""Platform for babybuddy binary sensor integration."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import ATTR_MEDICATION
+from .coordinator import BabyBuddyConfigEntry, BabyBuddyCoordinator
+from .entity import BabyBuddyChildNextDoseSensor
+
+
+# For a platform to support config entries, it will need to add a setup entry function
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: BabyBuddyConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the babybuddy binary sensors."""
+    coordinator = entry.runtime_data.coordinator
+    tracked: dict = {}
+
+    @callback
+    def update_entities() -> None:
+        """Update the status of entities."""
+        update_items(coordinator, tracked, async_add_entities)
+
+    entry.async_on_unload(coordinator.async_add_listener(update_entities))
+
+    update_entities()
+
+
+@callback
+def update_items(
+    coordinator: BabyBuddyCoordinator,
+    tracked: dict,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add next dose sensors to children with a medication entry."""
+    new_entities = []
+    if coordinator.data:
+        for child in coordinator.data.children.values():
+            if child.id not in tracked and coordinator.data.entry(
+                child.id, ATTR_MEDICATION
+            ):
+                tracked[child.id] = BabyBuddyChildNextDoseSensor(
+                    coordinator.child_coordinators[child.id], child
+                )
+                new_entities.append(tracked[child.id])
+        if new_entities:
+            async_add_entities(new_entities)
@@ -3,115 +3,467 @@
 from __future__ import annotations
 
 import asyncio
-from asyncio import TimeoutError as AsyncIOTimeoutError
-from datetime import datetime, time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Mapping
+from contextlib import aclosing
+from dataclasses import dataclass
+from datetime import date, datetime, time
+import hashlib
 from http import HTTPStatus
+import logging
+from time import monotonic
 from typing import Any
+from urllib.parse import urlencode
 
-from aiohttp.client import ClientSession
+from aiohttp import hdrs
+from aiohttp.client import ClientResponse, ClientSession
 from aiohttp.client_exceptions import ClientError, ClientResponseError
 
 from homeassistant.const import ATTR_DATE, ATTR_TIME
 from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
-from .const import LOGGER
+from .const import (
+    ATTR_NEXT,
+    ATTR_RESULTS,
+    ATTR_START,
+    DEBUG_BODY_LIMIT,
+    LOGGER,
+    PAGE_SIZE,
+    PROBE_TIMEOUT,
+    REQUEST_TIMEOUTS,
+    RESPONSE_CACHE_SIZE,
+    RETRY_ATTEMPTS,
+)
 from .errors import AuthorizationError, ConnectError, ValidationError
+from .resilience import CircuitBreaker, backoff_delay
+from .stats import BabyBuddyStats
+
+# Requests that can safely be sent again if no answer came back.
+IDEMPOTENT_METHODS = frozenset({hdrs.METH_GET, hdrs.METH_HEAD, hdrs.METH_DELETE})
+
+
+@dataclass
+class CachedResponse:
+    """Validators and parsed body of a GET response."""
+
+    etag: str | None
+    last_modified: str | None
+    digest: bytes
+    data: Any
 
 
 class BabyBuddyClient:
     """Class for babybuddy API interface."""
 
     def __init__(
-        self, host: str, port: int, path: str, api_key: str, session: ClientSession
+        self,
+        host: str,
+        port: int,
+        path: str,
+        api_key: str,
+        session: ClientSession,
+        *,
+        timeouts: Mapping[str, float] | None = None,
     ) -> None:
-        """Initialize the client."""
+        """Initialize the client.
+
+        timeouts maps HTTP verbs to request timeouts in seconds, overriding
+        REQUEST_TIMEOUTS.
+        """
         LOGGER.debug("Initializing BabyBuddyClient")
         self.headers = {"Authorization": f"Token {api_key}"}
-        LOGGER.debug(
-            f"Client API Token, obfuscated: {api_key[:4]}{'.' * (len(api_key) - 8)}{api_key[-4:]}"
+        self.api_key = api_key
+        self.api_key_obfuscated = (
+            f"{api_key[:4]}{'.' * (len(api_key) - 8)}{api_key[-4:]}"
         )
+        LOGGER.debug("Client API Token, obfuscated: %s", self.api_key_obfuscated)
         self.url = f"{host}:{port}{path}"
         LOGGER.debug(f"Client URL: {host}:{port}{path}")
         self.session = session
         self.endpoints: dict[str, str] = {}
+        # The endpoint map was restored from storage and not confirmed yet.
+        self.endpoints_cached = False
+        self.cache: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.in_flight: dict[str, asyncio.Task[Any]] = {}
+        self.coalesced = 0
+        self.timeouts = {**REQUEST_TIMEOUTS, **(timeouts or {})}
+        self.breaker = CircuitBreaker(f"{host}:{port}")
+        self.retries = 0
+        self.stats = BabyBuddyStats()
+
+    async def async_request(
+        self, method: str, url: str, *, timeout: float | None = None, **kwargs: Any
+    ) -> tuple[ClientResponse, bytes]:
+        """Send a request and read its body, retrying and breaking circuits.
+
+        Idempotent requests are retried with jittered backoff on timeouts,
+        connection errors and 5xx responses. Every failure counts towards
+        the host's circuit breaker; while it is open, requests fail at once
+        with CircuitOpenError. The last failure is raised, or for a 5xx the
+        response is returned, once retries run out. timeout overrides the
+        timeout of the verb for each attempt.
+        """
+        await self.breaker.async_check(self.async_probe)
+        kwargs.setdefault("headers", self.headers)
+        attempts = RETRY_ATTEMPTS if method in IDEMPOTENT_METHODS else 1
+        attempt = 1
+        endpoint = self.endpoint_name(url)
+        while True:
+            start = monotonic()
+            try:
+                async with asyncio.timeout(timeout or self.timeouts[method]):
+                    resp = await self.session.request(method, url, **kwargs)
+                    body = await resp.read()
+            except (TimeoutError, ClientError) as error:
+                self.stats.record_request(
+                    endpoint, monotonic() - start, error=type(error).__name__
+                )
+                self.breaker.record_failure()
+                if attempt >= attempts or self.breaker.is_open:
+                    raise
+                LOGGER.debug(f"{method} {url} failed, retrying. error: {error}")
+            else:
+                self.stats.record_request(
+                    endpoint,
+                    monotonic() - start,
+                    len(body),
+                    f"http_{resp.status}"
+                    if resp.status >= HTTPStatus.BAD_REQUEST
+                    else None,
+                )
+                if resp.status < HTTPStatus.INTERNAL_SERVER_ERROR:
+                    self.breaker.record_success()
+                    return resp, body
+                self.breaker.record_failure()
+                if attempt >= attempts or self.breaker.is_open:
+                    return resp, body
+                LOGGER.debug(f"{method} {url} answered {resp.status}, retrying")
+            self.retries += 1
+            await asyncio.sleep(backoff_delay(attempt))
+            attempt += 1
+
+    def endpoint_name(self, url: str) -> str:
+        """Return the name of the endpoint a URL belongs to, for stats."""
+        for name, endpoint_url in self.endpoints.items():
+            if url.startswith(endpoint_url):
+                return name
+        return "api"
+
+    async def async_probe(self) -> bool:
+        """Return whether babybuddy answers a single cheap request."""
+        try:
+            async with asyncio.timeout(PROBE_TIMEOUT):
+                resp = await self.session.head(f"{self.url}/api/", headers=self.headers)
+                resp.release()
+        except (TimeoutError, ClientError):
+            return False
+        return resp.status < HTTPStatus.INTERNAL_SERVER_ERROR
 
     async def async_get(
-        self, endpoint: str | None = None, entry: str | None = None
+        self,
+        endpoint: str | None = None,
+        entry: str | None = None,
+        *,
+        cache: bool = True,
     ) -> Any:
-        """GET request to babybuddy API."""
-        url = f"{self.url}/api/"
-        if endpoint:
-            url = self.endpoints[endpoint]
-            if entry:
-                url = f"{url}{entry}"
-        async with asyncio.timeout(10):
-            LOGGER.debug(f"GET URL: {url}")
-            resp = await self.session.get(
-                url=url,
-                headers=self.headers,
-                raise_for_status=True,
+        """GET request to babybuddy API.
+
+        A 404 from an endpoint of a cached endpoint map rediscovers the map
+        and retries once, in case babybuddy moved the endpoint.
+        """
+        if not endpoint:
+            return await self.async_get_url(f"{self.url}/api/", cache=cache)
+        try:
+            return await self.async_get_url(
+                f"{self.endpoints[endpoint]}{entry or ''}", cache=cache
             )
+        except ClientResponseError as error:
+            if error.status != HTTPStatus.NOT_FOUND or not self.endpoints_cached:
+                raise
+            try:
+                await self.async_connect()
+            except (AuthorizationError, ConnectError):
+                raise error from None
+            if endpoint not in self.endpoints:
+                raise
+        return await self.async_get_url(
+            f"{self.endpoints[endpoint]}{entry or ''}", cache=cache
+        )
 
-        LOGGER.debug(f"GET response: {await resp.text()}")
-        return await resp.json()
+    async def async_get_url(self, url: str, *, cache: bool = True) -> Any:
+        """GET request to a babybuddy API URL, e.g. a paginated 'next' link.
 
-    async def async_post(
-        self, endpoint: str, data: dict[str, Any], call_time: datetime | None = None
-    ) -> None:
-        """POST request to babybuddy API."""
-        LOGGER.debug(f"POST data: {data}")
+        Concurrent callers asking for the same URL share one request and its
+        result. The request is shielded so a cancelled caller does not cancel
+        it for the others.
+        """
+        task = self.in_flight.get(url)
+        if task is not None:
+            LOGGER.debug("GET URL: %s (coalesced)", url)
+            self.coalesced += 1
+        else:
+            task = asyncio.get_running_loop().create_task(
+                self.async_fetch_url(url, cache=cache)
+            )
+            self.in_flight[url] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(url, None))
+        return await asyncio.shield(task)
+
+    async def async_fetch_url(self, url: str, *, cache: bool = True) -> Any:
+        """Fetch a babybuddy API URL, revalidating any cached response.
+
+        Without cache the response is neither revalidated nor kept.
+        """
+        headers = self.headers
+        cached = self.cache.get(url) if cache else None
+        if cached is not None:
+            self.cache.move_to_end(url)
+            headers = {**self.headers}
+            if cached.etag:
+                headers[hdrs.IF_NONE_MATCH] = cached.etag
+            if cached.last_modified:
+                headers[hdrs.IF_MODIFIED_SINCE] = cached.last_modified
+
+        LOGGER.debug("GET URL: %s", url)
+        resp, body = await self.async_request(hdrs.METH_GET, url, headers=headers)
+        resp.raise_for_status()
+
+        if cached is not None and resp.status == HTTPStatus.NOT_MODIFIED:
+            LOGGER.debug("GET response: not modified")
+            self.cache_hits += 1
+            return cached.data
+
+        if not cache:
+            self.log_response_body(body)
+            return decode_json(body)
+
+        # Servers that send no validators still get the parsed object reused
+        # when the body is byte-for-byte the same as last time.
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if cached is not None and cached.digest == digest:
+            LOGGER.debug("GET response: unchanged")
+            self.cache_hits += 1
+            data = cached.data
+        else:
+            self.log_response_body(body)
+            self.cache_misses += 1
+            data = decode_json(body)
+
+        self.cache[url] = CachedResponse(
+            etag=resp.headers.get(hdrs.ETAG),
+            last_modified=resp.headers.get(hdrs.LAST_MODIFIED),
+            digest=digest,
+            data=data,
+        )
+        if len(self.cache) > RESPONSE_CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return data
+
+    async def async_iter_pages(
+        self,
+        endpoint: str,
+        *,
+        child: int | None = None,
+        date_min: date | datetime | str | None = None,
+        date_max: date | datetime | str | None = None,
+        ordering: str | None = None,
+        page_size: int = PAGE_SIZE,
+        prefetch: bool = True,
+        cache: bool = False,
+        **filters: Any,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield the pages of an endpoint's list, following the 'next' links.
+
+        child, date_min, date_max, ordering and any other filters are sent
+        as babybuddy query parameters; dates are sent in ISO format and None
+        leaves a filter out. With prefetch, the next page is fetched while
+        the caller works through the current one, so at most two pages are
+        held at a time. Pages are only kept in the response cache with
+        cache, so walking a long history does not fill it.
+
+        Breaking out of the loop stops paging and cancels the page being
+        prefetched once the generator is closed; use contextlib.aclosing to
+        close it right away.
+        """
+        params: dict[str, Any] = {
+            key: value.isoformat() if isinstance(value, date) else value
+            for key, value in {
+                "child": child,
+                "date_min": date_min,
+                "date_max": date_max,
+                "ordering": ordering,
+                **filters,
+            }.items()
+            if value is not None
+        }
+        params["limit"] = page_size
+        page = await self.async_get(endpoint, f"?{urlencode(params)}", cache=cache)
+        next_page: asyncio.Task[Any] | None = None
         try:
-            async with asyncio.timeout(10):
-                resp = await self.session.post(
-                    self.endpoints[endpoint],
-                    headers=self.headers,
-                    data=data,
+            while True:
+                url = page.get(ATTR_NEXT)
+                if url and prefetch:
+                    # Not coalesced, so that an abandoned prefetch can be
+                    # cancelled along with its request.
+                    next_page = asyncio.get_running_loop().create_task(
+                        self.async_fetch_url(url, cache=cache)
+                    )
+                yield page
+                if not url:
+                    return
+                if next_page is None:
+                    page = await self.async_get_url(url, cache=cache)
+                else:
+                    page = await next_page
+                    next_page = None
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+                # Nobody awaits it any more; retrieve its error, if any.
+                next_page.add_done_callback(
+                    lambda task: task.cancelled() or task.exception()
                 )
 
-            if resp.status != HTTPStatus.CREATED:
-                error = await resp.json()
-                LOGGER.error(
-                    f"Could not create {endpoint}. error: {error}. Please upgrade to babybuddy v1.11.0. In the meantime, attempting to use 'now()'..."
-                )
+    async def async_iter_records(
+        self, endpoint: str, **kwargs: Any
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield the records of an endpoint's list across its pages.
 
-                # crude backward compatibility fix for babybuddy < v1.11.0
-                if error == {"time": ["This field is required."]}:
-                    data[ATTR_TIME] = call_time
-                    await self.async_post(endpoint, data)
-                if error == {"date": ["This field is required."]}:
-                    data[ATTR_DATE] = call_time
-                    await self.async_post(endpoint, data)
+        Takes the same arguments as async_iter_pages.
+        """
+        async with aclosing(self.async_iter_pages(endpoint, **kwargs)) as pages:
+            async for page in pages:
+                for record in page[ATTR_RESULTS]:
+                    yield record
 
-        except (AsyncIOTimeoutError, ClientError) as error:
-            LOGGER.error(error)
+    def log_response_body(self, body: bytes) -> None:
+        """Log a response body, truncated and with the api key obfuscated."""
+        if not LOGGER.isEnabledFor(logging.DEBUG):
+            return
+        LOGGER.debug("GET response: %s", self.body_text(body))
+
+    def body_text(self, body: bytes) -> str:
+        """Return a response body as text, truncated and with the api key obfuscated."""
+        text = body[:DEBUG_BODY_LIMIT].decode(errors="replace")
+        if self.api_key:
+            text = text.replace(self.api_key, self.api_key_obfuscated)
+        if len(body) > DEBUG_BODY_LIMIT:
+            text = f"{text}... ({len(body)} bytes)"
+        return text
+
+    def decode_error(self, body: bytes) -> Any:
+        """Decode an error response, or return its text if it is not JSON.
 
-    async def async_delete(self, endpoint: str, entry: str) -> None:
-        """DELETE request to babybuddy API."""
+        A reverse proxy or a Django debug page answers errors with HTML.
+        """
         try:
-            async with asyncio.timeout(10):
-                resp = await self.session.delete(
-                    f"{self.endpoints[endpoint]}{entry}/",
-                    headers=self.headers,
-                )
+            return decode_json(body)
+        except ValueError:
+            return self.body_text(body)
+
+    async def async_post(
+        self,
+        endpoint: str,
+        data: dict[str, Any],
+        call_time: datetime | None = None,
+        *,
+        timeout: float | None = None,
+    ) -> dict[str, Any] | None:
+        """POST request to babybuddy API.
+
+        Returns the created entry, or None if babybuddy rejected it. Raises
+        ConnectError if babybuddy could not be reached or failed to answer,
+        in which case the entry may be sent again later.
+        """
+        LOGGER.debug(f"POST data: {data}")
+        try:
+            resp, body = await self.async_request(
+                hdrs.METH_POST, self.endpoints[endpoint], timeout=timeout, data=data
+            )
+        except (TimeoutError, ClientError) as error:
+            LOGGER.error(error)
+            raise ConnectError(error) from error
+
+        if resp.status == HTTPStatus.CREATED:
+            return decode_json(body)
+        if resp.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            LOGGER.error(f"Could not create {endpoint}. status: {resp.status}")
+            raise ConnectError(f"babybuddy answered {resp.status}")
 
-            if resp.status != 204:
-                error = await resp.json()
-                LOGGER.error(f"Could not delete {endpoint}/{entry}. error: {error}")
+        error = self.decode_error(body)
+        LOGGER.error(
+            f"Could not create {endpoint}. error: {error}. Please upgrade to babybuddy v1.11.0. In the meantime, attempting to use 'now()'..."
+        )
+
+        # crude backward compatibility fix for babybuddy < v1.11.0
+        if error == {"time": ["This field is required."]}:
+            data[ATTR_TIME] = call_time
+            return await self.async_post(endpoint, data, timeout=timeout)
+        if error == {"date": ["This field is required."]}:
+            data[ATTR_DATE] = call_time
+            return await self.async_post(endpoint, data, timeout=timeout)
+
+        return None
+
+    async def async_delete(
+        self, endpoint: str, entry: str, *, timeout: float | None = None
+    ) -> None:
+        """DELETE request to babybuddy API.
 
-        except (AsyncIOTimeoutError, ClientError) as error:
+        An entry that is already gone counts as deleted. Raises ConnectError
+        if babybuddy could not be reached or failed to answer.
+        """
+        try:
+            resp, body = await self.async_request(
+                hdrs.METH_DELETE, f"{self.endpoints[endpoint]}{entry}/", timeout=timeout
+            )
+        except (TimeoutError, ClientError) as error:
             LOGGER.error(error)
+            raise ConnectError(error) from error
+
+        if resp.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            LOGGER.error(f"Could not delete {endpoint}/{entry}. status: {resp.status}")
+            raise ConnectError(f"babybuddy answered {resp.status}")
+        if resp.status not in (HTTPStatus.NO_CONTENT, HTTPStatus.NOT_FOUND):
+            LOGGER.error(
+                f"Could not delete {endpoint}/{entry}. error: {self.decode_error(body)}"
+            )
 
     async def async_connect(self) -> None:
         """Check connection to babybuddy API."""
         try:
             self.endpoints = await self.async_get()
+            self.endpoints_cached = False
             LOGGER.debug(f"Endpoints: {self.endpoints}")
         except ClientResponseError as error:
+            if error.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                raise ConnectError(error) from error
             raise AuthorizationError from error
         except (TimeoutError, ClientError) as error:
             raise ConnectError(error) from error
 
 
+def decode_json(body: bytes) -> Any:
+    """Decode a response body in a single pass, straight from bytes."""
+    return json_loads(body)
+
+
+def since_filter(order_key: str, since: datetime | None) -> dict[str, str]:
+    """Return the babybuddy filter for records from a point in time on."""
+    if since is None:
+        return {}
+    if order_key == ATTR_START:
+        return {"start_min": since.isoformat()}
+    if order_key == ATTR_DATE:
+        return {"date_min": dt_util.as_local(since).date().isoformat()}
+    if order_key == ATTR_TIME:
+        return {"date_min": since.isoformat()}
+    return {}
+
+
 def get_datetime_from_time(value: datetime | time) -> datetime:
     """Return datetime for start/end/time service fields."""
     if isinstance(value, time):
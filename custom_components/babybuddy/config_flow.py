@@ -25,16 +25,25 @@
 
 from .client import BabyBuddyClient
 from .const import (
+    CONF_BULK_REFRESH,
+    CONF_DAILY_COUNTERS,
     CONF_FEEDING_UNIT,
+    CONF_IMPORT_HISTORY,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_TIMEOUTS,
     CONF_WEIGHT_UNIT,
     CONFIG_FLOW_VERSION,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
     DEFAULT_NAME,
     DEFAULT_PATH,
     DEFAULT_PORT,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    REQUEST_TIMEOUTS,
+    SENSOR_TYPES,
 )
 from .errors import AuthorizationError, ConnectError
+from .scheduler import poll_interval_option
 
 DATA_SCHEMA = vol.Schema(
     {
@@ -160,8 +169,16 @@ async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Manage babybuddy options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            # An endpoint cannot poll more often than the coordinator ticks.
+            scan_interval = user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+            for description in SENSOR_TYPES:
+                option = poll_interval_option(description.key)
+                if user_input.get(option, scan_interval) < scan_interval:
+                    errors[option] = "poll_interval_too_short"
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
 
         options: dict[vol.Optional, Any] = {
             vol.Optional(
@@ -189,5 +206,46 @@ async def async_step_init(
                     CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                 ),
             ): cv.positive_int,
+            vol.Optional(
+                CONF_MAX_CONCURRENT_REQUESTS,
+                default=self.entry.options.get(
+                    CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                ),
+            ): vol.All(cv.positive_int, vol.Range(min=1)),
+            vol.Optional(
+                CONF_BULK_REFRESH,
+                default=self.entry.options.get(CONF_BULK_REFRESH, False),
+            ): cv.boolean,
+            **{
+                vol.Optional(
+                    option,
+                    default=self.entry.options.get(option, REQUEST_TIMEOUTS[method]),
+                ): vol.All(cv.positive_int, vol.Range(min=1))
+                for method, option in CONF_TIMEOUTS.items()
+            },
+            vol.Optional(
+                CONF_IMPORT_HISTORY,
+                default=self.entry.options.get(CONF_IMPORT_HISTORY, False),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_DAILY_COUNTERS,
+                default=self.entry.options.get(CONF_DAILY_COUNTERS, False),
+            ): cv.boolean,
         }
-        return self.async_show_form(step_id="init", data_schema=vol.Schema(options))
+        # Per-endpoint polling overrides; left empty, an endpoint polls at its
+        # own default interval, or the scan interval if it has none.
+        for description in SENSOR_TYPES:
+            option = poll_interval_option(description.key)
+            options[
+                vol.Optional(
+                    option,
+                    description={
+                        "suggested_value": (user_input or self.entry.options).get(
+                            option
+                        )
+                    },
+                )
+            ] = cv.positive_int
+        return self.async_show_form(
+            step_id="init", data_schema=vol.Schema(options), errors=errors
+        )
@@ -3,31 +3,71 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import timedelta
 import logging
-from typing import Final
+from typing import TYPE_CHECKING, Any, Final
 
 from homeassistant.components.select import SelectEntityDescription
 from homeassistant.components.sensor import SensorEntityDescription
 from homeassistant.components.sensor.const import SensorDeviceClass, SensorStateClass
 from homeassistant.components.switch import SwitchEntityDescription
-from homeassistant.const import ATTR_TIME, UnitOfTime
-from homeassistant.util import dt as dt_util
+from homeassistant.const import ATTR_DATE, ATTR_TIME, UnitOfInformation, UnitOfTime
+from homeassistant.helpers.typing import StateType
+
+if TYPE_CHECKING:
+    from .models import Entry
 
 LOGGER = logging.getLogger(__package__)
 
 DOMAIN: Final[str] = "babybuddy"
 
+CONF_BULK_REFRESH: Final[str] = "bulk_refresh"
+CONF_DAILY_COUNTERS: Final[str] = "daily_counters"
 CONF_FEEDING_UNIT: Final[str] = "feedings"
+CONF_IMPORT_HISTORY: Final[str] = "import_history"
+CONF_MAX_CONCURRENT_REQUESTS: Final[str] = "max_concurrent_requests"
+CONF_TIMEOUTS: Final[dict[str, str]] = {
+    "DELETE": "timeout_delete",
+    "GET": "timeout_get",
+    "POST": "timeout_post",
+}
 CONF_WEIGHT_UNIT: Final[str] = "weight"
 
 DEFAULT_NAME: Final[str] = "Baby Buddy"
 DEFAULT_PORT: Final[int] = 8000
 DEFAULT_PATH: Final[str] = ""
 DEFAULT_SCAN_INTERVAL: Final[int] = 60
+DEFAULT_MAX_CONCURRENT_REQUESTS: Final[int] = 4
+DEFAULT_MEASUREMENT_POLL_INTERVAL: Final[int] = 3600
+DEFAULT_POLL_MAX_BACKOFF: Final[int] = 16
+
+BULK_MAX_PAGES: Final[int] = 5
+BULK_PAGE_SIZE: Final[int] = 100
+DEBUG_BODY_LIMIT: Final[int] = 2048
+HISTORY_IMPORT_CHUNK: Final[int] = 500
+HISTORY_PAGE_SIZE: Final[int] = 200
+PAGE_SIZE: Final[int] = 100
+RESPONSE_CACHE_SIZE: Final[int] = 256
+LATENCY_SAMPLES: Final[int] = 256
+STORAGE_VERSION: Final[int] = 1
+SNAPSHOT_SAVE_DELAY: Final[int] = 10
+BREAKER_FAILURE_THRESHOLD: Final[int] = 5
+BREAKER_RESET_TIMEOUT: Final[int] = 30
+BREAKER_RESET_TIMEOUT_MAX: Final[int] = 300
+PROBE_TIMEOUT: Final[int] = 5
+REQUEST_TIMEOUTS: Final[dict[str, float]] = {"DELETE": 10, "GET": 10, "POST": 10}
+RETRY_ATTEMPTS: Final[int] = 3
+RETRY_BACKOFF_BASE: Final[float] = 0.5
+RETRY_BACKOFF_MAX: Final[float] = 5
+WRITE_INLINE_TIMEOUT: Final[int] = 3
+WRITE_QUEUE_MATCH_LIMIT: Final[int] = 20
+WRITE_QUEUE_RETRY_MAX: Final[int] = 300
+WRITE_QUEUE_RETRY_MIN: Final[int] = 5
 
 CONFIG_FLOW_VERSION: Final[int] = 2
 
+ATTR_ACTION: Final[str] = "action"
 ATTR_AMOUNT: Final[str] = "amount"
 ATTR_BABYBUDDY_CHILD: Final[str] = "babybuddy_child"
 ATTR_BIRTH_DATE: Final[str] = "birth_date"
@@ -42,6 +82,9 @@
 ATTR_DOSAGE_UNIT: Final[str] = "dosage_unit"
 ATTR_DURATION: Final[str] = "duration"
 ATTR_END: Final[str] = "end"
+ATTR_ENDPOINTS: Final[str] = "endpoints"
+ATTR_ENTRIES: Final[str] = "entries"
+ATTR_ERROR: Final[str] = "error"
 ATTR_FEEDINGS: Final[str] = "feedings"
 ATTR_FIRST_NAME: Final[str] = "first_name"
 ATTR_HEAD_CIRCUMFERENCE_DASH: Final[str] = "head-circumference"
@@ -52,6 +95,7 @@
 ATTR_METHOD: Final[str] = "method"
 ATTR_MILESTONE: Final[str] = "milestone"
 ATTR_NAP: Final[str] = "nap"
+ATTR_NEXT: Final[str] = "next"
 ATTR_NEXT_DOSE_INTERVAL: Final[str] = "next_dose_interval"
 ATTR_NEXT_DOSE_READY: Final[str] = "next_dose_ready"
 ATTR_NEXT_DOSE_TIME: Final[str] = "next_dose_time"
@@ -59,11 +103,13 @@
 ATTR_NOTES: Final[str] = "notes"
 ATTR_PICTURE: Final[str] = "picture"
 ATTR_PUMPING: Final[str] = "pumping"
+ATTR_QUEUED: Final[str] = "queued"
 ATTR_RESULTS: Final[str] = "results"
 ATTR_SLEEP: Final[str] = "sleep"
 ATTR_SLUG: Final[str] = "slug"
 ATTR_SOLID: Final[str] = "solid"
 ATTR_START: Final[str] = "start"
+ATTR_SUCCESS: Final[str] = "success"
 ATTR_TAGS: Final[str] = "tags"
 ATTR_TIMER: Final[str] = "timer"
 ATTR_TIMERS: Final[str] = "timers"
@@ -77,18 +123,22 @@
 ATTR_ICON_CHILD_SENSOR: Final[str] = "mdi:baby-face-outline"
 ATTR_ICON_HEAD: Final[str] = "mdi:head-outline"
 ATTR_ICON_HEIGHT: Final[str] = "mdi:human-male-height"
+ATTR_ICON_HISTORY: Final[str] = "mdi:chart-timeline-variant"
 ATTR_ICON_MEDICATION: Final[str] = "mdi:pill"
 ATTR_ICON_MOTHER_NURSE: Final[str] = "mdi:mother-nurse"
 ATTR_ICON_NOTE: Final[str] = "mdi:note-multiple-outline"
 ATTR_ICON_PAPER_ROLL: Final[str] = "mdi:paper-roll-outline"
 ATTR_ICON_SCALE: Final[str] = "mdi:scale-bathroom"
+ATTR_ICON_SERVER: Final[str] = "mdi:server-network"
 ATTR_ICON_SLEEP: Final[str] = "mdi:sleep"
 ATTR_ICON_THERMOMETER: Final[str] = "mdi:thermometer"
 ATTR_ICON_TIMER_SAND: Final[str] = "mdi:timer-sand"
+ATTR_ICON_TRAY: Final[str] = "mdi:tray-full"
 
 ATTR_ACTION_ADD_BMI: Final[str] = "add_bmi"
 ATTR_ACTION_ADD_CHILD: Final[str] = "add_child"
 ATTR_ACTION_ADD_DIAPER_CHANGE: Final[str] = "add_diaper_change"
+ATTR_ACTION_ADD_ENTRIES: Final[str] = "add_entries"
 ATTR_ACTION_ADD_FEEDING: Final[str] = "add_feeding"
 ATTR_ACTION_ADD_HEAD_CIRCUMFERENCE: Final[str] = "add_head_circumference"
 ATTR_ACTION_ADD_HEIGHT: Final[str] = "add_height"
@@ -127,13 +177,22 @@
 class BabyBuddyEntityDescription(SensorEntityDescription, SwitchEntityDescription):
     """Describe Baby Buddy sensor entity."""
 
-    state_key: Callable[[dict], int] | str = ""
+    state_key: Callable[[Entry], int] | str = ""
+    # Field babybuddy orders this endpoint's entries by, newest first
+    order_key: str = ATTR_TIME
+    # Base polling interval in seconds, None for the configured scan interval
+    poll_interval: int | None = None
+    # How many times the base interval polling may back off to while idle
+    poll_max_backoff: int = DEFAULT_POLL_MAX_BACKOFF
 
 
 SENSOR_TYPES: tuple[BabyBuddyEntityDescription, ...] = (
     BabyBuddyEntityDescription(
         icon=ATTR_ICON_SCALE,
         key=ATTR_BMI,
+        order_key=ATTR_DATE,
+        poll_interval=DEFAULT_MEASUREMENT_POLL_INTERVAL,
+        poll_max_backoff=8,
         state_class=SensorStateClass.MEASUREMENT,
         state_key=ATTR_BMI,
     ),
@@ -146,18 +205,25 @@ class BabyBuddyEntityDescription(SensorEntityDescription, SwitchEntityDescriptio
     BabyBuddyEntityDescription(
         icon=ATTR_ICON_BABY_BOTTLE,
         key=ATTR_FEEDINGS,
+        order_key=ATTR_START,
         state_class=SensorStateClass.MEASUREMENT,
         state_key=ATTR_AMOUNT,
     ),
     BabyBuddyEntityDescription(
         icon=ATTR_ICON_HEAD,
         key=ATTR_HEAD_CIRCUMFERENCE_DASH,
+        order_key=ATTR_DATE,
+        poll_interval=DEFAULT_MEASUREMENT_POLL_INTERVAL,
+        poll_max_backoff=8,
         state_class=SensorStateClass.MEASUREMENT,
         state_key=ATTR_HEAD_CIRCUMFERENCE_UNDERSCORE,
     ),
     BabyBuddyEntityDescription(
         icon=ATTR_ICON_HEIGHT,
         key=ATTR_HEIGHT,
+        order_key=ATTR_DATE,
+        poll_interval=DEFAULT_MEASUREMENT_POLL_INTERVAL,
+        poll_max_backoff=8,
         state_class=SensorStateClass.MEASUREMENT,
         state_key=ATTR_HEIGHT,
     ),
@@ -176,17 +242,17 @@ class BabyBuddyEntityDescription(SensorEntityDescription, SwitchEntityDescriptio
     BabyBuddyEntityDescription(
         icon=ATTR_ICON_MOTHER_NURSE,
         key=ATTR_PUMPING,
+        order_key=ATTR_START,
         state_class=SensorStateClass.MEASUREMENT,
         state_key=ATTR_AMOUNT,
     ),
     BabyBuddyEntityDescription(
         icon=ATTR_ICON_SLEEP,
         key=ATTR_SLEEP,
+        order_key=ATTR_START,
         native_unit_of_measurement=UnitOfTime.MINUTES,
         state_class=SensorStateClass.MEASUREMENT,
-        state_key=lambda value: int(
-            dt_util.parse_duration(value[ATTR_DURATION]).total_seconds() / 60
-        ),
+        state_key=lambda value: int(value.duration.total_seconds() / 60),
     ),
     BabyBuddyEntityDescription(
         device_class=SensorDeviceClass.TEMPERATURE,
@@ -199,25 +265,210 @@ class BabyBuddyEntityDescription(SensorEntityDescription, SwitchEntityDescriptio
         device_class=SensorDeviceClass.TIMESTAMP,
         icon=ATTR_ICON_TIMER_SAND,
         key=ATTR_TIMERS,
+        order_key=ATTR_START,
+        poll_max_backoff=1,
         state_key=ATTR_START,
     ),
     BabyBuddyEntityDescription(
         icon=ATTR_ICON_BABY,
         key=ATTR_TUMMY_TIMES,
+        order_key=ATTR_START,
         native_unit_of_measurement=UnitOfTime.MINUTES,
         state_class=SensorStateClass.MEASUREMENT,
-        state_key=lambda value: int(
-            dt_util.parse_duration(value[ATTR_DURATION]).total_seconds() / 60
-        ),
+        state_key=lambda value: int(value.duration.total_seconds() / 60),
     ),
     BabyBuddyEntityDescription(
         icon=ATTR_ICON_SCALE,
         key=ATTR_WEIGHT,
+        order_key=ATTR_DATE,
+        poll_interval=DEFAULT_MEASUREMENT_POLL_INTERVAL,
+        poll_max_backoff=8,
         state_class=SensorStateClass.MEASUREMENT,
         state_key=ATTR_WEIGHT,
     ),
 )
 
+ENDPOINT_ORDER_KEYS: dict[str, str] = {
+    description.key: description.order_key for description in SENSOR_TYPES
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class BabyBuddyStatisticDescription:
+    """Describe a long-term statistic imported from babybuddy history."""
+
+    key: str
+    endpoint: str
+    name: str
+    # Called with an entry, returns its value or None to leave it out
+    value_fn: Callable[[Entry], float | None]
+    # Hourly totals with a running sum if True, else hourly mean, min and max
+    has_sum: bool = False
+    native_unit_of_measurement: str | None = None
+
+
+STATISTIC_TYPES: tuple[BabyBuddyStatisticDescription, ...] = (
+    BabyBuddyStatisticDescription(
+        key="feeding_amount",
+        endpoint=ATTR_FEEDINGS,
+        name="feeding amount",
+        has_sum=True,
+        value_fn=lambda entry: entry.amount,
+    ),
+    BabyBuddyStatisticDescription(
+        key="sleep_duration",
+        endpoint=ATTR_SLEEP,
+        name="sleep duration",
+        has_sum=True,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        value_fn=lambda entry: (
+            entry.duration.total_seconds() / 60 if entry.duration else None
+        ),
+    ),
+    BabyBuddyStatisticDescription(
+        key="pumping_amount",
+        endpoint=ATTR_PUMPING,
+        name="pumping amount",
+        has_sum=True,
+        value_fn=lambda entry: entry.amount,
+    ),
+    BabyBuddyStatisticDescription(
+        key="weight",
+        endpoint=ATTR_WEIGHT,
+        name="weight",
+        value_fn=lambda entry: entry.weight,
+    ),
+    BabyBuddyStatisticDescription(
+        key="height",
+        endpoint=ATTR_HEIGHT,
+        name="height",
+        value_fn=lambda entry: entry.height,
+    ),
+    BabyBuddyStatisticDescription(
+        key="temperature",
+        endpoint=SensorDeviceClass.TEMPERATURE,
+        name="temperature",
+        value_fn=lambda entry: entry.temperature,
+    ),
+)
+
+
+@dataclass(kw_only=True)
+class BabyBuddyAggregateDescription(SensorEntityDescription):
+    """Describe Baby Buddy sensor entity aggregating a child's recent entries."""
+
+    endpoint: str
+    # Entries of the last window count if set, else those since local midnight
+    window: timedelta | None = None
+    # Called with an entry, returns what it adds to the state
+    value_fn: Callable[[Entry], float] = lambda entry: 1
+    # Called with an entry, returns what it adds to each attribute
+    attribute_fns: dict[str, Callable[[Entry], float]] = field(default_factory=dict)
+    # Option holding the unit of measurement, if the user picks it
+    unit_option: str | None = None
+
+
+AGGREGATE_TYPES: tuple[BabyBuddyAggregateDescription, ...] = (
+    BabyBuddyAggregateDescription(
+        endpoint=ATTR_FEEDINGS,
+        icon=ATTR_ICON_BABY_BOTTLE,
+        key="feedings_today",
+        name="feedings today",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    BabyBuddyAggregateDescription(
+        endpoint=ATTR_FEEDINGS,
+        icon=ATTR_ICON_BABY_BOTTLE,
+        key="milk_today",
+        name="milk today",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        unit_option=CONF_FEEDING_UNIT,
+        value_fn=lambda entry: (
+            (entry.amount or 0) if entry.type != FEEDING_TYPES[3] else 0
+        ),
+    ),
+    BabyBuddyAggregateDescription(
+        attribute_fns={
+            ATTR_WET: lambda entry: int(bool(entry.wet)),
+            ATTR_SOLID: lambda entry: int(bool(entry.solid)),
+        },
+        endpoint=ATTR_CHANGES,
+        icon=ATTR_ICON_PAPER_ROLL,
+        key="changes_today",
+        name="changes today",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    BabyBuddyAggregateDescription(
+        endpoint=ATTR_SLEEP,
+        icon=ATTR_ICON_SLEEP,
+        key="sleep_last_24h",
+        name="sleep last 24h",
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda entry: (
+            int(entry.duration.total_seconds() / 60) if entry.duration else 0
+        ),
+        window=timedelta(hours=24),
+    ),
+    BabyBuddyAggregateDescription(
+        endpoint=ATTR_TUMMY_TIMES,
+        icon=ATTR_ICON_BABY,
+        key="tummy_time_today",
+        name="tummy time today",
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda entry: (
+            int(entry.duration.total_seconds() / 60) if entry.duration else 0
+        ),
+    ),
+)
+
+
+@dataclass(kw_only=True)
+class BabyBuddyCounterDescription(SensorEntityDescription):
+    """Describe Baby Buddy sensor entity counting a child's entries today."""
+
+    endpoint: str
+
+
+COUNTER_TYPES: tuple[BabyBuddyCounterDescription, ...] = (
+    BabyBuddyCounterDescription(
+        endpoint=ATTR_CHANGES,
+        icon=ATTR_ICON_PAPER_ROLL,
+        key="change_count_today",
+        name="change count today",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    BabyBuddyCounterDescription(
+        endpoint=ATTR_FEEDINGS,
+        icon=ATTR_ICON_BABY_BOTTLE,
+        key="feeding_count_today",
+        name="feeding count today",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    BabyBuddyCounterDescription(
+        endpoint=ATTR_PUMPING,
+        icon=ATTR_ICON_MOTHER_NURSE,
+        key="pumping_count_today",
+        name="pumping count today",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    BabyBuddyCounterDescription(
+        endpoint=ATTR_SLEEP,
+        icon=ATTR_ICON_SLEEP,
+        key="sleep_count_today",
+        name="sleep count today",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    BabyBuddyCounterDescription(
+        endpoint=ATTR_TUMMY_TIMES,
+        icon=ATTR_ICON_BABY,
+        key="tummy_time_count_today",
+        name="tummy time count today",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+)
+
 
 @dataclass
 class BabyBuddySelectDescription(SelectEntityDescription):
@@ -251,4 +502,80 @@ class BabyBuddySelectDescription(SelectEntityDescription):
     ),
 )
 
-PLATFORMS: Final = ["sensor", "select", "switch"]
+
+@dataclass(kw_only=True)
+class BabyBuddyServerSensorDescription(SensorEntityDescription):
+    """Describe Baby Buddy server diagnostic sensor entity."""
+
+    # Called with the client's BabyBuddyStats
+    value_fn: Callable[[Any], StateType]
+    attributes_fn: Callable[[Any], dict[str, Any]] = lambda stats: {}
+
+
+SERVER_SENSOR_TYPES: tuple[BabyBuddyServerSensorDescription, ...] = (
+    BabyBuddyServerSensorDescription(
+        device_class=SensorDeviceClass.DURATION,
+        icon=ATTR_ICON_TIMER_SAND,
+        key="refresh_duration",
+        name="Refresh duration",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda stats: stats.last_refresh,
+        attributes_fn=lambda stats: stats.as_dict()["refresh"],
+    ),
+    BabyBuddyServerSensorDescription(
+        device_class=SensorDeviceClass.DURATION,
+        icon=ATTR_ICON_TIMER_SAND,
+        key="request_latency",
+        name="Request latency p95",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: stats.latency_p95(),
+        attributes_fn=lambda stats: {
+            "slowest_endpoint": stats.slowest_endpoint(),
+            **{
+                endpoint: {
+                    key: value
+                    for key, value in endpoint_stats.items()
+                    if key.startswith("latency")
+                }
+                for endpoint, endpoint_stats in stats.as_dict()["endpoints"].items()
+            },
+        },
+    ),
+    BabyBuddyServerSensorDescription(
+        icon=ATTR_ICON_SERVER,
+        key="requests",
+        name="Requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.requests,
+        attributes_fn=lambda stats: {
+            endpoint: endpoint_stats.requests
+            for endpoint, endpoint_stats in sorted(stats.endpoints.items())
+        },
+    ),
+    BabyBuddyServerSensorDescription(
+        icon=ATTR_ICON_SERVER,
+        key="request_errors",
+        name="Request errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: sum(stats.errors.values()),
+        attributes_fn=lambda stats: dict(stats.errors),
+    ),
+    BabyBuddyServerSensorDescription(
+        device_class=SensorDeviceClass.DATA_SIZE,
+        icon=ATTR_ICON_SERVER,
+        key="bytes_received",
+        name="Bytes received",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.bytes_received,
+        attributes_fn=lambda stats: {
+            endpoint: endpoint_stats.bytes_received
+            for endpoint, endpoint_stats in sorted(stats.endpoints.items())
+        },
+    ),
+)
+
+PLATFORMS: Final = ["binary_sensor", "sensor", "select", "switch"]
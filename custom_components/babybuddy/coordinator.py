@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-from asyncio import TimeoutError as AsyncIOTimeoutError
-from dataclasses import dataclass
-from datetime import timedelta
+import asyncio
+from collections.abc import AsyncIterator, Mapping
+from contextlib import aclosing, asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from http import HTTPStatus
+import time
 from typing import Any
 
 from aiohttp.client_exceptions import ClientError, ClientResponseError
@@ -14,34 +18,58 @@
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_ID,
+    ATTR_TIME,
     CONF_API_KEY,
     CONF_HOST,
     CONF_PATH,
     CONF_PORT,
     CONF_SCAN_INTERVAL,
+    CONF_URL,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.device_registry as dr
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 import homeassistant.util.dt as dt_util
 
 from .client import BabyBuddyClient
 from .const import (
     ATTR_BIRTH_DATE,
+    ATTR_CHILD,
     ATTR_CHILDREN,
     ATTR_COUNT,
+    ATTR_ENDPOINTS,
     ATTR_FIRST_NAME,
     ATTR_LAST_NAME,
+    ATTR_NEXT,
     ATTR_RESULTS,
+    BULK_MAX_PAGES,
+    BULK_PAGE_SIZE,
+    CONF_BULK_REFRESH,
+    CONF_DAILY_COUNTERS,
+    CONF_IMPORT_HISTORY,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_TIMEOUTS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    ENDPOINT_ORDER_KEYS,
     LOGGER,
+    REQUEST_TIMEOUTS,
     SENSOR_TYPES,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
 )
-from .errors import AuthorizationError, ConnectError
+from .counters import BabyBuddyChildCounters
+from .errors import AuthorizationError, CircuitOpenError, ConnectError
+from .history import BabyBuddyHistory
+from .models import BabyBuddySnapshot, Child, Entry, Record, parse_entry
+from .scheduler import BabyBuddyPollScheduler, poll_interval_option
+from .window import BabyBuddyChildWindows
+from .write_queue import BabyBuddyWriteQueue
 
 SERVICE_ADD_CHILD_SCHEMA = vol.Schema(
     {
@@ -62,7 +90,24 @@ class BabyBuddyData:
     entities: dict[str, str]
 
 
-class BabyBuddyCoordinator(DataUpdateCoordinator):
+@dataclass
+class PendingWrite:
+    """Endpoints to refetch and entries to merge for one child."""
+
+    endpoints: set[str] = field(default_factory=set)
+    entries: dict[str, Entry] = field(default_factory=dict)
+
+
+@dataclass
+class WriteBatch:
+    """Updates collected by one async_batch_writes block."""
+
+    updates: dict[int, PendingWrite] = field(default_factory=dict)
+    # Tasks started inside the block still see it after it has ended.
+    done: bool = False
+
+
+class BabyBuddyCoordinator(DataUpdateCoordinator[BabyBuddySnapshot]):
     """Coordinate retrieving and updating data from babybuddy."""
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -73,7 +118,7 @@ def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
             LOGGER,
             name=DOMAIN,
             setup_method=self.async_setup_coordinator,
-            update_method=self.async_update,
+            update_method=self.async_update_timed,
             update_interval=timedelta(
                 seconds=entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
             ),
@@ -86,56 +131,238 @@ def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
             entry.data[CONF_PATH],
             entry.data[CONF_API_KEY],
             async_get_clientsession(self.hass),
+            timeouts=self.request_timeouts(),
         )
         self.device_registry: dr.DeviceRegistry = dr.async_get(self.hass)
         self.child_ids: list[str] = []
+        self.child_coordinators: dict[int, BabyBuddyChildCoordinator] = {}
+        # Bounds the requests of every poll and write refresh at once.
+        self.semaphore = self.request_semaphore()
+        # Writes take their own permits, so a large batch cannot hold up polls.
+        self.write_semaphore = self.request_semaphore()
+        # Scoped to the task of a service call and the tasks it starts, so
+        # that only its own writes join its batch.
+        self.write_batch: ContextVar[WriteBatch | None] = ContextVar(
+            f"{DOMAIN}_{entry.entry_id}_write_batch", default=None
+        )
+        self.write_queue = BabyBuddyWriteQueue(hass, self)
+        self.history = BabyBuddyHistory(hass, self)
+        # Read at setup; turning the option on or off reloads the entry.
+        self.counters_enabled: bool = entry.options.get(CONF_DAILY_COUNTERS, False)
+        self.endpoint_store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.endpoints"
+        )
+        self.saved_endpoints: dict[str, str] = {}
+        self.snapshot_store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.snapshot"
+        )
 
-    async def async_set_children_from_db(self) -> None:
-        """Set child_ids from HA database."""
-        self.child_ids = [
-            next(iter(device.identifiers))[1]
+    @property
+    def bulk(self) -> bool:
+        """Return whether one query per endpoint fetches all children."""
+        return self.entry.options.get(CONF_BULK_REFRESH, False)
+
+    @property
+    def child_update_interval(self) -> timedelta | None:
+        """Return how often children poll, None if bulk refreshes poll them."""
+        return None if self.bulk else self.update_interval
+
+    def configure_polling(self) -> None:
+        """Apply the polling options to every child."""
+        for coordinator in self.child_coordinators.values():
+            coordinator.update_interval = self.child_update_interval
+            coordinator.configure_polling()
+
+    def child_devices(self) -> list[dr.DeviceEntry]:
+        """Return the child devices of this entry, leaving out the server."""
+        return [
+            device
             for device in dr.async_entries_for_config_entry(
                 self.device_registry, self.entry.entry_id
             )
+            if (DOMAIN, self.entry.entry_id) not in device.identifiers
+        ]
+
+    async def async_set_children_from_db(self) -> None:
+        """Set child_ids from HA database."""
+        self.child_ids = [
+            next(iter(device.identifiers))[1] for device in self.child_devices()
         ]
 
     async def async_setup_coordinator(self) -> None:
-        """Set up babybuddy."""
+        """Set up babybuddy.
 
-        try:
-            await self.client.async_connect()
-        except AuthorizationError as error:
-            raise ConfigEntryAuthFailed from error
-        except ConnectError as error:
-            raise ConfigEntryNotReady(error) from error
+        The endpoint map saved by a previous run is used straight away and
+        revalidated in the background; only without one does setup wait for
+        babybuddy to list its endpoints.
+        """
+        if await self.async_load_endpoints():
+            self.entry.async_create_background_task(
+                self.hass, self.async_revalidate_endpoints(), f"{DOMAIN} endpoints"
+            )
+        else:
+            try:
+                await self.client.async_connect()
+            except AuthorizationError as error:
+                raise ConfigEntryAuthFailed from error
+            except ConnectError as error:
+                raise ConfigEntryNotReady(error) from error
+            await self.async_save_endpoints()
 
         await self.async_set_children_from_db()
+        await self.write_queue.async_load()
 
         self.entry.async_on_unload(
             self.entry.add_update_listener(options_updated_listener)
         )
 
+    async def async_load_endpoints(self) -> bool:
+        """Restore the endpoint map saved for this babybuddy URL, if any."""
+        stored = await self.endpoint_store.async_load()
+        if not stored or stored[CONF_URL] != self.client.url:
+            return False
+        self.client.endpoints = self.saved_endpoints = stored[ATTR_ENDPOINTS]
+        self.client.endpoints_cached = True
+        LOGGER.debug(f"Endpoints restored: {self.client.endpoints}")
+        return True
+
+    async def async_revalidate_endpoints(self) -> None:
+        """Refetch a restored endpoint map and save it if it changed."""
+        try:
+            await self.client.async_connect()
+        except AuthorizationError:
+            self.entry.async_start_reauth(self.hass)
+            return
+        except ConnectError as error:
+            LOGGER.debug(f"Could not revalidate endpoints. error: {error}")
+            return
+        await self.async_save_endpoints()
+
+    async def async_save_endpoints(self) -> None:
+        """Save the endpoint map unless it is saved already."""
+        if not self.client.endpoints or self.client.endpoints == self.saved_endpoints:
+            return
+        self.saved_endpoints = dict(self.client.endpoints)
+        await self.endpoint_store.async_save(
+            {CONF_URL: self.client.url, ATTR_ENDPOINTS: self.saved_endpoints}
+        )
+
+    async def async_restore_snapshot(self) -> bool:
+        """Set up and seed the data from the last good refresh, if saved.
+
+        Returns False if there is nothing to restore, in which case setup is
+        left to the first refresh as usual.
+        """
+        stored = await self.snapshot_store.async_load()
+        if not stored:
+            return False
+        await self.async_setup_coordinator()
+        self.data = BabyBuddySnapshot.from_json(stored)
+        for child in self.data.children.values():
+            self.child_coordinators[child.id] = BabyBuddyChildCoordinator(
+                self, child, self.data.entries.get(child.id, {})
+            )
+        LOGGER.debug(f"Restored data of {len(self.data.children)} children")
+        return True
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the data to save for the next startup."""
+        return self.data.as_json()
+
     async def async_remove_deleted_children(self) -> None:
         """Remove child device if child is removed from babybuddy."""
-        for device in dr.async_entries_for_config_entry(
-            self.device_registry, self.entry.entry_id
-        ):
+        for device in self.child_devices():
             if next(iter(device.identifiers))[1] not in self.child_ids:
                 self.device_registry.async_remove_device(device.id)
 
-    async def async_update(
-        self,
-    ) -> tuple[list[dict[str, str]], dict[int, dict[str, dict[str, str]]]]:
+    def request_semaphore(self) -> asyncio.Semaphore:
+        """Return a semaphore bounding the number of in-flight requests."""
+        return asyncio.Semaphore(
+            self.entry.options.get(
+                CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+            )
+        )
+
+    def request_timeouts(self) -> dict[str, float]:
+        """Return the request timeout of each HTTP verb from the options."""
+        return {
+            method: self.entry.options.get(option, REQUEST_TIMEOUTS[method])
+            for method, option in CONF_TIMEOUTS.items()
+        }
+
+    def available_endpoints(self) -> list[str]:
+        """Return the endpoints polled for every child."""
+        endpoints: list[str] = []
+        for endpoint in SENSOR_TYPES:
+            if endpoint.key not in self.client.endpoints:
+                LOGGER.debug(
+                    f"Endpoint {endpoint.key} is not available on this babybuddy instance. Skipping."
+                )
+                continue
+            endpoints.append(endpoint.key)
+        return endpoints
+
+    @callback
+    def async_set_child_entries(
+        self, child_id: int, entries: Mapping[str, Entry] | None
+    ) -> None:
+        """Merge the entries of a child into the snapshot and notify listeners."""
+        if (
+            self.data is None
+            or entries is None
+            or child_id not in self.data.children
+            or self.data.entries.get(child_id) is entries
+        ):
+            return
+        self.data = BabyBuddySnapshot(
+            self.data.children, {**self.data.entries, child_id: entries}
+        )
+        self.snapshot_store.async_delay_save(self.snapshot, SNAPSHOT_SAVE_DELAY)
+        self.async_update_listeners()
+
+    async def async_refresh_all(self) -> None:
+        """Refresh the children, then every child that polls on its own."""
+        await self.async_refresh()
+        if not self.bulk:
+            await asyncio.gather(
+                *(
+                    coordinator.async_refresh()
+                    for coordinator in self.child_coordinators.values()
+                )
+            )
+
+    async def async_update_timed(self) -> BabyBuddySnapshot:
+        """Update babybuddy data and record how long the refresh took."""
+        start = time.monotonic()
+        try:
+            data = await self.async_update()
+        except Exception as error:
+            # Bulk refreshes are the only polls of the children, so their
+            # entities go unavailable along with this one.
+            if self.bulk:
+                for coordinator in self.child_coordinators.values():
+                    coordinator.async_set_failed(error)
+            raise
+        else:
+            if data is not self.data:
+                self.snapshot_store.async_delay_save(self.snapshot, SNAPSHOT_SAVE_DELAY)
+            return data
+        finally:
+            self.client.stats.record_refresh(time.monotonic() - start)
+            # A 404 from a restored endpoint map rediscovers it mid-refresh.
+            await self.async_save_endpoints()
+
+    async def async_update(self) -> BabyBuddySnapshot:
         """Update babybuddy data."""
         children_list: dict[str, Any] = {}
-        child_data: dict[int, dict[str, dict[str, str]]] = {}
 
         try:
             children_list = await self.client.async_get(ATTR_CHILDREN)
         except ClientResponseError as error:
             if error.status == HTTPStatus.FORBIDDEN:
                 raise ConfigEntryAuthFailed from error
-        except (AsyncIOTimeoutError, ClientError) as error:
+            raise UpdateFailed(error) from error
+        except (TimeoutError, ClientError, CircuitOpenError) as error:
             raise UpdateFailed(error) from error
 
         if children_list[ATTR_COUNT] < len(self.child_ids):
@@ -146,31 +373,601 @@ async def async_update(
         if children_list[ATTR_COUNT] > len(self.child_ids):
             self.child_ids = [child[ATTR_ID] for child in children_list[ATTR_RESULTS]]
 
-        for child in children_list[ATTR_RESULTS]:
-            child_data.setdefault(child[ATTR_ID], {})
-            for endpoint in SENSOR_TYPES:
-                if endpoint.key not in self.client.endpoints:
-                    LOGGER.debug(
-                        f"Endpoint {endpoint.key} is not available on this babybuddy instance. Skipping."
-                    )
-                    continue
-                endpoint_data: dict = {}
-                try:
-                    endpoint_data = await self.client.async_get(
-                        endpoint.key, f"?child={child[ATTR_ID]}&limit=1"
-                    )
-                except ClientResponseError as error:
-                    LOGGER.debug(
-                        f"No {endpoint} found for {child[ATTR_FIRST_NAME]} {child[ATTR_LAST_NAME]}. Skipping. error: {error}.)"
+        previous = self.data or BabyBuddySnapshot()
+        children = {
+            child[ATTR_ID]: unchanged_or(
+                previous.children.get(child[ATTR_ID]), Child.from_json(child)
+            )
+            for child in children_list[ATTR_RESULTS]
+        }
+        for child_id in self.child_coordinators.keys() - children.keys():
+            await self.child_coordinators.pop(child_id).async_shutdown()
+        for child in children.values():
+            if child.id in self.child_coordinators:
+                self.child_coordinators[child.id].child = child
+            else:
+                self.child_coordinators[child.id] = BabyBuddyChildCoordinator(
+                    self, child
+                )
+
+        if self.bulk:
+            await self.async_update_bulk(list(children.values()))
+        else:
+            # Children poll on their own schedule; a new or restored child is
+            # fetched here so that its entities start from its own data.
+            await asyncio.gather(
+                *(
+                    coordinator.async_refresh()
+                    for coordinator in self.child_coordinators.values()
+                    if coordinator.data is None or coordinator.restored
+                )
+            )
+
+        entries: dict[int, Mapping[str, Entry]] = {}
+        for child_id in children:
+            child_entries = self.child_coordinators[child_id].data
+            # Shared even if empty, so merging it back changes nothing.
+            entries[child_id] = {} if child_entries is None else child_entries
+        data = BabyBuddySnapshot(children, entries)
+        return previous if data == previous else data
+
+    async def async_fetch_child_endpoint(
+        self, semaphore: asyncio.Semaphore, child: Child, endpoint: str
+    ) -> dict[str, Any] | None:
+        """Fetch the latest endpoint entry for a child.
+
+        Returns None if the request failed, so that one failing endpoint is
+        skipped without failing the whole refresh.
+        """
+        async with semaphore:
+            try:
+                endpoint_data = await self.client.async_get(
+                    endpoint, f"?child={child.id}&limit=1"
+                )
+            except ClientResponseError as error:
+                LOGGER.debug(
+                    f"No {endpoint} found for {child.first_name} {child.last_name}. Skipping. error: {error}.)"
+                )
+                return None
+            except (TimeoutError, ClientError, CircuitOpenError) as error:
+                LOGGER.error(error)
+                return None
+        data: list[dict[str, Any]] = endpoint_data[ATTR_RESULTS]
+        return data[0] if data else {}
+
+    async def async_refresh_child(self, child_id: int, *endpoints: str) -> None:
+        """Refetch only the given endpoints of a child and push the update.
+
+        A write only touches one child's entries, so refetching those
+        instead of every endpoint of every child keeps a service call down
+        to a request or two.
+        """
+        await self.async_update_child(child_id, endpoints)
+
+    async def async_apply_entry(
+        self,
+        child_id: int,
+        endpoint: str,
+        entry: dict[str, Any] | None,
+        *refresh: str,
+    ) -> None:
+        """Write a created entry through to the data and push the update.
+
+        babybuddy answers a POST with the created entry, so it is merged as
+        the child's latest entry without a follow-up GET. Endpoints the write
+        changed server-side (e.g. timers consumed by an entry) are listed in
+        refresh and refetched. If the entry is unknown, the endpoint is
+        refetched instead. The next poll overwrites the merged entry, so the
+        server wins if the two disagree.
+        """
+        if entry is None:
+            await self.async_update_child(child_id, (endpoint, *refresh))
+            return
+        await self.async_update_child(
+            child_id, refresh, {endpoint: parse_entry(endpoint, entry)}
+        )
+
+    async def async_update_child(
+        self,
+        child_id: int,
+        endpoints: tuple[str, ...],
+        entries: dict[str, Entry] | None = None,
+    ) -> None:
+        """Refetch endpoints of a child, merge entries and push the update.
+
+        Inside async_batch_writes the update is queued until the batch ends.
+        """
+        batch = self.write_batch.get()
+        if batch is not None and not batch.done:
+            queued = batch.updates.setdefault(child_id, PendingWrite())
+            queued.endpoints.update(endpoints)
+            for endpoint, entry in (entries or {}).items():
+                if is_latest_entry(endpoint, entry, queued.entries.get(endpoint)):
+                    queued.entries[endpoint] = entry
+            return
+        await self.async_update_children(
+            {child_id: PendingWrite(set(endpoints), dict(entries or {}))}
+        )
+
+    @asynccontextmanager
+    async def async_batch_writes(self) -> AsyncIterator[None]:
+        """Collect the updates of several writes and push them once.
+
+        Every child touched by the batch is refetched and merged in a single
+        pass when the block exits, so listeners are notified once rather
+        than once per write. Only writes of the calling task, and of tasks it
+        starts, join the batch; a nested block joins the outer one.
+        """
+        batch = self.write_batch.get()
+        if batch is not None and not batch.done:
+            yield
+            return
+        batch = WriteBatch()
+        token = self.write_batch.set(batch)
+        try:
+            yield
+        finally:
+            batch.done = True
+            self.write_batch.reset(token)
+            if batch.updates:
+                await self.async_update_children(batch.updates)
+
+    async def async_update_children(self, updates: dict[int, PendingWrite]) -> None:
+        """Refetch endpoints of children, merge entries and push the update.
+
+        Falls back to a full refresh if a child is not known yet.
+        """
+        if self.data is None or not updates.keys() <= self.child_coordinators.keys():
+            await self.async_request_refresh()
+            return
+
+        requests: list[tuple[int, str]] = [
+            (child_id, endpoint)
+            for child_id, update in updates.items()
+            for endpoint in sorted(update.endpoints)
+            if endpoint in self.client.endpoints
+        ]
+        results = await asyncio.gather(
+            *(
+                self.async_fetch_child_endpoint(
+                    self.semaphore, self.child_coordinators[child_id].child, endpoint
+                )
+                for child_id, endpoint in requests
+            )
+        )
+
+        fetched: dict[int, dict[str, dict[str, Any] | None]] = {
+            child_id: {} for child_id in updates
+        }
+        for (child_id, endpoint), endpoint_data in zip(requests, results, strict=True):
+            fetched[child_id][endpoint] = endpoint_data
+        now = dt_util.utcnow()
+        for child_id, update in updates.items():
+            self.child_coordinators[child_id].async_set_written(
+                fetched[child_id], update, now
+            )
+
+    async def async_update_bulk(self, children: list[Child]) -> None:
+        """Poll every child with one query per endpoint for all of them.
+
+        An endpoint is fetched if it is due for any child.
+        """
+        now = dt_util.utcnow()
+        coordinators = [self.child_coordinators[child.id] for child in children]
+        endpoints = [
+            endpoint
+            for endpoint in self.available_endpoints()
+            if any(coordinator.is_due(endpoint, now) for coordinator in coordinators)
+        ]
+        fetched = await self.async_fetch_bulk(children, endpoints)
+        for coordinator in coordinators:
+            try:
+                coordinator.check_fetched(fetched[coordinator.child.id])
+            except UpdateFailed as error:
+                coordinator.async_set_failed(error)
+            else:
+                coordinator.async_set_polled(fetched[coordinator.child.id], now)
+
+    async def async_fetch_bulk(
+        self, children: list[Child], endpoints: list[str]
+    ) -> dict[int, dict[str, dict[str, Any] | None]]:
+        """Fetch the latest entries with one query per endpoint for all children.
+
+        Returns the entry, {} if there is none or None if it could not be
+        fetched, by child and endpoint.
+        """
+        semaphore = self.semaphore
+        results = await asyncio.gather(
+            *(
+                self.async_fetch_endpoint_bulk(semaphore, children, endpoint)
+                for endpoint in endpoints
+            )
+        )
+        fetched: dict[int, dict[str, dict[str, Any] | None]] = {
+            child.id: {} for child in children
+        }
+        for endpoint, latest in zip(endpoints, results, strict=True):
+            for child in children:
+                fetched[child.id][endpoint] = (
+                    None if latest is None else latest.get(child.id)
+                )
+
+        # Children without an entry in the pages walked above either have no
+        # entries at all or only old ones, so ask for them individually.
+        missing: list[tuple[Child, str]] = [
+            (child, endpoint)
+            for endpoint, latest in zip(endpoints, results, strict=True)
+            if latest is not None
+            for child in children
+            if child.id not in latest
+        ]
+        missing_results = await asyncio.gather(
+            *(
+                self.async_fetch_child_endpoint(semaphore, child, endpoint)
+                for child, endpoint in missing
+            )
+        )
+        for (child, endpoint), data in zip(missing, missing_results, strict=True):
+            fetched[child.id][endpoint] = data
+        return fetched
+
+    async def async_fetch_endpoint_bulk(
+        self,
+        semaphore: asyncio.Semaphore,
+        children: list[Child],
+        endpoint: str,
+    ) -> dict[int, dict[str, Any]] | None:
+        """Fetch the latest endpoint entry of every child in one ordered query.
+
+        Babybuddy returns entries newest first, so the first entry seen for a
+        child is its latest one. Pages are followed until every child has an
+        entry, the results run out or BULK_MAX_PAGES is reached. A child that
+        has no entries at all is mapped to an empty dict once the results run
+        out, and left out of the result if the page limit was hit first.
+
+        Returns None if a request failed, so that one failing endpoint is
+        skipped without failing the whole refresh.
+        """
+        child_ids = {child.id for child in children}
+        if not child_ids:
+            return {}
+        latest: dict[int, dict[str, Any]] = {}
+        exhausted = False
+        pages_read = 0
+        async with (
+            semaphore,
+            aclosing(
+                self.client.async_iter_pages(
+                    endpoint, page_size=BULK_PAGE_SIZE, prefetch=False, cache=True
+                )
+            ) as pages,
+        ):
+            try:
+                async for endpoint_data in pages:
+                    pages_read += 1
+                    for entry in endpoint_data[ATTR_RESULTS]:
+                        if entry.get(ATTR_CHILD) in child_ids:
+                            latest.setdefault(entry[ATTR_CHILD], entry)
+                    if not endpoint_data.get(ATTR_NEXT):
+                        exhausted = True
+                    elif pages_read >= BULK_MAX_PAGES or len(latest) == len(child_ids):
+                        break
+            except (TimeoutError, ClientError, CircuitOpenError) as error:
+                LOGGER.error(error)
+                return None
+        if exhausted:
+            for child_id in child_ids - latest.keys():
+                latest[child_id] = {}
+        return latest
+
+
+class BabyBuddyChildCoordinator(DataUpdateCoordinator[Mapping[str, Entry]]):
+    """Coordinate polling the endpoints of one child.
+
+    Every child polls on its own schedule and fails on its own, so a slow or
+    failing child does not hold up the others. The data is the latest entry
+    of each endpoint; the parent coordinator owns the client and the
+    children, and merges the entries of every child into its snapshot.
+    """
+
+    def __init__(
+        self,
+        parent: BabyBuddyCoordinator,
+        child: Child,
+        entries: Mapping[str, Entry] | None = None,
+    ) -> None:
+        """Initialize the coordinator, from restored entries if given."""
+        super().__init__(
+            parent.hass,
+            LOGGER,
+            config_entry=parent.entry,
+            name=f"{DOMAIN} child {child.id}",
+            update_method=self.async_update_timed,
+            update_interval=parent.child_update_interval,
+        )
+        self.parent = parent
+        self.entry: ConfigEntry = parent.entry
+        self.child = child
+        self.scheduler = BabyBuddyPollScheduler()
+        # The data was restored from the last run and not refreshed yet.
+        self.restored = entries is not None
+        if entries is not None:
+            self.data = entries
+        # Endpoints whose entry the last update changed, or None if every
+        # entity of the child has to write its state.
+        self.changed_endpoints: set[str] | None = None
+        self.windows = BabyBuddyChildWindows(child.id)
+        self.windows_loader: asyncio.Task[None] | None = None
+        self.counters: BabyBuddyChildCounters | None = (
+            BabyBuddyChildCounters(self) if parent.counters_enabled else None
+        )
+        self.configure_polling()
+        # Added first, so the parent snapshot is current before entities write.
+        self.async_add_listener(self.async_update_parent)
+
+    def configure_polling(self) -> None:
+        """Set the base polling interval of every endpoint from the options.
+
+        No endpoint is polled more often than the coordinator ticks; the
+        options flow rejects shorter overrides, older ones are raised.
+        """
+        scan_interval = self.entry.options.get(
+            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+        )
+        for description in SENSOR_TYPES:
+            option = poll_interval_option(description.key)
+            interval = self.entry.options.get(
+                option, description.poll_interval or scan_interval
+            )
+            if option in self.entry.options and interval < scan_interval:
+                LOGGER.warning(
+                    f"Update interval for {description.key} of {interval}s is shorter than the update interval, using {scan_interval}s"
+                )
+            self.scheduler.configure(
+                description.key,
+                timedelta(seconds=max(interval, scan_interval)),
+                description.poll_max_backoff,
+            )
+
+    @callback
+    def async_update_parent(self) -> None:
+        """Merge the entries into the parent snapshot."""
+        self.parent.async_set_child_entries(self.child.id, self.data)
+
+    def latest(self, endpoint: str) -> Entry | None:
+        """Return the latest entry of an endpoint."""
+        return self.data.get(endpoint) if self.data else None
+
+    def is_due(self, endpoint: str, now: datetime) -> bool:
+        """Return whether an endpoint should be polled now.
+
+        A new or restored child has no current entries, so all are due.
+        """
+        return (
+            self.data is None or self.restored or self.scheduler.is_due(endpoint, now)
+        )
+
+    @callback
+    def update_aggregates(
+        self,
+        entries: Mapping[str, Entry],
+        written: Mapping[str, Entry] | None = None,
+    ) -> None:
+        """Bring the windows and counters up to date with an update.
+
+        Entries are counted into the rolling windows, which are loaded on
+        first use and fetch what a poll missed in the background, and the
+        counters of changed endpoints are refetched. Written entries count
+        even if they are not the latest.
+        """
+        if self.counters is not None:
+            self.counters.schedule(self.changed_endpoints)
+        if self.windows.loaded:
+            now = dt_util.utcnow()
+            for endpoint, entry in (written or {}).items():
+                self.windows.count(endpoint, entry, now)
+            self.windows.update(entries, now)
+            if not self.windows.stale:
+                return
+        if self.windows_loader is None or self.windows_loader.done():
+            self.windows_loader = self.entry.async_create_background_task(
+                self.hass,
+                self.async_load_windows(),
+                f"{DOMAIN} child {self.child.id} windows",
+            )
+
+    async def async_load_windows(self) -> None:
+        """Fill or backfill the rolling windows and let the aggregate sensors write.
+
+        If a request fails, the next update tries again.
+        """
+        try:
+            async with self.parent.semaphore:
+                if self.windows.loaded:
+                    await self.windows.async_backfill(
+                        self.parent.client, dt_util.utcnow()
                     )
-                    continue
-                except (AsyncIOTimeoutError, ClientError) as error:
-                    LOGGER.error(error)
-                    continue
-                data: list[dict[str, str]] = endpoint_data[ATTR_RESULTS]
-                child_data[child[ATTR_ID]][endpoint.key] = data[0] if data else {}
+                else:
+                    await self.windows.async_load(self.parent.client, dt_util.utcnow())
+        except (TimeoutError, ClientError, CircuitOpenError) as error:
+            LOGGER.debug(
+                f"Could not load recent entries of {self.child.first_name} {self.child.last_name}. error: {error}"
+            )
+            return
+        if self.data is not None:
+            self.windows.update(self.data, dt_util.utcnow())
+        self.async_notify_aggregates()
+
+    @callback
+    def async_notify_aggregates(self) -> None:
+        """Let the sensors of windows and counters write, no entry changed."""
+        self.changed_endpoints = set()
+        self.async_update_listeners()
+
+    def endpoint_changed(self, endpoint: str) -> bool:
+        """Return whether the last update may have changed an entry."""
+        return self.changed_endpoints is None or endpoint in self.changed_endpoints
+
+    def track_changes(self, entries: Mapping[str, Entry]) -> None:
+        """Record which entries change before they replace the data.
+
+        Restored data and failed refreshes change more than entries, i.e.
+        attributes and availability, so every entity writes after them.
+        """
+        if self.data is None or self.restored or not self.last_update_success:
+            self.changed_endpoints = None
+            return
+        self.changed_endpoints = {
+            endpoint
+            for endpoint in entries.keys() | self.data.keys()
+            if entries.get(endpoint) is not self.data.get(endpoint)
+        }
+
+    async def async_update_timed(self) -> Mapping[str, Entry]:
+        """Update the entries and record how long the refresh took."""
+        start = time.monotonic()
+        try:
+            entries = await self.async_update()
+        except Exception:
+            self.changed_endpoints = None
+            raise
+        else:
+            self.track_changes(entries)
+            self.update_aggregates(entries)
+            self.restored = False
+            return entries
+        finally:
+            self.parent.client.stats.record_refresh(
+                time.monotonic() - start, self.child.id
+            )
+
+    async def async_update(self) -> Mapping[str, Entry]:
+        """Fetch the endpoints that are due.
+
+        Endpoints that are not due keep their previous entries. The refresh
+        fails only if every endpoint failed, so that one failing endpoint is
+        skipped without making the child unavailable.
+        """
+        now = dt_util.utcnow()
+        endpoints = [
+            endpoint
+            for endpoint in self.parent.available_endpoints()
+            if self.is_due(endpoint, now)
+        ]
+        # Fan the endpoint requests out concurrently, bounded by the
+        # configured limit across all children, so a refresh takes as long
+        # as the slowest request rather than the sum of all of them.
+        results = await asyncio.gather(
+            *(
+                self.parent.async_fetch_child_endpoint(
+                    self.parent.semaphore, self.child, endpoint
+                )
+                for endpoint in endpoints
+            )
+        )
+        fetched = dict(zip(endpoints, results, strict=True))
+        self.check_fetched(fetched)
+        return self.polled(fetched, now)
+
+    def check_fetched(self, fetched: Mapping[str, dict[str, Any] | None]) -> None:
+        """Raise UpdateFailed if every endpoint fetched failed."""
+        if fetched and all(data is None for data in fetched.values()):
+            raise UpdateFailed(
+                f"Could not fetch any entries of {self.child.first_name} {self.child.last_name}"
+            )
+
+    def merged(self, fetched: Mapping[str, dict[str, Any] | None]) -> dict[str, Entry]:
+        """Return the entries with the fetched ones stored, skipping failures."""
+        entries = dict(self.data or {})
+        for endpoint, data in fetched.items():
+            if data is not None:
+                store_entry(entries, endpoint, data)
+        return entries
+
+    def polled(
+        self, fetched: Mapping[str, dict[str, Any] | None], now: datetime
+    ) -> Mapping[str, Entry]:
+        """Merge the entries of a poll and schedule the next one.
+
+        Returns the current data itself if nothing changed.
+        """
+        previous: Mapping[str, Entry] = self.data or {}
+        entries = self.merged(fetched)
+        for endpoint, data in fetched.items():
+            if data is not None:
+                changed = entries.get(endpoint) is not previous.get(endpoint)
+                self.scheduler.polled(endpoint, changed, now)
+        return previous if entries == previous else entries
+
+    @callback
+    def async_set_polled(
+        self, fetched: Mapping[str, dict[str, Any] | None], now: datetime
+    ) -> None:
+        """Push the entries of a poll made for all children at once."""
+        entries = self.polled(fetched, now)
+        self.track_changes(entries)
+        self.update_aggregates(entries)
+        self.restored = False
+        self.async_set_updated_data(entries)
+
+    @callback
+    def async_set_failed(self, error: Exception) -> None:
+        """Fail a poll made for all children at once, or by the parent."""
+        self.changed_endpoints = None
+        self.async_set_update_error(error)
+
+    @callback
+    def async_set_written(
+        self,
+        fetched: Mapping[str, dict[str, Any] | None],
+        update: PendingWrite,
+        now: datetime,
+    ) -> None:
+        """Push the entries refetched and created by writes."""
+        entries = self.merged(fetched)
+        for endpoint, entry in update.entries.items():
+            latest = entries.get(endpoint)
+            if is_latest_entry(endpoint, entry, latest):
+                entries[endpoint] = unchanged_or(latest, entry)
+        for endpoint in (*update.endpoints, *update.entries):
+            self.scheduler.activity(endpoint, now)
+        previous: Mapping[str, Entry] = self.data or {}
+        if entries == previous:
+            entries = previous
+        self.track_changes(entries)
+        self.update_aggregates(entries, update.entries)
+        self.async_set_updated_data(entries)
+
+
+def store_entry(entries: dict[str, Entry], endpoint: str, data: dict[str, Any]) -> None:
+    """Store the latest entry of an endpoint, or drop it if there is none."""
+    if data:
+        entries[endpoint] = unchanged_or(
+            entries.get(endpoint), parse_entry(endpoint, data)
+        )
+    else:
+        entries.pop(endpoint, None)
+
+
+def unchanged_or[RecordT: Record](current: RecordT | None, new: RecordT) -> RecordT:
+    """Return current if new equals it, so that snapshots share the record."""
+    return current if current is not None and current == new else new
+
+
+def is_latest_entry(endpoint: str, entry: Entry, latest: Entry | None) -> bool:
+    """Return whether entry is at least as new as the current latest entry.
 
-        return (children_list[ATTR_RESULTS], child_data)
+    A back-dated entry must not replace a newer one, since babybuddy would
+    not return it as the latest entry either.
+    """
+    if latest is None:
+        return True
+    order_key = ENDPOINT_ORDER_KEYS.get(endpoint, ATTR_TIME)
+    new = getattr(entry, order_key, None)
+    current = getattr(latest, order_key, None)
+    if new is None or current is None:
+        return True
+    return new >= current
 
 
 async def options_updated_listener(
@@ -178,5 +975,18 @@ async def options_updated_listener(
 ) -> None:
     """Handle options update."""
     coordinator = entry.runtime_data.coordinator
+    # Options that add or remove entities take a reload.
+    history = entry.options.get(CONF_IMPORT_HISTORY, False)
+    counters = entry.options.get(CONF_DAILY_COUNTERS, False)
+    if (history, counters) != (
+        coordinator.history.enabled,
+        coordinator.counters_enabled,
+    ):
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
     coordinator.update_interval = timedelta(seconds=entry.options[CONF_SCAN_INTERVAL])
-    await coordinator.async_request_refresh()
+    coordinator.semaphore = coordinator.request_semaphore()
+    coordinator.write_semaphore = coordinator.request_semaphore()
+    coordinator.client.timeouts = coordinator.request_timeouts()
+    coordinator.configure_polling()
+    await coordinator.async_refresh_all()
@@ -0,0 +1,119 @@
+"""Daily counters of a child's babybuddy entries."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime
+from typing import TYPE_CHECKING
+from urllib.parse import urlencode
+
+from aiohttp.client_exceptions import ClientError
+
+from homeassistant.util import dt as dt_util
+
+from .client import since_filter
+from .const import (
+    ATTR_CHILD,
+    ATTR_COUNT,
+    COUNTER_TYPES,
+    DOMAIN,
+    ENDPOINT_ORDER_KEYS,
+    LOGGER,
+)
+from .errors import CircuitOpenError
+
+if TYPE_CHECKING:
+    from .coordinator import BabyBuddyChildCoordinator
+
+
+class BabyBuddyChildCounters:
+    """Count a child's entries of the local day, per endpoint.
+
+    babybuddy answers a list query with the number of matching entries, so
+    each counter asks for a single entry from midnight on and reads the
+    count. An endpoint is counted again only when its latest entry changed,
+    or for every endpoint once the day rolled over.
+    """
+
+    def __init__(self, coordinator: BabyBuddyChildCoordinator) -> None:
+        """Initialize the counters."""
+        self.coordinator = coordinator
+        self.counts: dict[str, int] = {}
+        # The local day the counts are of.
+        self.day: date | None = None
+        self.pending: set[str] = set()
+        self.counter: asyncio.Task[None] | None = None
+
+    @property
+    def endpoints(self) -> set[str]:
+        """Return the counted endpoints babybuddy serves."""
+        return {
+            description.endpoint for description in COUNTER_TYPES
+        } & self.coordinator.parent.client.endpoints.keys()
+
+    def count(self, endpoint: str) -> int | None:
+        """Return the entries of an endpoint today, None if not counted yet."""
+        return self.counts.get(endpoint)
+
+    def schedule(self, changed_endpoints: set[str] | None) -> None:
+        """Queue the endpoints to count again and start counting.
+
+        changed_endpoints are those whose latest entry changed, None if any
+        may have.
+        """
+        today = dt_util.now().date()
+        if today != self.day or changed_endpoints is None:
+            self.pending = set(self.endpoints)
+        else:
+            self.pending |= changed_endpoints & self.endpoints
+        if self.pending and (self.counter is None or self.counter.done()):
+            self.counter = self.coordinator.entry.async_create_background_task(
+                self.coordinator.hass,
+                self.async_count_pending(),
+                f"{DOMAIN} child {self.coordinator.child.id} counters",
+            )
+
+    async def async_count_pending(self) -> None:
+        """Count the queued endpoints and let the counter sensors write.
+
+        An endpoint that could not be counted stays queued for the next
+        update. Once the day rolled over, every endpoint is counted before
+        the new counts replace the old ones, so no counter is left unknown
+        while the others are counted or after a request failed.
+        """
+        midnight = dt_util.start_of_local_day()
+        rollover = self.day != midnight.date()
+        if rollover:
+            self.pending |= self.endpoints
+        counts = {} if rollover else self.counts
+        changed = False
+        while self.pending:
+            endpoint = self.pending.pop()
+            try:
+                count = await self.async_fetch_count(endpoint, midnight)
+            except (TimeoutError, ClientError, CircuitOpenError) as error:
+                LOGGER.debug(f"Could not count today's {endpoint}. error: {error}")
+                self.pending.add(endpoint)
+                break
+            changed |= counts.get(endpoint) != count
+            counts[endpoint] = count
+        if rollover:
+            if self.pending:
+                return
+            self.counts, self.day = counts, midnight.date()
+            changed = True
+        if changed:
+            self.coordinator.async_notify_aggregates()
+
+    async def async_fetch_count(self, endpoint: str, midnight: datetime) -> int:
+        """Return the number of entries of an endpoint since midnight."""
+        query = urlencode(
+            {
+                ATTR_CHILD: self.coordinator.child.id,
+                **since_filter(ENDPOINT_ORDER_KEYS[endpoint], midnight),
+                "limit": 1,
+            }
+        )
+        async with self.coordinator.parent.semaphore:
+            data = await self.coordinator.parent.client.async_get(endpoint, f"?{query}")
+        return int(data[ATTR_COUNT])
@@ -36,9 +36,34 @@ async def async_get_config_entry_diagnostics(
             "unique_id": entry.unique_id,
             "version": entry.version,
         },
-        "coordinator_data": async_redact_data(list(coordinator.data), TO_REDACT)
+        "coordinator_data": async_redact_data(coordinator.data.as_json(), TO_REDACT)
         if coordinator
         else None,
+        "client": {
+            "cache_hits": coordinator.client.cache_hits,
+            "cache_misses": coordinator.client.cache_misses,
+            "cached_responses": len(coordinator.client.cache),
+            "coalesced_requests": coordinator.client.coalesced,
+            "retries": coordinator.client.retries,
+            "circuit_open": coordinator.client.breaker.is_open,
+            "circuit_trips": coordinator.client.breaker.trips,
+            "circuit_rejected": coordinator.client.breaker.rejected,
+            "endpoints_cached": coordinator.client.endpoints_cached,
+        },
+        "history": {
+            "enabled": coordinator.history.enabled,
+            "progress": coordinator.history.progress,
+            "checkpoints": coordinator.history.checkpoints,
+        },
+        "polling": {
+            child_id: child_coordinator.scheduler.as_dict()
+            for child_id, child_coordinator in coordinator.child_coordinators.items()
+        },
+        "stats": coordinator.client.stats.as_dict(),
+        "write_queue": {
+            "depth": coordinator.write_queue.depth,
+            "deferred": sum(write.deferred for write in coordinator.write_queue.writes),
+        },
     }
 
 
@@ -62,7 +87,7 @@ async def async_get_device_diagnostics(
             "identifiers": list(device.identifiers),
             "name": async_redact_data(device.name, TO_REDACT),
         },
-        "coordinator_data": async_redact_data(list(coordinator.data), TO_REDACT)
+        "coordinator_data": async_redact_data(coordinator.data.as_json(), TO_REDACT)
         if coordinator
         else None,
     }
@@ -2,20 +2,28 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any
 
+from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.components.select import SelectEntity
 from homeassistant.components.sensor import SensorEntity
-from homeassistant.components.sensor.const import SensorDeviceClass
+from homeassistant.components.sensor.const import SensorStateClass
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.const import (
     ATTR_ID,
-    ATTR_TIME,
+    ATTR_NAME,
+    ATTR_RESTORED,
     CONF_API_KEY,
     CONF_HOST,
     CONF_PATH,
     CONF_PORT,
+    PERCENTAGE,
+    EntityCategory,
 )
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.event import async_track_point_in_time
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -24,53 +32,100 @@
 from .client import get_datetime_from_time
 from .const import (
     ATTR_BABYBUDDY_CHILD,
-    ATTR_BIRTH_DATE,
-    ATTR_CHANGES,
     ATTR_CHILD,
     ATTR_DESCRIPTIVE,
-    ATTR_FIRST_NAME,
     ATTR_ICON_CHILD_SENSOR,
+    ATTR_ICON_HISTORY,
+    ATTR_ICON_MEDICATION,
     ATTR_ICON_TIMER_SAND,
-    ATTR_LAST_NAME,
+    ATTR_ICON_TRAY,
     ATTR_MEDICATION,
-    ATTR_NEXT_DOSE_INTERVAL,
     ATTR_NEXT_DOSE_READY,
     ATTR_NEXT_DOSE_TIME,
-    ATTR_PICTURE,
-    ATTR_SLUG,
-    ATTR_SOLID,
+    ATTR_QUEUED,
     ATTR_START,
     ATTR_TIMER,
     ATTR_TIMERS,
-    ATTR_WET,
     DIAPER_TYPES,
     DOMAIN,
+    BabyBuddyAggregateDescription,
+    BabyBuddyCounterDescription,
     BabyBuddyEntityDescription,
     BabyBuddySelectDescription,
+    BabyBuddyServerSensorDescription,
 )
-from .coordinator import BabyBuddyCoordinator
+from .coordinator import BabyBuddyChildCoordinator, BabyBuddyCoordinator
+from .models import Change, Child, Entry, Medication, Timer
+
+
+def restored_attributes(
+    coordinator: BabyBuddyChildCoordinator, attrs: dict[str, Any]
+) -> dict[str, Any]:
+    """Mark attributes as restored while the data is from the last run."""
+    if coordinator.restored:
+        return {**attrs, ATTR_RESTORED: True}
+    return attrs
+
+
+class NextDoseTimer:
+    """Call back when the next dose of a medication entry falls due.
+
+    One point in time is tracked at a time; scheduling another entry, or an
+    entry with another next dose time, replaces it.
+    """
+
+    def __init__(self, hass: HomeAssistant, action: CALLBACK_TYPE) -> None:
+        """Initialize the timer."""
+        self.hass = hass
+        self.action = action
+        self.when: datetime | None = None
+        self.unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def schedule(self, entry: Entry | None) -> None:
+        """Track the next dose time of an entry, if it is still ahead."""
+        when = entry.next_dose_time if isinstance(entry, Medication) else None
+        if when == self.when:
+            return
+        self.cancel()
+        self.when = when
+        if when is not None and when > dt_util.utcnow():
+            self.unsub = async_track_point_in_time(self.hass, self.fire, when)
+
+    @callback
+    def fire(self, now: datetime) -> None:
+        """Run the action once the next dose is due."""
+        self.unsub = None
+        self.action()
+
+    @callback
+    def cancel(self) -> None:
+        """Stop tracking the next dose time."""
+        if self.unsub is not None:
+            self.unsub()
+            self.unsub = None
 
 
 class BabyBuddySensor(CoordinatorEntity, SensorEntity):
     """Base class for babybuddy sensors."""
 
-    coordinator: BabyBuddyCoordinator
+    coordinator: BabyBuddyChildCoordinator
 
-    def __init__(self, coordinator: BabyBuddyCoordinator, child: dict) -> None:
+    def __init__(self, coordinator: BabyBuddyChildCoordinator, child: Child) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
         self.child = child
         self._attr_device_info = {
-            "configuration_url": f"{coordinator.entry.data[CONF_HOST]}:{coordinator.entry.data[CONF_PORT]}{coordinator.entry.data[CONF_PATH]}/children/{child[ATTR_SLUG]}/dashboard/",
-            "identifiers": {(DOMAIN, child[ATTR_ID])},
-            "name": f"{child[ATTR_FIRST_NAME]} {child[ATTR_LAST_NAME]}",
+            "configuration_url": f"{coordinator.entry.data[CONF_HOST]}:{coordinator.entry.data[CONF_PORT]}{coordinator.entry.data[CONF_PATH]}/children/{child.slug}/dashboard/",
+            "identifiers": {(DOMAIN, child.id)},
+            "name": f"{child.first_name} {child.last_name}",
         }
 
 
 class BabyBuddyChildSensor(BabyBuddySensor):
     """Representation of a babybuddy child sensor."""
 
-    def __init__(self, coordinator: BabyBuddyCoordinator, child: dict) -> None:
+    def __init__(self, coordinator: BabyBuddyChildCoordinator, child: Child) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, child)
 
@@ -78,23 +133,28 @@ def __init__(self, coordinator: BabyBuddyCoordinator, child: dict) -> None:
         # sensor.<first>_<last>_baby.
         self._attr_has_entity_name = True
         self._attr_name = "Baby"
-        self._attr_unique_id = (
-            f"{coordinator.entry.data[CONF_API_KEY]}-{child[ATTR_ID]}"
+        self._attr_unique_id = f"{coordinator.entry.data[CONF_API_KEY]}-{child.id}"
+        self._attr_native_value = (
+            child.birth_date.isoformat() if child.birth_date else None
         )
-        self._attr_native_value = child[ATTR_BIRTH_DATE]
         self._attr_icon = ATTR_ICON_CHILD_SENSOR
         self._attr_device_class = ATTR_BABYBUDDY_CHILD
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if more than entries may have changed."""
+        if self.coordinator.changed_endpoints is None:
+            super()._handle_coordinator_update()
+
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes for babybuddy."""
-        return self.child
+        return restored_attributes(self.coordinator, self.child.as_dict())
 
     @property
     def entity_picture(self) -> str | None:
         """Return babybuddy picture."""
-        image: str | None = self.child[ATTR_PICTURE]
-        return image
+        return self.child.picture
 
 
 class BabyBuddyChildDataSensor(BabyBuddySensor):
@@ -104,15 +164,44 @@ class BabyBuddyChildDataSensor(BabyBuddySensor):
 
     def __init__(
         self,
-        coordinator: BabyBuddyCoordinator,
-        child: dict,
+        coordinator: BabyBuddyChildCoordinator,
+        child: Child,
         description: BabyBuddyEntityDescription,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, child)
 
         self.entity_description = description
-        self._attr_unique_id = f"{self.coordinator.entry.data[CONF_API_KEY]}-{child[ATTR_ID]}-{description.key}"
+        self._attr_unique_id = (
+            f"{self.coordinator.entry.data[CONF_API_KEY]}-{child.id}-{description.key}"
+        )
+        # State and attributes of the current coordinator data, computed once
+        # however often HA reads them.
+        self.cached_state: tuple[StateType | datetime, dict[str, Any]] | None = None
+        self.dose_timer: NextDoseTimer | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Write next_dose_ready again when the next dose falls due."""
+        await super().async_added_to_hass()
+        if self.entity_description.key == ATTR_MEDICATION:
+            self.dose_timer = NextDoseTimer(self.hass, self.async_write_new_state)
+            self.async_on_remove(self.dose_timer.cancel)
+            self.dose_timer.schedule(self.entry)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Drop the state of the previous entry and write the new one."""
+        if not self.coordinator.endpoint_changed(self.entity_description.key):
+            return
+        if self.dose_timer is not None:
+            self.dose_timer.schedule(self.entry)
+        self.async_write_new_state()
+
+    @callback
+    def async_write_new_state(self) -> None:
+        """Drop the cached state and write it anew."""
+        self.cached_state = None
+        super()._handle_coordinator_update()
 
     @property
     def name(self) -> str:
@@ -120,129 +209,405 @@ def name(self) -> str:
         sensor_type = self.entity_description.key
         if sensor_type[-1] == "s":
             sensor_type = sensor_type[:-1]
-        return f"{self.child[ATTR_FIRST_NAME]} {self.child[ATTR_LAST_NAME]} last {sensor_type}"
+        return f"{self.child.first_name} {self.child.last_name} last {sensor_type}"
 
     @property
-    def native_value(self) -> StateType:
+    def entry(self) -> Entry | None:
+        """Return the latest entry of the endpoint for the child."""
+        return self.coordinator.latest(self.entity_description.key)
+
+    @property
+    def native_value(self) -> StateType | datetime:
         """Return entity state."""
-        if self.child[ATTR_ID] not in self.coordinator.data[1]:
-            return None
-        data: dict[str, str] = self.coordinator.data[1][self.child[ATTR_ID]][
-            self.entity_description.key
-        ]
-        if not data:
+        return self.computed_state()[0]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return entity specific state attributes."""
+        return self.computed_state()[1]
+
+    def computed_state(self) -> tuple[StateType | datetime, dict[str, Any]]:
+        """Return the state and attributes, computing them on first use."""
+        if self.cached_state is None:
+            self.cached_state = (self.compute_value(), self.compute_attributes())
+        return self.cached_state
+
+    def compute_value(self) -> StateType | datetime:
+        """Compute the state from the latest entry."""
+        entry = self.entry
+        if entry is None:
             return None
         if callable(self.entity_description.state_key):
-            return self.entity_description.state_key(data)
-        if self.entity_description.device_class == SensorDeviceClass.TIMESTAMP:
-            return dt_util.parse_datetime(data[self.entity_description.state_key])
+            return self.entity_description.state_key(entry)
+        value: StateType | datetime = getattr(entry, self.entity_description.state_key)
+        return value
+
+    def compute_attributes(self) -> dict[str, Any]:
+        """Compute the attributes from the latest entry."""
+        entry = self.entry
+        attrs: dict[str, Any] = {} if entry is None else entry.as_dict()
+        if isinstance(entry, Change):
+            wet_and_solid = (bool(entry.wet), bool(entry.solid))
+            if wet_and_solid == (True, False):
+                attrs[ATTR_DESCRIPTIVE] = DIAPER_TYPES[0]
+            if wet_and_solid == (False, True):
+                attrs[ATTR_DESCRIPTIVE] = DIAPER_TYPES[1]
+            if wet_and_solid == (True, True):
+                attrs[ATTR_DESCRIPTIVE] = DIAPER_TYPES[2]
+        if isinstance(entry, Medication) and entry.next_dose_time is not None:
+            attrs[ATTR_NEXT_DOSE_TIME] = entry.next_dose_time
+            attrs[ATTR_NEXT_DOSE_READY] = dt_util.now() >= entry.next_dose_time
+
+        return restored_attributes(self.coordinator, attrs)
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Return entity unit of measurement."""
+        return self.coordinator.entry.options.get(
+            self.entity_description.key,
+            self.entity_description.native_unit_of_measurement,
+        )
+
+
+class BabyBuddyChildAggregateSensor(BabyBuddySensor):
+    """Representation of a sensor aggregating a child's recent entries."""
+
+    entity_description: BabyBuddyAggregateDescription
+
+    def __init__(
+        self,
+        coordinator: BabyBuddyChildCoordinator,
+        child: Child,
+        description: BabyBuddyAggregateDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, child)
+
+        self.entity_description = description
+        self.window = coordinator.windows.windows[description.key]
+        self._attr_name = f"{child.first_name} {child.last_name} {description.name}"
+        self._attr_unique_id = (
+            f"{self.coordinator.entry.data[CONF_API_KEY]}-{child.id}-{description.key}"
+        )
+        # Totals of the last state written, to skip updates that keep them.
+        self.written: tuple[float, ...] | None = None
 
-        return data[self.entity_description.state_key]
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the totals or the availability changed."""
+        totals = (*self.window.totals,) if self.coordinator.windows.loaded else None
+        if self.coordinator.changed_endpoints is None or totals != self.written:
+            self.written = totals
+            super()._handle_coordinator_update()
+
+    @property
+    def native_value(self) -> StateType:
+        """Return entity state, unknown until the window is loaded."""
+        if not self.coordinator.windows.loaded:
+            return None
+        return round(self.window.value, 3)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        attrs: dict[str, Any] = {}
-        if self.child[ATTR_ID] in self.coordinator.data[1]:
-            attrs = self.coordinator.data[1][self.child[ATTR_ID]][
-                self.entity_description.key
-            ]
-            if self.entity_description.key == ATTR_CHANGES:
-                wet_and_solid: tuple[bool, bool] = (
-                    self.coordinator.data[1][self.child[ATTR_ID]][
-                        self.entity_description.key
-                    ].get(ATTR_WET, False),
-                    self.coordinator.data[1][self.child[ATTR_ID]][
-                        self.entity_description.key
-                    ].get(ATTR_SOLID, False),
-                )
-                if wet_and_solid == (True, False):
-                    attrs[ATTR_DESCRIPTIVE] = DIAPER_TYPES[0]
-                if wet_and_solid == (False, True):
-                    attrs[ATTR_DESCRIPTIVE] = DIAPER_TYPES[1]
-                if wet_and_solid == (True, True):
-                    attrs[ATTR_DESCRIPTIVE] = DIAPER_TYPES[2]
-            if self.entity_description.key == ATTR_MEDICATION and attrs.get(
-                ATTR_NEXT_DOSE_INTERVAL
-            ):
-                # next_dose_time/next_dose_ready are model properties not
-                # exposed by the babybuddy API, so compute them here.
-                time = dt_util.parse_datetime(attrs.get(ATTR_TIME) or "")
-                interval = dt_util.parse_duration(attrs[ATTR_NEXT_DOSE_INTERVAL])
-                if time is not None and interval is not None:
-                    next_dose_time = time + interval
-                    attrs[ATTR_NEXT_DOSE_TIME] = next_dose_time
-                    attrs[ATTR_NEXT_DOSE_READY] = dt_util.now() >= next_dose_time
-
-        return attrs
+        if not self.coordinator.windows.loaded:
+            return {}
+        return {name: round(value, 3) for name, value in self.window.attributes.items()}
 
     @property
     def native_unit_of_measurement(self) -> str | None:
         """Return entity unit of measurement."""
+        if self.entity_description.unit_option is None:
+            return self.entity_description.native_unit_of_measurement
         return self.coordinator.entry.options.get(
-            self.entity_description.key,
+            self.entity_description.unit_option,
             self.entity_description.native_unit_of_measurement,
         )
 
 
-class BabyBuddyChildTimerSwitch(CoordinatorEntity, SwitchEntity):
-    """Representation of a babybuddy timer switch."""
+class BabyBuddyChildCounterSensor(BabyBuddySensor):
+    """Representation of a sensor counting a child's entries today."""
+
+    entity_description: BabyBuddyCounterDescription
+
+    def __init__(
+        self,
+        coordinator: BabyBuddyChildCoordinator,
+        child: Child,
+        description: BabyBuddyCounterDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, child)
+
+        self.entity_description = description
+        self._attr_name = f"{child.first_name} {child.last_name} {description.name}"
+        self._attr_unique_id = (
+            f"{self.coordinator.entry.data[CONF_API_KEY]}-{child.id}-{description.key}"
+        )
+        # Count of the last state written, to skip updates that keep it.
+        self.written: int | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the count or the availability changed."""
+        count = self.native_value
+        if self.coordinator.changed_endpoints is None or count != self.written:
+            self.written = count
+            super()._handle_coordinator_update()
 
+    @property
+    def native_value(self) -> int | None:
+        """Return the entries today, unknown until counted."""
+        counters = self.coordinator.counters
+        if counters is None:
+            return None
+        return counters.count(self.entity_description.endpoint)
+
+
+def server_device_info(coordinator: BabyBuddyCoordinator) -> DeviceInfo:
+    """Return the device of the babybuddy server itself."""
+    return {
+        "configuration_url": f"{coordinator.entry.data[CONF_HOST]}:{coordinator.entry.data[CONF_PORT]}{coordinator.entry.data[CONF_PATH]}/",
+        "entry_type": DeviceEntryType.SERVICE,
+        "identifiers": {(DOMAIN, coordinator.entry.entry_id)},
+        "name": coordinator.entry.title,
+    }
+
+
+class BabyBuddyServerSensor(CoordinatorEntity, SensorEntity):
+    """Representation of a babybuddy request stats sensor."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
     coordinator: BabyBuddyCoordinator
+    entity_description: BabyBuddyServerSensorDescription
 
     def __init__(
         self,
         coordinator: BabyBuddyCoordinator,
-        child: dict,
+        description: BabyBuddyServerSensorDescription,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self.child = child
-        self._attr_name = (
-            f"{self.child[ATTR_FIRST_NAME]} {self.child[ATTR_LAST_NAME]} {ATTR_TIMER}"
+        self.entity_description = description
+        self._attr_unique_id = (
+            f"{coordinator.entry.data[CONF_API_KEY]}-{description.key}"
         )
+        self._attr_device_info = server_device_info(coordinator)
+
+    @property
+    def native_value(self) -> StateType:
+        """Return entity state."""
+        return self.entity_description.value_fn(self.coordinator.client.stats)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return entity specific state attributes."""
+        return self.entity_description.attributes_fn(self.coordinator.client.stats)
+
+
+class BabyBuddyWriteQueueSensor(SensorEntity):
+    """Representation of the number of writes waiting for babybuddy."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+    _attr_icon = ATTR_ICON_TRAY
+    _attr_name = "Write queue"
+    _attr_should_poll = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: BabyBuddyCoordinator) -> None:
+        """Initialize the sensor."""
+        self.write_queue = coordinator.write_queue
+        self._attr_unique_id = f"{coordinator.entry.data[CONF_API_KEY]}-write_queue"
+        self._attr_device_info = server_device_info(coordinator)
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state when the queue changes."""
+        self.async_on_remove(
+            self.write_queue.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the number of writes not confirmed by babybuddy yet."""
+        return self.write_queue.depth
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return entity specific state attributes."""
+        deferred = [write for write in self.write_queue.writes if write.deferred]
+        return {
+            ATTR_QUEUED: len(deferred),
+            "oldest": deferred[0].created if deferred else None,
+        }
+
+
+class BabyBuddyHistorySensor(SensorEntity):
+    """Representation of the progress of the history import."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+    _attr_icon = ATTR_ICON_HISTORY
+    _attr_name = "History import"
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_should_poll = False
+
+    def __init__(self, coordinator: BabyBuddyCoordinator) -> None:
+        """Initialize the sensor."""
+        self.history = coordinator.history
+        self._attr_unique_id = f"{coordinator.entry.data[CONF_API_KEY]}-history"
+        self._attr_device_info = server_device_info(coordinator)
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state as the import progresses."""
+        self.async_on_remove(self.history.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the share of statistics fully imported."""
+        return self.history.progress
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return entity specific state attributes."""
+        return {
+            "importing": self.history.current,
+            "pending": len(self.history.pending),
+            "imported_records": self.history.imported_records,
+        }
+
+
+class BabyBuddyChildTimerSwitch(CoordinatorEntity, SwitchEntity):
+    """Representation of a babybuddy timer switch."""
+
+    coordinator: BabyBuddyChildCoordinator
+
+    def __init__(
+        self,
+        coordinator: BabyBuddyChildCoordinator,
+        child: Child,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.child = child
+        self._attr_name = f"{self.child.first_name} {self.child.last_name} {ATTR_TIMER}"
         self._attr_unique_id = (
-            f"{self.coordinator.entry.data[CONF_API_KEY]}-{child[ATTR_ID]}-{ATTR_TIMER}"
+            f"{self.coordinator.entry.data[CONF_API_KEY]}-{child.id}-{ATTR_TIMER}"
         )
         self._attr_icon = ATTR_ICON_TIMER_SAND
         self._attr_device_info = {
-            "identifiers": {(DOMAIN, child[ATTR_ID])},
-            "name": f"{child[ATTR_FIRST_NAME]} {child[ATTR_LAST_NAME]}",
+            "identifiers": {(DOMAIN, child.id)},
+            "name": f"{child.first_name} {child.last_name}",
         }
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the timer may have changed."""
+        if self.coordinator.endpoint_changed(ATTR_TIMERS):
+            super()._handle_coordinator_update()
+
+    @property
+    def timer(self) -> Timer | None:
+        """Return the running timer of the child, if any."""
+        timer = self.coordinator.latest(ATTR_TIMERS)
+        if isinstance(timer, Timer) and timer.active:
+            return timer
+        return None
+
     @property
     def is_on(self) -> bool:
         """Return entity state."""
-        if self.child[ATTR_ID] in self.coordinator.data[1]:
-            timer_data = self.coordinator.data[1][self.child[ATTR_ID]][ATTR_TIMERS]
-            # In Babybuddy 2.0 'active' is not in the JSON response, so return
-            # True if any timers are returned, as only active timers are
-            # returned.
-            return timer_data.get("active", len(timer_data) > 0)
-        return False
+        return self.timer is not None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes for babybuddy."""
-        attrs: dict[str, Any] = {}
-        if self.is_on:
-            attrs = self.coordinator.data[1][self.child[ATTR_ID]].get(ATTR_TIMERS)
-        return attrs
+        timer = self.timer
+        attrs: dict[str, Any] = {} if timer is None else timer.as_dict()
+        return restored_attributes(self.coordinator, attrs)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Start a new timer."""
         data: dict[str, Any] = {
-            ATTR_CHILD: self.child[ATTR_ID],
+            ATTR_CHILD: self.child.id,
             ATTR_START: get_datetime_from_time(dt_util.now()),
         }
-        await self.coordinator.client.async_post(ATTR_TIMERS, data)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.parent.write_queue.async_post(
+            ATTR_TIMERS, data, self.child.id
+        )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Delete active timer."""
         timer_id = self.extra_state_attributes[ATTR_ID]
-        await self.coordinator.client.async_delete(ATTR_TIMERS, timer_id)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.parent.write_queue.async_delete(
+            ATTR_TIMERS, timer_id, self.child.id
+        )
+
+
+class BabyBuddyChildNextDoseSensor(CoordinatorEntity, BinarySensorEntity):
+    """Representation of whether a child's next medication dose is due."""
+
+    _attr_icon = ATTR_ICON_MEDICATION
+    coordinator: BabyBuddyChildCoordinator
+
+    def __init__(self, coordinator: BabyBuddyChildCoordinator, child: Child) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.child = child
+        self._attr_name = f"{child.first_name} {child.last_name} next dose ready"
+        self._attr_unique_id = (
+            f"{coordinator.entry.data[CONF_API_KEY]}-{child.id}-{ATTR_NEXT_DOSE_READY}"
+        )
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, child.id)},
+            "name": f"{child.first_name} {child.last_name}",
+        }
+        self.dose_timer: NextDoseTimer | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Turn on at the next dose time, without polling."""
+        await super().async_added_to_hass()
+        self.dose_timer = NextDoseTimer(self.hass, self.async_write_ha_state)
+        self.async_on_remove(self.dose_timer.cancel)
+        self.dose_timer.schedule(self.medication)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Reschedule and write the state only if the medication may have changed."""
+        if not self.coordinator.endpoint_changed(ATTR_MEDICATION):
+            return
+        if self.dose_timer is not None:
+            self.dose_timer.schedule(self.medication)
+        super()._handle_coordinator_update()
+
+    @property
+    def medication(self) -> Medication | None:
+        """Return the latest medication entry of the child."""
+        entry = self.coordinator.latest(ATTR_MEDICATION)
+        return entry if isinstance(entry, Medication) else None
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return whether the next dose is due, None without an interval."""
+        medication = self.medication
+        if medication is None or medication.next_dose_time is None:
+            return None
+        return dt_util.utcnow() >= medication.next_dose_time
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return entity specific state attributes."""
+        medication = self.medication
+        attrs: dict[str, Any] = (
+            {}
+            if medication is None
+            else {
+                ATTR_NAME: medication.name,
+                ATTR_NEXT_DOSE_TIME: medication.next_dose_time,
+            }
+        )
+        return restored_attributes(self.coordinator, attrs)
 
 
 class BabyBuddySelect(CoordinatorEntity, SelectEntity, RestoreEntity):
@@ -11,6 +11,10 @@ class ConnectError(BabyBuddyError):
     """Raise connection error..."""
 
 
+class CircuitOpenError(ConnectError):
+    """Raise if requests are paused because babybuddy is unreachable."""
+
+
 class AuthorizationError(BabyBuddyError):
     """Raise authorization exception."""
 
@@ -0,0 +1,300 @@
+"""Import of babybuddy history into long-term statistics."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Mapping
+from contextlib import aclosing
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any
+
+from aiohttp.client_exceptions import ClientError
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .client import since_filter
+from .const import (
+    ATTR_RESULTS,
+    ATTR_START,
+    CONF_IMPORT_HISTORY,
+    DOMAIN,
+    ENDPOINT_ORDER_KEYS,
+    HISTORY_IMPORT_CHUNK,
+    HISTORY_PAGE_SIZE,
+    LOGGER,
+    STATISTIC_TYPES,
+    STORAGE_VERSION,
+    BabyBuddyStatisticDescription,
+)
+from .errors import CircuitOpenError
+from .models import Child, Entry, parse_entry
+
+if TYPE_CHECKING:
+    from .coordinator import BabyBuddyCoordinator
+
+RECORDER = "recorder"
+
+
+def statistic_id(child: Child, description: BabyBuddyStatisticDescription) -> str:
+    """Return the id of a child's statistic."""
+    return f"{DOMAIN}:child_{child.id}_{description.key}"
+
+
+def entry_hour(entry: Entry, order_key: str) -> datetime | None:
+    """Return the start of the UTC hour an entry is counted in.
+
+    Measurements only have a date; they are counted at local midnight.
+    """
+    when: date | datetime | None = getattr(entry, order_key, None)
+    if when is None:
+        return None
+    if not isinstance(when, datetime):
+        when = dt_util.start_of_local_day(when)
+    return dt_util.as_utc(when).replace(minute=0, second=0, microsecond=0)
+
+
+@dataclass
+class HourlyStatistic:
+    """Values of one statistic in one hour.
+
+    Only hourly rows are imported. External statistics have no daily rows:
+    the recorder reduces the hourly rows to days, weeks and months when they
+    are queried, so daily totals follow from these.
+    """
+
+    start: datetime
+    values: list[float]
+
+    def as_row(self, total: float, has_sum: bool) -> StatisticData:
+        """Return the hour as a recorder row, with total the sum up to it."""
+        if has_sum:
+            return StatisticData(start=self.start, state=sum(self.values), sum=total)
+        return StatisticData(
+            start=self.start,
+            mean=sum(self.values) / len(self.values),
+            min=min(self.values),
+            max=max(self.values),
+        )
+
+
+class BabyBuddyHistory:
+    """Import the history of every child into long-term statistics.
+
+    Each statistic is imported in order from a checkpoint, the start of the
+    last hour imported and, for sums, the running sum before that hour. The
+    first import walks the whole history; after that, whenever a refresh
+    changes the latest entry of an endpoint, only the records from the
+    checkpoint on are fetched. The last hour is always imported again, so
+    entries added to it since are counted. Records are streamed page by page
+    and imported in chunks of hours, so memory does not grow with the history.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: BabyBuddyCoordinator) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{coordinator.entry.entry_id}.history"
+        )
+        # Read at setup; turning the option on or off reloads the entry.
+        self.enabled: bool = coordinator.entry.options.get(CONF_IMPORT_HISTORY, False)
+        self.checkpoints: dict[str, dict[str, Any]] = {}
+        # Statistics to import, by id, with the child they belong to.
+        self.pending: dict[str, tuple[int, BabyBuddyStatisticDescription]] = {}
+        # Latest entries seen per child, to tell which endpoints changed.
+        self.seen: dict[int, Mapping[str, Entry]] = {}
+        self.importer: asyncio.Task[None] | None = None
+        self.listeners: list[CALLBACK_TYPE] = []
+        self.current: str | None = None
+        self.current_progress = 0.0
+        self.imported_records = 0
+
+    @property
+    def progress(self) -> float | None:
+        """Return the share of statistics fully imported, in percent."""
+        statistics = self.checkpoints.keys() | self.pending.keys()
+        if self.current is not None:
+            statistics.add(self.current)
+        if not statistics:
+            return None
+        done: float = sum(
+            1 for checkpoint in self.checkpoints.values() if checkpoint.get("complete")
+        )
+        if self.current is not None and not self.checkpoints.get(self.current, {}).get(
+            "complete"
+        ):
+            done += self.current_progress
+        return round(100 * done / len(statistics), 1)
+
+    async def async_start(self) -> None:
+        """Load the checkpoints and import on every refresh from now on."""
+        if RECORDER not in self.hass.config.components:
+            LOGGER.warning("History import needs the recorder, which is not loaded")
+            return
+        self.checkpoints = await self.store.async_load() or {}
+        self.coordinator.entry.async_on_unload(
+            self.coordinator.async_add_listener(self.async_schedule)
+        )
+        self.async_schedule()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for import progress."""
+        self.listeners.append(update_callback)
+        return lambda: self.listeners.remove(update_callback)
+
+    @callback
+    def async_notify(self) -> None:
+        """Notify listeners of import progress."""
+        for update_callback in list(self.listeners):
+            update_callback()
+
+    @callback
+    def async_schedule(self) -> None:
+        """Queue the statistics whose endpoint changed and start importing."""
+        data = self.coordinator.data
+        if data is None:
+            return
+        for child_id, entries in data.entries.items():
+            seen = self.seen.get(child_id, {})
+            for description in STATISTIC_TYPES:
+                entry = entries.get(description.endpoint)
+                if entry is None or entry is seen.get(description.endpoint):
+                    continue
+                self.pending[statistic_id(data.children[child_id], description)] = (
+                    child_id,
+                    description,
+                )
+            self.seen[child_id] = entries
+        if self.pending and (self.importer is None or self.importer.done()):
+            self.importer = self.coordinator.entry.async_create_background_task(
+                self.hass, self.async_import_pending(), f"{DOMAIN} history import"
+            )
+        self.async_notify()
+
+    async def async_import_pending(self) -> None:
+        """Import the queued statistics one after another.
+
+        A statistic that could not be fetched stays queued and is retried on
+        the next refresh.
+        """
+        while self.pending:
+            statistic = next(iter(self.pending))
+            child_id, description = self.pending.pop(statistic)
+            child = self.coordinator.data.children.get(child_id)
+            if child is None:
+                continue
+            self.current, self.current_progress = statistic, 0.0
+            try:
+                await self.async_import(child, description)
+            except (TimeoutError, ClientError, CircuitOpenError) as error:
+                LOGGER.debug(f"History import of {statistic} stopped. error: {error}")
+                self.pending.setdefault(statistic, (child_id, description))
+                return
+            finally:
+                self.current = None
+                self.async_notify()
+
+    async def async_import(
+        self, child: Child, description: BabyBuddyStatisticDescription
+    ) -> None:
+        """Import the records of a statistic from its checkpoint on."""
+        statistic = statistic_id(child, description)
+        checkpoint = self.checkpoints.get(statistic, {})
+        resume = dt_util.parse_datetime(checkpoint.get(ATTR_START) or "")
+        total: float = checkpoint.get("sum", 0.0)
+        order_key = ENDPOINT_ORDER_KEYS[description.endpoint]
+        metadata = StatisticMetaData(
+            mean_type=StatisticMeanType.NONE
+            if description.has_sum
+            else StatisticMeanType.ARITHMETIC,
+            has_sum=description.has_sum,
+            name=f"{child.first_name} {child.last_name} {description.name}",
+            source=DOMAIN,
+            statistic_id=statistic,
+            unit_class=None,
+            unit_of_measurement=self.coordinator.entry.options.get(
+                description.endpoint, description.native_unit_of_measurement
+            ),
+        )
+
+        rows: list[StatisticData] = []
+        hour: HourlyStatistic | None = None
+        # The running sum before the hour of the last row.
+        last_total = total
+        fetched = 0
+        async with aclosing(
+            self.coordinator.client.async_iter_pages(
+                description.endpoint,
+                child=child.id,
+                ordering=order_key,
+                page_size=HISTORY_PAGE_SIZE,
+                **since_filter(order_key, resume),
+            )
+        ) as pages:
+            async for page in pages:
+                for data in page[ATTR_RESULTS]:
+                    fetched += 1
+                    entry = parse_entry(description.endpoint, data)
+                    start = entry_hour(entry, order_key)
+                    value = description.value_fn(entry)
+                    if start is None or value is None:
+                        continue
+                    # The filter may not be supported by every babybuddy version.
+                    if resume is not None and start < resume:
+                        continue
+                    if hour is not None and hour.start != start:
+                        last_total = total
+                        total += sum(hour.values) if description.has_sum else 0
+                        rows.append(hour.as_row(total, description.has_sum))
+                        hour = None
+                    if hour is None:
+                        hour = HourlyStatistic(start, [])
+                    hour.values.append(value)
+                    self.imported_records += 1
+                if page.get("count"):
+                    self.current_progress = min(fetched / page["count"], 1.0)
+                if len(rows) >= HISTORY_IMPORT_CHUNK:
+                    await self.async_save_rows(metadata, rows, last_total, False)
+
+        if hour is not None:
+            last_total = total
+            total += sum(hour.values) if description.has_sum else 0
+            rows.append(hour.as_row(total, description.has_sum))
+        await self.async_save_rows(metadata, rows, last_total, True)
+
+    async def async_save_rows(
+        self,
+        metadata: StatisticMetaData,
+        rows: list[StatisticData],
+        last_total: float,
+        complete: bool,
+    ) -> None:
+        """Import the rows collected so far and save the checkpoint after them.
+
+        The checkpoint is the hour of the last row, with last_total the sum
+        before it, so the next import starts over at that hour.
+        """
+        statistic = metadata["statistic_id"]
+        if rows:
+            # The recorder imports the rows later, in its own thread.
+            async_add_external_statistics(self.hass, metadata, rows.copy())
+            self.checkpoints[statistic] = {
+                ATTR_START: rows[-1]["start"].isoformat(),
+                "sum": last_total,
+                "complete": complete,
+            }
+            rows.clear()
+        elif complete:
+            self.checkpoints.setdefault(statistic, {})["complete"] = True
+        await self.store.async_save(self.checkpoints)
+        self.async_notify()
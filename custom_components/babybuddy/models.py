@@ -0,0 +1,346 @@
+"""Typed data model for babybuddy integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime, timedelta
+from functools import cache
+from types import MappingProxyType
+from typing import Any, Self
+
+from homeassistant.const import ATTR_ID, ATTR_TEMPERATURE
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_BMI,
+    ATTR_CHANGES,
+    ATTR_CHILDREN,
+    ATTR_ENTRIES,
+    ATTR_FEEDINGS,
+    ATTR_HEAD_CIRCUMFERENCE_DASH,
+    ATTR_HEIGHT,
+    ATTR_MEDICATION,
+    ATTR_NOTES,
+    ATTR_PUMPING,
+    ATTR_SLEEP,
+    ATTR_TIMERS,
+    ATTR_TUMMY_TIMES,
+    ATTR_WEIGHT,
+)
+
+
+def format_duration(value: timedelta) -> str:
+    """Format a duration the way babybuddy (Django) serializes it."""
+    seconds = int(value.total_seconds())
+    text = f"{seconds % 86400 // 3600:02}:{seconds % 3600 // 60:02}:{seconds % 60:02}"
+    if seconds >= 86400:
+        text = f"{seconds // 86400} {text}"
+    if value.microseconds:
+        text = f"{text}.{value.microseconds:06}"
+    return text
+
+
+# Fields parsed at ingest, by name, and how to serialize them back.
+PARSERS: dict[str, Callable[[Any], Any]] = {
+    "birth_date": dt_util.parse_date,
+    "date": dt_util.parse_date,
+    "duration": dt_util.parse_duration,
+    "end": dt_util.parse_datetime,
+    "next_dose_interval": dt_util.parse_duration,
+    "start": dt_util.parse_datetime,
+    "tags": tuple,
+    "time": dt_util.parse_datetime,
+}
+FORMATTERS: dict[type, Callable[[Any], Any]] = {
+    date: date.isoformat,
+    datetime: datetime.isoformat,
+    timedelta: format_duration,
+    tuple: list,
+}
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Record:
+    """A babybuddy API object.
+
+    Known fields are typed attributes, parsed once when the JSON comes in.
+    Fields this integration does not know, e.g. from a newer babybuddy, are
+    kept in extra so that they still show up as attributes. Records are
+    immutable, so snapshots can share them.
+    """
+
+    id: int
+    extra: Mapping[str, Any] | None = None
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> Self:
+        """Build a record from babybuddy JSON."""
+        names = field_names(cls)
+        values: dict[str, Any] = {}
+        extra: dict[str, Any] = {}
+        for key, value in data.items():
+            if key not in names:
+                extra[key] = value
+            elif value is not None and key in PARSERS:
+                values[key] = PARSERS[key](value)
+            else:
+                values[key] = value
+        return cls(**values, extra=MappingProxyType(extra) if extra else None)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record as babybuddy JSON."""
+        data: dict[str, Any] = {}
+        for name in field_names(type(self)):
+            value = getattr(self, name)
+            formatter = FORMATTERS.get(type(value))
+            data[name] = value if formatter is None else formatter(value)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+@cache
+def field_names(cls: type[Record]) -> tuple[str, ...]:
+    """Return the names of the known fields of a record type, in order."""
+    return tuple(f.name for f in fields(cls) if f.name != "extra")
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Child(Record):
+    """A child."""
+
+    first_name: str
+    last_name: str
+    birth_date: date | None = None
+    slug: str | None = None
+    picture: str | None = None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Entry(Record):
+    """An entry of a child, of an endpoint without a specific type."""
+
+    child: int | None = None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class TimeEntry(Entry):
+    """An entry made at a point in time."""
+
+    time: datetime | None = None
+    tags: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class SpanEntry(Entry):
+    """An entry spanning a period of time."""
+
+    start: datetime | None = None
+    end: datetime | None = None
+    duration: timedelta | None = None
+    tags: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DateEntry(Entry):
+    """A measurement made on a date."""
+
+    date: date | None = None
+    notes: str | None = None
+    tags: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Change(TimeEntry):
+    """A diaper change."""
+
+    wet: bool | None = None
+    solid: bool | None = None
+    color: str | None = None
+    amount: float | None = None
+    notes: str | None = None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Feeding(SpanEntry):
+    """A feeding."""
+
+    type: str | None = None
+    method: str | None = None
+    amount: float | None = None
+    notes: str | None = None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Medication(TimeEntry):
+    """A dose of medication."""
+
+    name: str | None = None
+    dosage: float | None = None
+    dosage_unit: str | None = None
+    next_dose_interval: timedelta | None = None
+    notes: str | None = None
+
+    @property
+    def next_dose_time(self) -> datetime | None:
+        """Return when the next dose is due, if an interval is set.
+
+        babybuddy computes this in its model but does not expose it.
+        """
+        if self.time is None or not self.next_dose_interval:
+            return None
+        return self.time + self.next_dose_interval
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Note(TimeEntry):
+    """A note."""
+
+    note: str | None = None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Pumping(SpanEntry):
+    """A pumping session."""
+
+    amount: float | None = None
+    notes: str | None = None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Sleep(SpanEntry):
+    """A sleep."""
+
+    nap: bool | None = None
+    notes: str | None = None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Temperature(TimeEntry):
+    """A temperature reading."""
+
+    temperature: float | None = None
+    notes: str | None = None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Timer(Entry):
+    """A running timer."""
+
+    name: str | None = None
+    start: datetime | None = None
+    duration: timedelta | None = None
+    user: int | None = None
+
+    @property
+    def active(self) -> bool:
+        """Return whether the timer runs.
+
+        babybuddy 2.0 only lists running timers and dropped the field.
+        """
+        return bool((self.extra or {}).get("active", True))
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class TummyTime(SpanEntry):
+    """A tummy time."""
+
+    milestone: str | None = None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Bmi(DateEntry):
+    """A BMI measurement."""
+
+    bmi: float | None = None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class HeadCircumference(DateEntry):
+    """A head circumference measurement."""
+
+    head_circumference: float | None = None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Height(DateEntry):
+    """A height measurement."""
+
+    height: float | None = None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Weight(DateEntry):
+    """A weight measurement."""
+
+    weight: float | None = None
+
+
+ENTRY_TYPES: dict[str, type[Entry]] = {
+    ATTR_BMI: Bmi,
+    ATTR_CHANGES: Change,
+    ATTR_FEEDINGS: Feeding,
+    ATTR_HEAD_CIRCUMFERENCE_DASH: HeadCircumference,
+    ATTR_HEIGHT: Height,
+    ATTR_MEDICATION: Medication,
+    ATTR_NOTES: Note,
+    ATTR_PUMPING: Pumping,
+    ATTR_SLEEP: Sleep,
+    ATTR_TEMPERATURE: Temperature,
+    ATTR_TIMERS: Timer,
+    ATTR_TUMMY_TIMES: TummyTime,
+    ATTR_WEIGHT: Weight,
+}
+
+
+def parse_entry(endpoint: str, data: Mapping[str, Any]) -> Entry:
+    """Build the entry of an endpoint from babybuddy JSON."""
+    return ENTRY_TYPES.get(endpoint, Entry).from_json(data)
+
+
+@dataclass(frozen=True, slots=True)
+class BabyBuddySnapshot:
+    """The children and the latest entry of each of their endpoints.
+
+    Entries are keyed by child id, then endpoint; an endpoint without
+    entries has no key. A snapshot is never changed once built. The next one
+    starts from a copy of its mappings and keeps every record, and every
+    child's entries, that did not change, so they are the same objects in
+    both.
+    """
+
+    children: Mapping[int, Child] = field(default_factory=dict)
+    entries: Mapping[int, Mapping[str, Entry]] = field(default_factory=dict)
+
+    def entry(self, child_id: int, endpoint: str) -> Entry | None:
+        """Return the latest entry of an endpoint for a child."""
+        child_entries = self.entries.get(child_id)
+        return None if child_entries is None else child_entries.get(endpoint)
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> Self:
+        """Build a snapshot saved by as_json."""
+        return cls(
+            {child[ATTR_ID]: Child.from_json(child) for child in data[ATTR_CHILDREN]},
+            {
+                int(child_id): {
+                    endpoint: parse_entry(endpoint, entry)
+                    for endpoint, entry in child_entries.items()
+                }
+                for child_id, child_entries in data[ATTR_ENTRIES].items()
+            },
+        )
+
+    def as_json(self) -> dict[str, Any]:
+        """Return the snapshot as JSON."""
+        return {
+            ATTR_CHILDREN: [child.as_dict() for child in self.children.values()],
+            ATTR_ENTRIES: {
+                child_id: {
+                    endpoint: entry.as_dict()
+                    for endpoint, entry in self.entries.get(child_id, {}).items()
+                }
+                for child_id in self.children
+            },
+        }
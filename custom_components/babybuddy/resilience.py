@@ -0,0 +1,93 @@
+"""Retry and circuit breaker policies for babybuddy integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import random
+import time
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    BREAKER_RESET_TIMEOUT_MAX,
+    LOGGER,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+)
+from .errors import CircuitOpenError
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return a jittered delay before retry number attempt (from 1).
+
+    Full jitter: a random delay up to the exponential backoff, so clients
+    that failed together do not retry together.
+    """
+    return random.uniform(
+        0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (attempt - 1))
+    )
+
+
+class CircuitBreaker:
+    """Fail fast while a babybuddy host is unreachable.
+
+    The circuit opens after BREAKER_FAILURE_THRESHOLD consecutive failures.
+    While open, requests fail at once with CircuitOpenError. Once the reset
+    timeout has passed, the first request runs a single probe instead; if
+    the probe succeeds the circuit closes, otherwise it stays open for
+    twice as long, up to BREAKER_RESET_TIMEOUT_MAX.
+    """
+
+    def __init__(self, host: str) -> None:
+        """Initialize the breaker."""
+        self.host = host
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.reset_timeout = BREAKER_RESET_TIMEOUT
+        self.probe_lock = asyncio.Lock()
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Return whether requests are currently short-circuited."""
+        return self.opened_at is not None
+
+    async def async_check(self, probe: Callable[[], Awaitable[bool]]) -> None:
+        """Let a request through, or raise CircuitOpenError."""
+        if self.opened_at is None:
+            return
+        if (
+            time.monotonic() - self.opened_at < self.reset_timeout
+            or self.probe_lock.locked()
+        ):
+            self.rejected += 1
+            raise CircuitOpenError(f"Circuit open for {self.host}")
+        async with self.probe_lock:
+            LOGGER.debug(f"Probing {self.host}")
+            if await probe():
+                self.record_success()
+                return
+            self.reset_timeout = min(self.reset_timeout * 2, BREAKER_RESET_TIMEOUT_MAX)
+            self.opened_at = time.monotonic()
+        self.rejected += 1
+        raise CircuitOpenError(f"Circuit open for {self.host}")
+
+    def record_success(self) -> None:
+        """Close the circuit after a request reached the host."""
+        if self.opened_at is not None:
+            LOGGER.info(f"{self.host} is reachable again")
+        self.failures = 0
+        self.opened_at = None
+        self.reset_timeout = BREAKER_RESET_TIMEOUT
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit at the threshold."""
+        self.failures += 1
+        if self.opened_at is None and self.failures >= BREAKER_FAILURE_THRESHOLD:
+            LOGGER.warning(
+                f"{self.host} failed {self.failures} times in a row, pausing requests for {self.reset_timeout}s"
+            )
+            self.opened_at = time.monotonic()
+            self.trips += 1
@@ -0,0 +1,99 @@
+"""Per-endpoint adaptive polling schedule for babybuddy integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from homeassistant.const import CONF_SCAN_INTERVAL
+
+# Coordinator ticks drift by a few milliseconds, so an endpoint that falls
+# due just after a tick is polled on that tick rather than the next one.
+POLL_SLACK = timedelta(seconds=1)
+
+
+def poll_interval_option(endpoint: str) -> str:
+    """Return the options key overriding an endpoint's base polling interval."""
+    return f"{CONF_SCAN_INTERVAL}_{endpoint.replace('-', '_')}"
+
+
+@dataclass
+class EndpointSchedule:
+    """Polling state of one endpoint."""
+
+    base_interval: timedelta
+    max_backoff: int
+    interval: timedelta
+    next_poll: datetime | None = None
+
+
+class BabyBuddyPollScheduler:
+    """Decide which endpoints are due on a coordinator tick.
+
+    Every endpoint starts polling at its base interval. Each poll that finds
+    nothing new doubles its interval, up to max_backoff times the base
+    interval; a poll that finds a change, or a write through Home Assistant,
+    puts it straight back on its base interval.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self.schedules: dict[str, EndpointSchedule] = {}
+
+    def configure(
+        self, endpoint: str, base_interval: timedelta, max_backoff: int
+    ) -> None:
+        """Set the base interval and backoff limit of an endpoint."""
+        schedule = self.schedules.get(endpoint)
+        if schedule is None:
+            self.schedules[endpoint] = EndpointSchedule(
+                base_interval, max_backoff, base_interval
+            )
+            return
+        schedule.base_interval = base_interval
+        schedule.max_backoff = max_backoff
+        schedule.interval = base_interval
+        schedule.next_poll = None
+
+    def is_due(self, endpoint: str, now: datetime) -> bool:
+        """Return whether an endpoint should be polled now."""
+        schedule = self.schedules.get(endpoint)
+        return (
+            schedule is None
+            or schedule.next_poll is None
+            or now + POLL_SLACK >= schedule.next_poll
+        )
+
+    def polled(self, endpoint: str, changed: bool, now: datetime) -> None:
+        """Record a poll of an endpoint and schedule the next one."""
+        schedule = self.schedules.get(endpoint)
+        if schedule is None:
+            return
+        if changed:
+            schedule.interval = schedule.base_interval
+        else:
+            schedule.interval = min(
+                schedule.interval * 2, schedule.base_interval * schedule.max_backoff
+            )
+        schedule.next_poll = now + schedule.interval
+
+    def activity(self, endpoint: str, now: datetime) -> None:
+        """Shorten the interval of an endpoint that was just written to."""
+        schedule = self.schedules.get(endpoint)
+        if schedule is None:
+            return
+        schedule.interval = schedule.base_interval
+        schedule.next_poll = now + schedule.interval
+
+    def as_dict(self) -> dict[str, dict[str, float | str | None]]:
+        """Return the schedule for diagnostics."""
+        return {
+            endpoint: {
+                "base_interval": schedule.base_interval.total_seconds(),
+                "interval": schedule.interval.total_seconds(),
+                "next_poll": schedule.next_poll.isoformat()
+                if schedule.next_poll
+                else None,
+            }
+            for endpoint, schedule in self.schedules.items()
+        }
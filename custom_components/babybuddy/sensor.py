@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
-from homeassistant.const import ATTR_ID
+from homeassistant.components.sensor import SensorEntity
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import SENSOR_TYPES
+from .const import AGGREGATE_TYPES, COUNTER_TYPES, SENSOR_TYPES, SERVER_SENSOR_TYPES
 from .coordinator import BabyBuddyConfigEntry, BabyBuddyCoordinator
-from .entity import BabyBuddyChildDataSensor, BabyBuddyChildSensor
+from .entity import (
+    BabyBuddyChildAggregateSensor,
+    BabyBuddyChildCounterSensor,
+    BabyBuddyChildDataSensor,
+    BabyBuddyChildSensor,
+    BabyBuddyHistorySensor,
+    BabyBuddyServerSensor,
+    BabyBuddyWriteQueueSensor,
+)
 
 
 # For a platform to support config entries, it will need to add a setup entry function
@@ -28,6 +36,16 @@ def update_entities() -> None:
 
     entry.async_on_unload(coordinator.async_add_listener(update_entities))
 
+    entities: list[SensorEntity] = [
+        BabyBuddyWriteQueueSensor(coordinator),
+        *(
+            BabyBuddyServerSensor(coordinator, description)
+            for description in SERVER_SENSOR_TYPES
+        ),
+    ]
+    if coordinator.history.enabled:
+        entities.append(BabyBuddyHistorySensor(coordinator))
+    async_add_entities(entities)
     update_entities()
 
 
@@ -40,18 +58,33 @@ def update_items(
     """Add new sensors for new endpoint entries."""
     if coordinator.data is not None:
         new_entities = []
-        for child in coordinator.data[0]:
-            if child[ATTR_ID] not in tracked:
-                tracked[child[ATTR_ID]] = BabyBuddyChildSensor(coordinator, child)
-                new_entities.append(tracked[child[ATTR_ID]])
+        for child in coordinator.data.children.values():
+            if child.id not in tracked:
+                tracked[child.id] = BabyBuddyChildSensor(
+                    coordinator.child_coordinators[child.id], child
+                )
+                new_entities.append(tracked[child.id])
+                new_entities.extend(
+                    BabyBuddyChildAggregateSensor(
+                        coordinator.child_coordinators[child.id], child, description
+                    )
+                    for description in AGGREGATE_TYPES
+                )
+                if coordinator.counters_enabled:
+                    new_entities.extend(
+                        BabyBuddyChildCounterSensor(
+                            coordinator.child_coordinators[child.id], child, description
+                        )
+                        for description in COUNTER_TYPES
+                    )
             for description in SENSOR_TYPES:
                 if (
-                    coordinator.data[1][child[ATTR_ID]].get(description.key)
-                    and f"{child[ATTR_ID]}_{description.key}" not in tracked
+                    coordinator.data.entry(child.id, description.key)
+                    and f"{child.id}_{description.key}" not in tracked
                 ):
-                    tracked[f"{child[ATTR_ID]}_{description.key}"] = (
-                        BabyBuddyChildDataSensor(coordinator, child, description)
+                    tracked[f"{child.id}_{description.key}"] = BabyBuddyChildDataSensor(
+                        coordinator.child_coordinators[child.id], child, description
                     )
-                    new_entities.append(tracked[f"{child[ATTR_ID]}_{description.key}"])
+                    new_entities.append(tracked[f"{child.id}_{description.key}"])
         if new_entities:
             async_add_entities(new_entities)
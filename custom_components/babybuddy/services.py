@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 import voluptuous as vol
@@ -16,16 +18,24 @@
     ATTR_TEMPERATURE,
     ATTR_TIME,
 )
-from homeassistant.core import HomeAssistant, ServiceCall, callback
-from homeassistant.exceptions import ServiceValidationError
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import config_validation as cv, entity_registry as er
 from homeassistant.util import dt as dt_util
 
 from .client import get_datetime_from_time
 from .const import (
+    ATTR_ACTION,
     ATTR_ACTION_ADD_BMI,
     ATTR_ACTION_ADD_CHILD,
     ATTR_ACTION_ADD_DIAPER_CHANGE,
+    ATTR_ACTION_ADD_ENTRIES,
     ATTR_ACTION_ADD_FEEDING,
     ATTR_ACTION_ADD_HEAD_CIRCUMFERENCE,
     ATTR_ACTION_ADD_HEIGHT,
@@ -47,6 +57,8 @@
     ATTR_DOSAGE,
     ATTR_DOSAGE_UNIT,
     ATTR_END,
+    ATTR_ENTRIES,
+    ATTR_ERROR,
     ATTR_FEEDINGS,
     ATTR_FIRST_NAME,
     ATTR_HEAD_CIRCUMFERENCE_DASH,
@@ -61,9 +73,11 @@
     ATTR_NOTE,
     ATTR_NOTES,
     ATTR_PUMPING,
+    ATTR_QUEUED,
     ATTR_SLEEP,
     ATTR_SOLID,
     ATTR_START,
+    ATTR_SUCCESS,
     ATTR_TAGS,
     ATTR_TIMER,
     ATTR_TIMERS,
@@ -81,6 +95,7 @@
 )
 from .coordinator import BabyBuddyConfigEntry, BabyBuddyCoordinator
 from .errors import ValidationError
+from .models import Timer
 
 SERVICE_ADD_CHILD_SCHEMA: vol.Schema = vol.Schema(
     {
@@ -114,6 +129,110 @@
     vol.Optional(ATTR_TAGS): vol.All(cv.ensure_list, [str]),
 }
 
+SERVICE_ADD_BMI_SCHEMA: vol.Schema = vol.Schema(
+    {
+        **COMMON_FIELDS,
+        vol.Required(ATTR_BMI): cv.positive_float,
+        vol.Optional(ATTR_DATE): cv.date,
+    }
+)
+SERVICE_ADD_DIAPER_CHANGE_SCHEMA: vol.Schema = vol.Schema(
+    {
+        **COMMON_FIELDS,
+        vol.Optional(ATTR_TIME): vol.Any(cv.datetime, cv.time),
+        vol.Optional(ATTR_TYPE): vol.In(DIAPER_TYPES),
+        vol.Optional(ATTR_COLOR): vol.In(DIAPER_COLORS),
+        vol.Optional(ATTR_AMOUNT): cv.positive_float,
+    }
+)
+SERVICE_ADD_HEAD_CIRCUMFERENCE_SCHEMA: vol.Schema = vol.Schema(
+    {
+        **COMMON_FIELDS,
+        vol.Required(ATTR_HEAD_CIRCUMFERENCE_UNDERSCORE): cv.positive_float,
+        vol.Optional(ATTR_DATE): cv.date,
+    }
+)
+SERVICE_ADD_HEIGHT_SCHEMA: vol.Schema = vol.Schema(
+    {
+        **COMMON_FIELDS,
+        vol.Required(ATTR_HEIGHT): cv.positive_float,
+        vol.Optional(ATTR_DATE): cv.date,
+    }
+)
+SERVICE_ADD_MEDICATION_SCHEMA: vol.Schema = vol.Schema(
+    {
+        **COMMON_FIELDS,
+        vol.Required(ATTR_NAME): cv.string,
+        vol.Optional(ATTR_DOSAGE): cv.positive_float,
+        vol.Optional(ATTR_DOSAGE_UNIT): vol.In(MEDICATION_DOSAGE_UNITS),
+        vol.Optional(ATTR_TIME): vol.Any(cv.datetime, cv.time),
+        vol.Optional(ATTR_NEXT_DOSE_INTERVAL): cv.time_period,
+    }
+)
+SERVICE_ADD_NOTE_SCHEMA: vol.Schema = vol.Schema(
+    {
+        **CHILD_TARGET_FIELDS,
+        vol.Required(ATTR_NOTE): cv.string,
+        vol.Optional(ATTR_TIME): vol.Any(cv.datetime, cv.time),
+        vol.Optional(ATTR_TAGS): vol.All(cv.ensure_list, [str]),
+    }
+)
+SERVICE_ADD_TEMPERATURE_SCHEMA: vol.Schema = vol.Schema(
+    {
+        **COMMON_FIELDS,
+        vol.Required(ATTR_TEMPERATURE): cv.positive_float,
+        vol.Optional(ATTR_TIME): vol.Any(cv.datetime, cv.time),
+    }
+)
+SERVICE_ADD_WEIGHT_SCHEMA: vol.Schema = vol.Schema(
+    {
+        **COMMON_FIELDS,
+        vol.Required(ATTR_WEIGHT): cv.positive_float,
+        vol.Optional(ATTR_DATE): cv.date,
+    }
+)
+SERVICE_DELETE_LAST_ENTRY_SCHEMA: vol.Schema = vol.Schema(
+    {
+        vol.Required("entity_id"): cv.entity_id,
+    }
+)
+SERVICE_START_TIMER_SCHEMA: vol.Schema = vol.Schema(
+    {
+        **CHILD_TARGET_FIELDS,
+        vol.Optional(ATTR_START): vol.Any(cv.datetime, cv.time),
+        vol.Optional(ATTR_NAME): cv.string,
+    }
+)
+SERVICE_ADD_FEEDING_SCHEMA: vol.Schema = vol.Schema(
+    {
+        **COMMON_FIELDS_TIMER,
+        vol.Required(ATTR_TYPE): vol.In(FEEDING_TYPES),
+        vol.Required(ATTR_METHOD): vol.In(FEEDING_METHODS),
+        vol.Optional(ATTR_AMOUNT): cv.positive_float,
+        vol.Optional(ATTR_NOTES): cv.string,
+    }
+)
+SERVICE_ADD_PUMPING_SCHEMA: vol.Schema = vol.Schema(
+    {
+        **COMMON_FIELDS_TIMER,
+        vol.Required(ATTR_AMOUNT): cv.positive_float,
+        vol.Optional(ATTR_NOTES): cv.string,
+    }
+)
+SERVICE_ADD_SLEEP_SCHEMA: vol.Schema = vol.Schema(
+    {
+        **COMMON_FIELDS_TIMER,
+        vol.Optional(ATTR_NAP): cv.boolean,
+        vol.Optional(ATTR_NOTES): cv.string,
+    }
+)
+SERVICE_ADD_TUMMY_TIME_SCHEMA: vol.Schema = vol.Schema(
+    {
+        **COMMON_FIELDS_TIMER,
+        vol.Optional(ATTR_MILESTONE): cv.string,
+    }
+)
+
 
 async def __async_extract_entry_coordinator(call: ServiceCall) -> BabyBuddyCoordinator:
     """Extract coordinator from a service call."""
@@ -138,9 +257,9 @@ async def __async_extract_entry_coordinator(call: ServiceCall) -> BabyBuddyCoord
 
 
 def _entity_id_for_device(hass: HomeAssistant, device_id: str) -> str | None:
-    """Return this integration's child entity registered to a device."""
+    """Return this integration's child sensor or switch registered to a device."""
     for entry in er.async_entries_for_device(er.async_get(hass), device_id):
-        if entry.platform == DOMAIN:
+        if entry.platform == DOMAIN and entry.domain in ("sensor", "switch"):
             return entry.entity_id
     return None
 
@@ -202,15 +321,11 @@ async def __set_common_fields(
     """Set data common fields."""
 
     if data.get(ATTR_TIMER):
-        timer_data = (
-            coordinator.data[1].get(data[ATTR_CHILD], {}).get(ATTR_TIMERS) or {}
-        )
-        # In Babybuddy 2.0 'active' is not in the JSON response, so treat any
-        # returned timer as active, as only active timers are returned.
-        if not timer_data.get("active", len(timer_data) > 0):
+        timer = coordinator.data.entry(data[ATTR_CHILD], ATTR_TIMERS)
+        if not isinstance(timer, Timer) or not timer.active:
             raise ValidationError("Timer not found or stopped. Timer must be active.")
         # babybuddy derives child/start/end from the timer entry
-        data[ATTR_TIMER] = timer_data[ATTR_ID]
+        data[ATTR_TIMER] = timer.id
         for key in (ATTR_CHILD, ATTR_START, ATTR_END):
             data.pop(key, None)
     else:
@@ -227,26 +342,33 @@ async def __set_common_fields(
     return data
 
 
+def __timer_endpoints(call: ServiceCall) -> tuple[str, ...]:
+    """Return the timer endpoint if the entry consumed a timer."""
+    if call.data.get(ATTR_TIMER):
+        return (ATTR_TIMERS,)
+    return ()
+
+
 async def async_add_child(call: ServiceCall) -> None:
     """Add new child."""
     coordinator = await __async_extract_entry_coordinator(call)
 
-    await coordinator.client.async_post(ATTR_CHILDREN, call.data)
-    await coordinator.async_request_refresh()
+    await coordinator.write_queue.async_post(ATTR_CHILDREN, call.data, None)
 
 
-async def async_add_bmi(call: ServiceCall) -> None:
+async def async_add_bmi(call: ServiceCall) -> ServiceResponse:
     """Add BMI entry."""
     coordinator = await __async_extract_entry_coordinator(call)
     data = await __setup_service_data(call)
 
     # date_now = dt_util.now().date()
     date_time_now = get_datetime_from_time(dt_util.now())
-    await coordinator.client.async_post(ATTR_BMI, data, date_time_now)
-    await coordinator.async_request_refresh()
+    return await coordinator.write_queue.async_post(
+        ATTR_BMI, data, data[ATTR_CHILD], call_time=date_time_now
+    )
 
 
-async def async_add_diaper_change(call: ServiceCall) -> None:
+async def async_add_diaper_change(call: ServiceCall) -> ServiceResponse:
     """Add diaper change entry."""
     coordinator = await __async_extract_entry_coordinator(call)
     data = await __setup_service_data(call)
@@ -257,7 +379,7 @@ async def async_add_diaper_change(call: ServiceCall) -> None:
             data[ATTR_TIME] = date_time
         except ValidationError as error:
             LOGGER.error(error)
-            return
+            return None
     if call.data.get(ATTR_TYPE):
         data[ATTR_WET] = (
             call.data[ATTR_TYPE] == "Wet and Solid"
@@ -277,11 +399,12 @@ async def async_add_diaper_change(call: ServiceCall) -> None:
         data[ATTR_TAGS] = call.data[ATTR_TAGS]
 
     date_time_now = get_datetime_from_time(dt_util.now())
-    await coordinator.client.async_post(ATTR_CHANGES, data, date_time_now)
-    await coordinator.async_request_refresh()
+    return await coordinator.write_queue.async_post(
+        ATTR_CHANGES, data, data[ATTR_CHILD], call_time=date_time_now
+    )
 
 
-async def async_add_head_circumference(call: ServiceCall) -> None:
+async def async_add_head_circumference(call: ServiceCall) -> ServiceResponse:
     """Add head circumference entry."""
     coordinator = await __async_extract_entry_coordinator(call)
     data = await __setup_service_data(call)
@@ -295,13 +418,12 @@ async def async_add_head_circumference(call: ServiceCall) -> None:
 
     # date_now = dt_util.now().date()
     date_time_now = get_datetime_from_time(dt_util.now())
-    await coordinator.client.async_post(
-        ATTR_HEAD_CIRCUMFERENCE_DASH, data, date_time_now
+    return await coordinator.write_queue.async_post(
+        ATTR_HEAD_CIRCUMFERENCE_DASH, data, data[ATTR_CHILD], call_time=date_time_now
     )
-    await coordinator.async_request_refresh()
 
 
-async def async_add_height(call: ServiceCall) -> None:
+async def async_add_height(call: ServiceCall) -> ServiceResponse:
     """Add height entry."""
     coordinator = await __async_extract_entry_coordinator(call)
     data = await __setup_service_data(call)
@@ -315,11 +437,12 @@ async def async_add_height(call: ServiceCall) -> None:
 
     # date_now = dt_util.now().date()
     date_time_now = get_datetime_from_time(dt_util.now())
-    await coordinator.client.async_post(ATTR_HEIGHT, data, date_time_now)
-    await coordinator.async_request_refresh()
+    return await coordinator.write_queue.async_post(
+        ATTR_HEIGHT, data, data[ATTR_CHILD], call_time=date_time_now
+    )
 
 
-async def async_add_medication(call: ServiceCall) -> None:
+async def async_add_medication(call: ServiceCall) -> ServiceResponse:
     """Add a medication entry."""
     coordinator = await __async_extract_entry_coordinator(call)
     data = await __setup_service_data(call)
@@ -330,7 +453,7 @@ async def async_add_medication(call: ServiceCall) -> None:
             data[ATTR_TIME] = date_time
         except ValidationError as error:
             LOGGER.error(error)
-            return
+            return None
     if call.data.get(ATTR_NEXT_DOSE_INTERVAL):
         data[ATTR_NEXT_DOSE_INTERVAL] = str(call.data[ATTR_NEXT_DOSE_INTERVAL])
     if call.data.get(ATTR_NOTES):
@@ -339,11 +462,12 @@ async def async_add_medication(call: ServiceCall) -> None:
         data[ATTR_TAGS] = call.data.get(ATTR_TAGS)
 
     date_time_now = get_datetime_from_time(dt_util.now())
-    await coordinator.client.async_post(ATTR_MEDICATION, data, date_time_now)
-    await coordinator.async_request_refresh()
+    return await coordinator.write_queue.async_post(
+        ATTR_MEDICATION, data, data[ATTR_CHILD], call_time=date_time_now
+    )
 
 
-async def async_add_note(call: ServiceCall) -> None:
+async def async_add_note(call: ServiceCall) -> ServiceResponse:
     """Add note entry."""
     coordinator = await __async_extract_entry_coordinator(call)
     data = await __setup_service_data(call)
@@ -354,16 +478,17 @@ async def async_add_note(call: ServiceCall) -> None:
             data[ATTR_TIME] = date_time
         except ValidationError as error:
             LOGGER.error(error)
-            return
+            return None
     if call.data.get(ATTR_TAGS):
         data[ATTR_TAGS] = call.data.get(ATTR_TAGS)
 
     date_time_now = get_datetime_from_time(dt_util.now())
-    await coordinator.client.async_post(ATTR_NOTES, data, date_time_now)
-    await coordinator.async_request_refresh()
+    return await coordinator.write_queue.async_post(
+        ATTR_NOTES, data, data[ATTR_CHILD], call_time=date_time_now
+    )
 
 
-async def async_add_temperature(call: ServiceCall) -> None:
+async def async_add_temperature(call: ServiceCall) -> ServiceResponse:
     """Add a temperature entry."""
     coordinator = await __async_extract_entry_coordinator(call)
     data = await __setup_service_data(call)
@@ -374,18 +499,19 @@ async def async_add_temperature(call: ServiceCall) -> None:
             data[ATTR_TIME] = date_time
         except ValidationError as error:
             LOGGER.error(error)
-            return
+            return None
     if call.data.get(ATTR_NOTES):
         data[ATTR_NOTES] = call.data.get(ATTR_NOTES)
     if call.data.get(ATTR_TAGS):
         data[ATTR_TAGS] = call.data.get(ATTR_TAGS)
 
     date_time_now = get_datetime_from_time(dt_util.now())
-    await coordinator.client.async_post(ATTR_TEMPERATURE, data, date_time_now)
-    await coordinator.async_request_refresh()
+    return await coordinator.write_queue.async_post(
+        ATTR_TEMPERATURE, data, data[ATTR_CHILD], call_time=date_time_now
+    )
 
 
-async def async_add_weight(call: ServiceCall) -> None:
+async def async_add_weight(call: ServiceCall) -> ServiceResponse:
     """Add weight entry."""
     coordinator = await __async_extract_entry_coordinator(call)
     data = await __setup_service_data(call)
@@ -399,8 +525,9 @@ async def async_add_weight(call: ServiceCall) -> None:
 
     # date_now = dt_util.now().date()
     date_time_now = get_datetime_from_time(dt_util.now())
-    await coordinator.client.async_post(ATTR_WEIGHT, data, date_time_now)
-    await coordinator.async_request_refresh()
+    return await coordinator.write_queue.async_post(
+        ATTR_WEIGHT, data, data[ATTR_CHILD], call_time=date_time_now
+    )
 
 
 async def async_delete_last_entry(call: ServiceCall) -> None:
@@ -422,11 +549,12 @@ async def async_delete_last_entry(call: ServiceCall) -> None:
             translation_placeholders={"entity_id": entity_id},
         )
 
-    await coordinator.client.async_delete(parts[2], entity.attributes.get(ATTR_ID))
-    await coordinator.async_request_refresh()
+    await coordinator.write_queue.async_delete(
+        parts[2], entity.attributes.get(ATTR_ID), int(parts[1])
+    )
 
 
-async def async_start_timer(call: ServiceCall) -> None:
+async def async_start_timer(call: ServiceCall) -> ServiceResponse:
     """Start a new timer for child."""
     coordinator = await __async_extract_entry_coordinator(call)
     data = await __setup_service_data(call)
@@ -437,24 +565,24 @@ async def async_start_timer(call: ServiceCall) -> None:
         )
     except ValidationError as error:
         LOGGER.error(error)
-        return
+        return None
     if call.data.get(ATTR_NAME):
         data[ATTR_NAME] = call.data.get(ATTR_NAME)
 
-    await coordinator.client.async_post(ATTR_TIMERS, data)
-    await coordinator.async_request_refresh()
+    return await coordinator.write_queue.async_post(ATTR_TIMERS, data, data[ATTR_CHILD])
 
 
-async def async_add_feeding(call: ServiceCall) -> None:
+async def async_add_feeding(call: ServiceCall) -> ServiceResponse:
     """Add a feeding entry."""
     coordinator = await __async_extract_entry_coordinator(call)
     data = await __setup_service_data(call)
+    child_id = data[ATTR_CHILD]
 
     try:
         data = await __set_common_fields(coordinator, call, data)
     except ValidationError as error:
         LOGGER.error(error)
-        return
+        return None
 
     data.update(
         {
@@ -468,66 +596,166 @@ async def async_add_feeding(call: ServiceCall) -> None:
     if call.data.get(ATTR_NOTES):
         data[ATTR_NOTES] = call.data.get(ATTR_NOTES)
 
-    await coordinator.client.async_post(ATTR_FEEDINGS, data)
-    await coordinator.async_request_refresh()
+    return await coordinator.write_queue.async_post(
+        ATTR_FEEDINGS, data, child_id, *__timer_endpoints(call)
+    )
 
 
-async def async_add_pumping(call: ServiceCall) -> None:
+async def async_add_pumping(call: ServiceCall) -> ServiceResponse:
     """Add a pumping entry."""
     coordinator = await __async_extract_entry_coordinator(call)
     data = await __setup_service_data(call)
+    child_id = data[ATTR_CHILD]
 
     try:
         data = await __set_common_fields(coordinator, call, data)
     except ValidationError as error:
         LOGGER.error(error)
-        return
+        return None
 
     data[ATTR_AMOUNT] = call.data.get(ATTR_AMOUNT)
 
     if call.data.get(ATTR_NOTES):
         data[ATTR_NOTES] = call.data.get(ATTR_NOTES)
 
-    await coordinator.client.async_post(ATTR_PUMPING, data)
-    await coordinator.async_request_refresh()
+    return await coordinator.write_queue.async_post(
+        ATTR_PUMPING, data, child_id, *__timer_endpoints(call)
+    )
 
 
-async def async_add_sleep(call: ServiceCall) -> None:
+async def async_add_sleep(call: ServiceCall) -> ServiceResponse:
     """Add a sleep entry."""
     coordinator = await __async_extract_entry_coordinator(call)
     data = await __setup_service_data(call)
+    child_id = data[ATTR_CHILD]
 
     try:
         data = await __set_common_fields(coordinator, call, data)
     except ValidationError as error:
         LOGGER.error(error)
-        return
+        return None
 
     if call.data.get(ATTR_NAP):
         data[ATTR_NAP] = call.data.get(ATTR_NAP)
     if call.data.get(ATTR_NOTES):
         data[ATTR_NOTES] = call.data.get(ATTR_NOTES)
 
-    await coordinator.client.async_post(ATTR_SLEEP, data)
-    await coordinator.async_request_refresh()
+    return await coordinator.write_queue.async_post(
+        ATTR_SLEEP, data, child_id, *__timer_endpoints(call)
+    )
 
 
-async def async_add_tummy_time(call: ServiceCall) -> None:
+async def async_add_tummy_time(call: ServiceCall) -> ServiceResponse:
     """Add a tummy time entry."""
     coordinator = await __async_extract_entry_coordinator(call)
     data = await __setup_service_data(call)
+    child_id = data[ATTR_CHILD]
 
     try:
         data = await __set_common_fields(coordinator, call, data)
     except ValidationError as error:
         LOGGER.error(error)
-        return
+        return None
 
     if call.data.get(ATTR_MILESTONE):
         data[ATTR_MILESTONE] = call.data.get(ATTR_MILESTONE)
 
-    await coordinator.client.async_post(ATTR_TUMMY_TIMES, data)
-    await coordinator.async_request_refresh()
+    return await coordinator.write_queue.async_post(
+        ATTR_TUMMY_TIMES, data, child_id, *__timer_endpoints(call)
+    )
+
+
+# Entry services that can be batched by add_entries, with their schemas.
+ENTRY_SERVICES: dict[
+    str, tuple[Callable[[ServiceCall], Awaitable[ServiceResponse]], vol.Schema]
+] = {
+    ATTR_ACTION_ADD_BMI: (async_add_bmi, SERVICE_ADD_BMI_SCHEMA),
+    ATTR_ACTION_ADD_DIAPER_CHANGE: (
+        async_add_diaper_change,
+        SERVICE_ADD_DIAPER_CHANGE_SCHEMA,
+    ),
+    ATTR_ACTION_ADD_FEEDING: (async_add_feeding, SERVICE_ADD_FEEDING_SCHEMA),
+    ATTR_ACTION_ADD_HEAD_CIRCUMFERENCE: (
+        async_add_head_circumference,
+        SERVICE_ADD_HEAD_CIRCUMFERENCE_SCHEMA,
+    ),
+    ATTR_ACTION_ADD_HEIGHT: (async_add_height, SERVICE_ADD_HEIGHT_SCHEMA),
+    ATTR_ACTION_ADD_MEDICATION: (async_add_medication, SERVICE_ADD_MEDICATION_SCHEMA),
+    ATTR_ACTION_ADD_NOTE: (async_add_note, SERVICE_ADD_NOTE_SCHEMA),
+    ATTR_ACTION_ADD_PUMPING: (async_add_pumping, SERVICE_ADD_PUMPING_SCHEMA),
+    ATTR_ACTION_ADD_SLEEP: (async_add_sleep, SERVICE_ADD_SLEEP_SCHEMA),
+    ATTR_ACTION_ADD_TEMPERATURE: (
+        async_add_temperature,
+        SERVICE_ADD_TEMPERATURE_SCHEMA,
+    ),
+    ATTR_ACTION_ADD_TUMMY_TIME: (async_add_tummy_time, SERVICE_ADD_TUMMY_TIME_SCHEMA),
+    ATTR_ACTION_ADD_WEIGHT: (async_add_weight, SERVICE_ADD_WEIGHT_SCHEMA),
+}
+SERVICE_ADD_ENTRIES_SCHEMA: vol.Schema = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRIES): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {vol.Required(ATTR_ACTION): vol.In(ENTRY_SERVICES)},
+                    extra=vol.ALLOW_EXTRA,
+                )
+            ],
+        ),
+    }
+)
+
+
+async def async_add_entries(call: ServiceCall) -> ServiceResponse:
+    """Add a batch of entries of any type.
+
+    Every entry is validated against the schema of its own service before
+    anything is posted. Entries are then posted concurrently, bounded by the
+    concurrent requests option, and the data is updated once at the end.
+    """
+    coordinator = await __async_extract_entry_coordinator(call)
+
+    entry_calls: list[tuple[str, ServiceCall]] = []
+    for index, item in enumerate(call.data[ATTR_ENTRIES]):
+        fields = dict(item)
+        action = fields.pop(ATTR_ACTION)
+        try:
+            data = ENTRY_SERVICES[action][1](fields)
+        except vol.Invalid as error:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="invalid_entry",
+                translation_placeholders={
+                    "index": str(index),
+                    "action": action,
+                    "error": str(error),
+                },
+            ) from error
+        entry_calls.append(
+            (action, ServiceCall(call.hass, DOMAIN, action, data, call.context))
+        )
+
+    async def async_add_entry(action: str, entry_call: ServiceCall) -> dict[str, Any]:
+        """Add one entry and return its result."""
+        try:
+            created = await ENTRY_SERVICES[action][0](entry_call)
+        except HomeAssistantError as error:
+            return {
+                ATTR_ACTION: action,
+                ATTR_SUCCESS: False,
+                ATTR_ERROR: str(error),
+            }
+        if created is None:
+            return {ATTR_ACTION: action, ATTR_SUCCESS: False}
+        if ATTR_QUEUED in created:
+            return {ATTR_ACTION: action, ATTR_SUCCESS: True, ATTR_QUEUED: True}
+        return {ATTR_ACTION: action, ATTR_SUCCESS: True, ATTR_ID: created.get(ATTR_ID)}
+
+    async with coordinator.async_batch_writes():
+        results = await asyncio.gather(
+            *(async_add_entry(action, entry_call) for action, entry_call in entry_calls)
+        )
+    return {ATTR_ENTRIES: list(results)}
 
 
 @callback
@@ -544,173 +772,91 @@ def async_setup_services(hass: HomeAssistant) -> None:
         DOMAIN,
         ATTR_ACTION_ADD_BMI,
         async_add_bmi,
-        vol.Schema(
-            {
-                **COMMON_FIELDS,
-                vol.Required(ATTR_BMI): cv.positive_float,
-                vol.Optional(ATTR_DATE): cv.date,
-            }
-        ),
+        SERVICE_ADD_BMI_SCHEMA,
     )
     hass.services.async_register(
         DOMAIN,
         ATTR_ACTION_ADD_DIAPER_CHANGE,
         async_add_diaper_change,
-        vol.Schema(
-            {
-                **COMMON_FIELDS,
-                vol.Optional(ATTR_TIME): vol.Any(cv.datetime, cv.time),
-                vol.Optional(ATTR_TYPE): vol.In(DIAPER_TYPES),
-                vol.Optional(ATTR_COLOR): vol.In(DIAPER_COLORS),
-                vol.Optional(ATTR_AMOUNT): cv.positive_float,
-            }
-        ),
+        SERVICE_ADD_DIAPER_CHANGE_SCHEMA,
     )
     hass.services.async_register(
         DOMAIN,
         ATTR_ACTION_ADD_HEAD_CIRCUMFERENCE,
         async_add_head_circumference,
-        vol.Schema(
-            {
-                **COMMON_FIELDS,
-                vol.Required(ATTR_HEAD_CIRCUMFERENCE_UNDERSCORE): cv.positive_float,
-                vol.Optional(ATTR_DATE): cv.date,
-            }
-        ),
+        SERVICE_ADD_HEAD_CIRCUMFERENCE_SCHEMA,
     )
     hass.services.async_register(
         DOMAIN,
         ATTR_ACTION_ADD_HEIGHT,
         async_add_height,
-        vol.Schema(
-            {
-                **COMMON_FIELDS,
-                vol.Required(ATTR_HEIGHT): cv.positive_float,
-                vol.Optional(ATTR_DATE): cv.date,
-            }
-        ),
+        SERVICE_ADD_HEIGHT_SCHEMA,
     )
     hass.services.async_register(
         DOMAIN,
         ATTR_ACTION_ADD_MEDICATION,
         async_add_medication,
-        vol.Schema(
-            {
-                **COMMON_FIELDS,
-                vol.Required(ATTR_NAME): cv.string,
-                vol.Optional(ATTR_DOSAGE): cv.positive_float,
-                vol.Optional(ATTR_DOSAGE_UNIT): vol.In(MEDICATION_DOSAGE_UNITS),
-                vol.Optional(ATTR_TIME): vol.Any(cv.datetime, cv.time),
-                vol.Optional(ATTR_NEXT_DOSE_INTERVAL): cv.time_period,
-            }
-        ),
+        SERVICE_ADD_MEDICATION_SCHEMA,
     )
     hass.services.async_register(
         DOMAIN,
         ATTR_ACTION_ADD_NOTE,
         async_add_note,
-        vol.Schema(
-            {
-                **CHILD_TARGET_FIELDS,
-                vol.Required(ATTR_NOTE): cv.string,
-                vol.Optional(ATTR_TIME): vol.Any(cv.datetime, cv.time),
-                vol.Optional(ATTR_TAGS): vol.All(cv.ensure_list, [str]),
-            }
-        ),
+        SERVICE_ADD_NOTE_SCHEMA,
     )
     hass.services.async_register(
         DOMAIN,
         ATTR_ACTION_ADD_TEMPERATURE,
         async_add_temperature,
-        vol.Schema(
-            {
-                **COMMON_FIELDS,
-                vol.Required(ATTR_TEMPERATURE): cv.positive_float,
-                vol.Optional(ATTR_TIME): vol.Any(cv.datetime, cv.time),
-            }
-        ),
+        SERVICE_ADD_TEMPERATURE_SCHEMA,
     )
     hass.services.async_register(
         DOMAIN,
         ATTR_ACTION_ADD_WEIGHT,
         async_add_weight,
-        vol.Schema(
-            {
-                **COMMON_FIELDS,
-                vol.Required(ATTR_WEIGHT): cv.positive_float,
-                vol.Optional(ATTR_DATE): cv.date,
-            }
-        ),
+        SERVICE_ADD_WEIGHT_SCHEMA,
     )
     hass.services.async_register(
         DOMAIN,
         ATTR_ACTION_DELETE_LAST_ENTRY,
         async_delete_last_entry,
-        vol.Schema(
-            {
-                vol.Required("entity_id"): cv.entity_id,
-            }
-        ),
+        SERVICE_DELETE_LAST_ENTRY_SCHEMA,
     )
     hass.services.async_register(
         DOMAIN,
         "start_timer",
         async_start_timer,
-        vol.Schema(
-            {
-                **CHILD_TARGET_FIELDS,
-                vol.Optional(ATTR_START): vol.Any(cv.datetime, cv.time),
-                vol.Optional(ATTR_NAME): cv.string,
-            }
-        ),
+        SERVICE_START_TIMER_SCHEMA,
     )
 
     hass.services.async_register(
         DOMAIN,
         ATTR_ACTION_ADD_FEEDING,
         async_add_feeding,
-        vol.Schema(
-            {
-                **COMMON_FIELDS_TIMER,
-                vol.Required(ATTR_TYPE): vol.In(FEEDING_TYPES),
-                vol.Required(ATTR_METHOD): vol.In(FEEDING_METHODS),
-                vol.Optional(ATTR_AMOUNT): cv.positive_float,
-                vol.Optional(ATTR_NOTES): cv.string,
-            }
-        ),
+        SERVICE_ADD_FEEDING_SCHEMA,
     )
     hass.services.async_register(
         DOMAIN,
         ATTR_ACTION_ADD_PUMPING,
         async_add_pumping,
-        vol.Schema(
-            {
-                **COMMON_FIELDS_TIMER,
-                vol.Required(ATTR_AMOUNT): cv.positive_float,
-                vol.Optional(ATTR_NOTES): cv.string,
-            }
-        ),
+        SERVICE_ADD_PUMPING_SCHEMA,
     )
     hass.services.async_register(
         DOMAIN,
         ATTR_ACTION_ADD_SLEEP,
         async_add_sleep,
-        vol.Schema(
-            {
-                **COMMON_FIELDS_TIMER,
-                vol.Optional(ATTR_NAP): cv.boolean,
-                vol.Optional(ATTR_NOTES): cv.string,
-            }
-        ),
+        SERVICE_ADD_SLEEP_SCHEMA,
     )
     hass.services.async_register(
         DOMAIN,
         ATTR_ACTION_ADD_TUMMY_TIME,
         async_add_tummy_time,
-        vol.Schema(
-            {
-                **COMMON_FIELDS_TIMER,
-                vol.Optional(ATTR_MILESTONE): cv.string,
-            }
-        ),
+        SERVICE_ADD_TUMMY_TIME_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        ATTR_ACTION_ADD_ENTRIES,
+        async_add_entries,
+        SERVICE_ADD_ENTRIES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
@@ -0,0 +1,163 @@
+"""Request and refresh instrumentation for babybuddy integration."""
+
+from __future__ import annotations
+
+from collections import Counter, deque
+from dataclasses import dataclass, field
+import math
+from typing import Any
+
+from .const import LATENCY_SAMPLES
+
+
+def percentile(samples: list[float], fraction: float) -> float | None:
+    """Return the nearest-rank percentile of samples, or None if empty."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+@dataclass
+class EndpointStats:
+    """Requests made to one endpoint."""
+
+    requests: int = 0
+    bytes_received: int = 0
+    errors: Counter[str] = field(default_factory=Counter)
+    latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=LATENCY_SAMPLES)
+    )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stats with latencies summarized, in milliseconds."""
+        samples = list(self.latencies)
+        return {
+            "requests": self.requests,
+            "bytes_received": self.bytes_received,
+            "errors": dict(self.errors),
+            "latency_p50_ms": to_ms(percentile(samples, 0.5)),
+            "latency_p95_ms": to_ms(percentile(samples, 0.95)),
+            "latency_max_ms": to_ms(max(samples, default=None)),
+        }
+
+
+class BabyBuddyStats:
+    """Per-endpoint request stats and refresh durations of a client.
+
+    Latencies keep the last LATENCY_SAMPLES requests per endpoint, so the
+    percentiles follow recent behaviour rather than the whole uptime. Child
+    coordinators that poll on their own keep their refresh durations apart
+    from the parent's, which are the ones the refresh sensor reports.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the stats."""
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.refresh_durations: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.child_refresh_durations: dict[int, deque[float]] = {}
+
+    def record_request(
+        self,
+        endpoint: str,
+        latency: float,
+        bytes_received: int = 0,
+        error: str | None = None,
+    ) -> None:
+        """Record one request, successful or not."""
+        stats = self.endpoints.setdefault(endpoint, EndpointStats())
+        stats.requests += 1
+        stats.bytes_received += bytes_received
+        stats.latencies.append(latency)
+        if error is not None:
+            stats.errors[error] += 1
+
+    def record_refresh(self, duration: float, child_id: int | None = None) -> None:
+        """Record the duration of the parent or a child coordinator refresh."""
+        if child_id is None:
+            self.refresh_durations.append(duration)
+            return
+        self.child_refresh_durations.setdefault(
+            child_id, deque(maxlen=LATENCY_SAMPLES)
+        ).append(duration)
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests made."""
+        return sum(stats.requests for stats in self.endpoints.values())
+
+    @property
+    def errors(self) -> Counter[str]:
+        """Return the number of failed requests by error class."""
+        errors: Counter[str] = Counter()
+        for stats in self.endpoints.values():
+            errors.update(stats.errors)
+        return errors
+
+    @property
+    def bytes_received(self) -> int:
+        """Return the number of bytes received."""
+        return sum(stats.bytes_received for stats in self.endpoints.values())
+
+    @property
+    def last_refresh(self) -> float | None:
+        """Return the duration of the last refresh in seconds."""
+        return self.refresh_durations[-1] if self.refresh_durations else None
+
+    def latency_p95(self) -> float | None:
+        """Return the p95 latency over all endpoints in milliseconds."""
+        return to_ms(
+            percentile(
+                [
+                    latency
+                    for stats in self.endpoints.values()
+                    for latency in stats.latencies
+                ],
+                0.95,
+            )
+        )
+
+    def slowest_endpoint(self) -> str | None:
+        """Return the endpoint with the highest p95 latency."""
+        return max(
+            self.endpoints,
+            key=lambda endpoint: (
+                percentile(list(self.endpoints[endpoint].latencies), 0.95) or 0
+            ),
+            default=None,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stats for diagnostics."""
+        return {
+            "refresh": summarize_refreshes(self.refresh_durations),
+            "child_refresh": {
+                child_id: summarize_refreshes(durations)
+                for child_id, durations in sorted(self.child_refresh_durations.items())
+            },
+            "endpoints": {
+                endpoint: stats.as_dict()
+                for endpoint, stats in sorted(self.endpoints.items())
+            },
+        }
+
+
+def summarize_refreshes(durations: deque[float]) -> dict[str, Any]:
+    """Return the count, last, median and longest of refresh durations."""
+    samples = list(durations)
+    return {
+        "count": len(samples),
+        "last_s": round_or_none(samples[-1] if samples else None),
+        "p50_s": round_or_none(percentile(samples, 0.5)),
+        "max_s": round_or_none(max(samples, default=None)),
+    }
+
+
+def to_ms(seconds: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def round_or_none(seconds: float | None) -> float | None:
+    """Round seconds to milliseconds precision."""
+    return None if seconds is None else round(seconds, 3)
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-from homeassistant.const import ATTR_ID
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -39,9 +38,11 @@ def update_items(
     """Add timer switches to new child."""
     new_entities = []
     if coordinator.data:
-        for child in coordinator.data[0]:
-            if child[ATTR_ID] not in tracked:
-                tracked[child[ATTR_ID]] = BabyBuddyChildTimerSwitch(coordinator, child)
-                new_entities.append(tracked[child[ATTR_ID]])
+        for child in coordinator.data.children.values():
+            if child.id not in tracked:
+                tracked[child.id] = BabyBuddyChildTimerSwitch(
+                    coordinator.child_coordinators[child.id], child
+                )
+                new_entities.append(tracked[child.id])
         if new_entities:
             async_add_entities(new_entities)
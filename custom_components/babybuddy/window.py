@@ -0,0 +1,211 @@
+"""Rolling windows of a child's recent babybuddy entries."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime
+import heapq
+from typing import TYPE_CHECKING
+
+from homeassistant.util import dt as dt_util
+
+from .client import since_filter
+from .const import AGGREGATE_TYPES, ENDPOINT_ORDER_KEYS, BabyBuddyAggregateDescription
+from .models import Entry, parse_entry
+
+if TYPE_CHECKING:
+    from .client import BabyBuddyClient
+
+
+class RollingWindow:
+    """The entries of one aggregate since its cutoff, with running totals.
+
+    Entries are kept by id with the values they add, so adding an entry or
+    taking one back out changes the totals in constant time. A heap orders
+    them by time for eviction; an entry moved by an edit leaves its old heap
+    item behind, which is skipped when it comes up.
+    """
+
+    def __init__(self, description: BabyBuddyAggregateDescription) -> None:
+        """Initialize the window."""
+        self.description = description
+        self.order_key = ENDPOINT_ORDER_KEYS[description.endpoint]
+        self.entries: dict[int, tuple[datetime, tuple[float, ...]]] = {}
+        self.heap: list[tuple[datetime, int]] = []
+        # The state, then each attribute, in the order of attribute_fns.
+        self.totals: list[float] = [0] * (1 + len(description.attribute_fns))
+
+    @property
+    def value(self) -> float:
+        """Return the state total."""
+        return self.totals[0]
+
+    @property
+    def attributes(self) -> dict[str, float]:
+        """Return the attribute totals."""
+        return dict(zip(self.description.attribute_fns, self.totals[1:], strict=True))
+
+    def cutoff(self, now: datetime) -> datetime:
+        """Return the time before which entries leave the window."""
+        if self.description.window is not None:
+            return now - self.description.window
+        return dt_util.start_of_local_day(dt_util.as_local(now))
+
+    def add(self, entry: Entry, now: datetime) -> bool:
+        """Count an entry, or recount it if it changed.
+
+        Returns whether the totals changed.
+        """
+        when: datetime | None = getattr(entry, self.order_key, None)
+        if when is None or when < self.cutoff(now):
+            return self.remove(entry.id)
+        values = (
+            self.description.value_fn(entry),
+            *(fn(entry) for fn in self.description.attribute_fns.values()),
+        )
+        current = self.entries.get(entry.id)
+        if current == (when, values):
+            return False
+        self.remove(entry.id)
+        self.entries[entry.id] = (when, values)
+        heapq.heappush(self.heap, (when, entry.id))
+        self.totals = [
+            total + value for total, value in zip(self.totals, values, strict=True)
+        ]
+        return True
+
+    def remove(self, entry_id: int) -> bool:
+        """Stop counting an entry. Returns whether it was counted."""
+        current = self.entries.pop(entry_id, None)
+        if current is None:
+            return False
+        self.totals = [
+            total - value for total, value in zip(self.totals, current[1], strict=True)
+        ]
+        return True
+
+    def evict(self, now: datetime) -> bool:
+        """Drop the entries that fell out of the window.
+
+        Returns whether the totals changed.
+        """
+        cutoff = self.cutoff(now)
+        changed = False
+        while self.heap and self.heap[0][0] < cutoff:
+            when, entry_id = heapq.heappop(self.heap)
+            current = self.entries.get(entry_id)
+            if current is not None and current[0] == when:
+                changed |= self.remove(entry_id)
+        return changed
+
+
+class BabyBuddyChildWindows:
+    """The rolling windows of a child, one per aggregate.
+
+    The windows are filled once with the entries since their cutoff, then
+    kept current from the entries a poll or a write brings in, so the
+    aggregate sensors need no requests of their own while nothing new is
+    made. A poll only sees the latest entry of an endpoint; when it is newer
+    than the newest entry counted, the endpoint is marked stale and every
+    record since that entry is fetched, so entries made in babybuddy between
+    two polls are all counted.
+    """
+
+    def __init__(self, child_id: int) -> None:
+        """Initialize the windows."""
+        self.child_id = child_id
+        self.windows: dict[str, RollingWindow] = {
+            description.key: RollingWindow(description)
+            for description in AGGREGATE_TYPES
+        }
+        self.loaded = False
+        # Time of the newest entry counted, by endpoint.
+        self.newest: dict[str, datetime] = {}
+        # Endpoints with entries not fetched yet, with the time to fetch from.
+        self.stale: dict[str, datetime] = {}
+
+    def endpoints(self) -> set[str]:
+        """Return the endpoints the windows count entries of."""
+        return {window.description.endpoint for window in self.windows.values()}
+
+    def endpoint_windows(self, endpoint: str) -> list[RollingWindow]:
+        """Return the windows that count entries of an endpoint."""
+        return [
+            window
+            for window in self.windows.values()
+            if window.description.endpoint == endpoint
+        ]
+
+    def count(self, endpoint: str, entry: Entry, now: datetime) -> bool:
+        """Count an entry in the windows of its endpoint.
+
+        Returns whether any totals changed.
+        """
+        changed = False
+        for window in self.endpoint_windows(endpoint):
+            changed |= window.add(entry, now)
+        when: datetime | None = getattr(entry, ENDPOINT_ORDER_KEYS[endpoint], None)
+        if when is not None and (
+            endpoint not in self.newest or when > self.newest[endpoint]
+        ):
+            self.newest[endpoint] = when
+        return changed
+
+    async def async_fetch(
+        self, client: BabyBuddyClient, endpoint: str, since: datetime, now: datetime
+    ) -> bool:
+        """Count the records of an endpoint from a point in time on.
+
+        Returns whether any totals changed.
+        """
+        changed = False
+        async for data in client.async_iter_records(
+            endpoint,
+            child=self.child_id,
+            **since_filter(ENDPOINT_ORDER_KEYS[endpoint], since),
+        ):
+            changed |= self.count(endpoint, parse_entry(endpoint, data), now)
+        return changed
+
+    async def async_load(self, client: BabyBuddyClient, now: datetime) -> None:
+        """Fill the windows with the entries since their cutoff."""
+        for endpoint in sorted(self.endpoints() & client.endpoints.keys()):
+            since = min(
+                window.cutoff(now) for window in self.endpoint_windows(endpoint)
+            )
+            self.newest.setdefault(endpoint, since)
+            await self.async_fetch(client, endpoint, since, now)
+        self.loaded = True
+
+    async def async_backfill(self, client: BabyBuddyClient, now: datetime) -> bool:
+        """Fetch the entries of stale endpoints since the newest one counted.
+
+        An endpoint stays stale until its records were fetched. Returns
+        whether any totals changed.
+        """
+        changed = False
+        for endpoint, since in sorted(self.stale.items()):
+            changed |= await self.async_fetch(client, endpoint, since, now)
+            del self.stale[endpoint]
+        return changed
+
+    def update(self, entries: Mapping[str, Entry], now: datetime) -> bool:
+        """Evict old entries and count new or changed ones, by endpoint.
+
+        An endpoint whose entry is newer than the newest one counted is
+        marked stale, as entries may have been made before it since.
+        Returns whether any totals changed.
+        """
+        changed = False
+        for window in self.windows.values():
+            changed |= window.evict(now)
+        for endpoint in self.endpoints():
+            entry = entries.get(endpoint)
+            if entry is None:
+                continue
+            when: datetime | None = getattr(entry, ENDPOINT_ORDER_KEYS[endpoint], None)
+            newest = self.newest.get(endpoint)
+            if when is not None and newest is not None and when > newest:
+                self.stale.setdefault(endpoint, newest)
+            changed |= self.count(endpoint, entry, now)
+        return changed
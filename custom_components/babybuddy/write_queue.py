@@ -0,0 +1,402 @@
+"""Durable write queue for babybuddy integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from contextlib import suppress
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+from aiohttp.client_exceptions import ClientConnectorError, ClientError
+
+from homeassistant.const import ATTR_DATE, ATTR_ID, ATTR_TIME
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CHILD,
+    ATTR_CHILDREN,
+    ATTR_END,
+    ATTR_QUEUED,
+    ATTR_RESULTS,
+    ATTR_START,
+    ATTR_TIMER,
+    ATTR_TIMERS,
+    DOMAIN,
+    ENDPOINT_ORDER_KEYS,
+    LOGGER,
+    STORAGE_VERSION,
+    WRITE_INLINE_TIMEOUT,
+    WRITE_QUEUE_MATCH_LIMIT,
+    WRITE_QUEUE_RETRY_MAX,
+    WRITE_QUEUE_RETRY_MIN,
+)
+from .errors import AuthorizationError, CircuitOpenError, ConnectError
+from .models import Timer
+
+if TYPE_CHECKING:
+    from .coordinator import BabyBuddyCoordinator
+
+METHOD_DELETE = "DELETE"
+METHOD_POST = "POST"
+
+
+@dataclass
+class QueuedWrite:
+    """A write to babybuddy that has not been confirmed yet."""
+
+    id: str
+    method: str
+    endpoint: str
+    data: dict[str, Any]
+    child_id: int | None
+    refresh: list[str] = field(default_factory=list)
+    created: str = field(default_factory=lambda: dt_util.utcnow().isoformat())
+    # The write may have reached babybuddy even though no answer came back.
+    attempted: bool = False
+    # The write waits for the drainer instead of being sent by its caller.
+    deferred: bool = False
+
+
+class BabyBuddyWriteQueue:
+    """Write-ahead queue for the writes of an entry.
+
+    Every write is persisted before it is sent. While babybuddy is reachable
+    writes are sent straight away by their caller, as before, with a short
+    timeout. A write that cannot be sent in time is deferred, as is every
+    write after it or while the circuit breaker is open, and a background
+    drainer replays them in order, with backoff, once babybuddy can be
+    reached again. A write that may have reached
+    babybuddy is first looked up there, so a retry never creates a
+    duplicate entry.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: BabyBuddyCoordinator) -> None:
+        """Initialize the queue."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.store: Store[list[dict[str, Any]]] = Store(
+            hass,
+            STORAGE_VERSION,
+            f"{DOMAIN}.{coordinator.entry.entry_id}.write_queue",
+        )
+        self.writes: list[QueuedWrite] = []
+        self.drainer: asyncio.Task[None] | None = None
+        self.listeners: list[CALLBACK_TYPE] = []
+
+    @property
+    def depth(self) -> int:
+        """Return the number of writes not confirmed by babybuddy yet."""
+        return len(self.writes)
+
+    async def async_load(self) -> None:
+        """Load the writes left over from a previous run and replay them."""
+        self.writes = [
+            QueuedWrite(**{**write, "deferred": True})
+            for write in await self.store.async_load() or []
+        ]
+        if self.writes:
+            LOGGER.info(f"Replaying {len(self.writes)} queued writes")
+            self.async_start_drainer()
+        self.async_notify()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for changes of the queue depth."""
+        self.listeners.append(update_callback)
+        return lambda: self.listeners.remove(update_callback)
+
+    @callback
+    def async_notify(self) -> None:
+        """Notify listeners of a change of the queue depth."""
+        for update_callback in list(self.listeners):
+            update_callback()
+
+    async def async_post(
+        self,
+        endpoint: str,
+        data: dict[str, Any],
+        child_id: int | None,
+        *refresh: str,
+        call_time: datetime | None = None,
+    ) -> dict[str, Any] | None:
+        """Create an entry and write it through to the coordinator data.
+
+        Returns the created entry, {"queued": <id>} if the write was
+        deferred, or None if babybuddy rejected it.
+        """
+        return await self.async_submit(
+            QueuedWrite(uuid4().hex, METHOD_POST, endpoint, dict(data), child_id),
+            refresh,
+            call_time,
+        )
+
+    async def async_delete(
+        self, endpoint: str, entry_id: int, child_id: int | None, *refresh: str
+    ) -> None:
+        """Delete an entry and refresh the endpoint."""
+        await self.async_submit(
+            QueuedWrite(
+                uuid4().hex, METHOD_DELETE, endpoint, {ATTR_ID: entry_id}, child_id
+            ),
+            refresh,
+        )
+
+    async def async_submit(
+        self,
+        write: QueuedWrite,
+        refresh: tuple[str, ...],
+        call_time: datetime | None = None,
+    ) -> dict[str, Any] | None:
+        """Persist a write, then send it unless babybuddy is known to be down.
+
+        The writes pin adds are sent after it, unless babybuddy rejects it.
+        """
+        write.refresh = list(refresh)
+        writes = [write, *self.pin(write)]
+        self.writes.extend(writes)
+        if self.coordinator.client.breaker.is_open or any(
+            queued.deferred for queued in self.writes
+        ):
+            for queued in writes:
+                queued.deferred = True
+            await self.async_save()
+            self.async_start_drainer()
+            return {ATTR_QUEUED: write.id}
+
+        result: dict[str, Any] | None = None
+        for index, queued in enumerate(writes):
+            queued.attempted = True
+            await self.async_save()
+            try:
+                created = await self.async_send(queued, call_time, WRITE_INLINE_TIMEOUT)
+            except ConnectError as error:
+                queued.attempted = may_have_landed(error)
+                for remaining in writes[index:]:
+                    remaining.deferred = True
+                await self.async_save()
+                self.async_start_drainer()
+                return result if index else {ATTR_QUEUED: write.id}
+            except Exception:  # noqa: BLE001
+                # Any other failure is a rejection; replaying it on the next
+                # start would send a request babybuddy already turned down.
+                LOGGER.exception(
+                    f"Could not send write {queued.id} to {queued.endpoint}"
+                )
+                created = None
+
+            await self.async_complete(queued, created)
+            if queued is write:
+                result = created
+                if created is None:
+                    # Rejected, so the timer it was made from is kept.
+                    for remaining in writes[1:]:
+                        self.writes.remove(remaining)
+                    await self.async_save()
+                    break
+        return result
+
+    def pin(self, write: QueuedWrite) -> list[QueuedWrite]:
+        """Fill in what babybuddy would otherwise fill in on arrival.
+
+        babybuddy stamps entries without a time, date or start, and ends
+        entries made from a timer, when they arrive. Pinning these to when
+        the write was made, before it is first sent, keeps a replay at that
+        time and lets async_find_existing compare exactly what was sent.
+
+        Returns the writes to send after it: babybuddy only removes a timer
+        it used itself, so an entry made from a known timer removes it.
+        """
+        if write.method != METHOD_POST:
+            return []
+        created = dt_util.parse_datetime(write.created) or dt_util.utcnow()
+        order_key = ENDPOINT_ORDER_KEYS.get(write.endpoint)
+        if order_key == ATTR_TIME:
+            write.data.setdefault(ATTR_TIME, created.isoformat())
+        elif order_key == ATTR_DATE:
+            write.data.setdefault(ATTR_DATE, dt_util.as_local(created).date())
+        elif order_key == ATTR_START and ATTR_TIMER not in write.data:
+            write.data.setdefault(ATTR_START, created.isoformat())
+
+        timer_id = write.data.get(ATTR_TIMER)
+        if timer_id is None or write.child_id is None or not self.coordinator.data:
+            return []
+        timer = self.coordinator.data.entry(write.child_id, ATTR_TIMERS)
+        if not isinstance(timer, Timer) or timer.id != timer_id or timer.start is None:
+            return []
+        write.data.pop(ATTR_TIMER)
+        write.data.update(
+            {
+                ATTR_CHILD: write.child_id,
+                ATTR_START: timer.start.isoformat(),
+                ATTR_END: created.isoformat(),
+            }
+        )
+        write.refresh = [r for r in write.refresh if r != ATTR_TIMERS]
+        return [
+            QueuedWrite(
+                uuid4().hex,
+                METHOD_DELETE,
+                ATTR_TIMERS,
+                {ATTR_ID: timer_id},
+                write.child_id,
+            )
+        ]
+
+    async def async_send(
+        self,
+        write: QueuedWrite,
+        call_time: datetime | None = None,
+        timeout: float | None = None,
+    ) -> dict[str, Any] | None:
+        """Send a write to babybuddy, bounded by the concurrent requests option."""
+        client = self.coordinator.client
+        async with self.coordinator.write_semaphore:
+            if write.method == METHOD_DELETE:
+                await client.async_delete(
+                    write.endpoint, write.data[ATTR_ID], timeout=timeout
+                )
+                return None
+            return await client.async_post(
+                write.endpoint, write.data, call_time, timeout=timeout
+            )
+
+    async def async_apply(
+        self, write: QueuedWrite, created: dict[str, Any] | None
+    ) -> None:
+        """Update the coordinator data after a write."""
+        if write.child_id is None:
+            await self.coordinator.async_request_refresh()
+        elif write.method == METHOD_DELETE:
+            await self.coordinator.async_refresh_child(
+                write.child_id, write.endpoint, *write.refresh
+            )
+        else:
+            await self.coordinator.async_apply_entry(
+                write.child_id, write.endpoint, created, *write.refresh
+            )
+
+    @callback
+    def async_start_drainer(self) -> None:
+        """Start replaying the deferred writes unless already doing so."""
+        if self.drainer is None or self.drainer.done():
+            self.drainer = self.coordinator.entry.async_create_background_task(
+                self.hass, self.async_drain(), f"{DOMAIN} write queue"
+            )
+
+    async def async_drain(self) -> None:
+        """Replay the deferred writes in order."""
+        retry = WRITE_QUEUE_RETRY_MIN
+        while deferred := [write for write in self.writes if write.deferred]:
+            write = deferred[0]
+            try:
+                created = await self.async_replay(write)
+            except ConnectError:
+                LOGGER.debug(f"babybuddy unreachable, retrying in {retry}s")
+                await asyncio.sleep(retry)
+                retry = min(retry * 2, WRITE_QUEUE_RETRY_MAX)
+                with suppress(AuthorizationError, ConnectError):
+                    await self.coordinator.client.async_connect()
+                continue
+            except Exception:  # noqa: BLE001
+                # Dropped as rejected, so one bad write cannot stop the
+                # drainer and hold back every write after it.
+                LOGGER.exception(
+                    f"Could not replay write {write.id} to {write.endpoint}"
+                )
+                created = None
+
+            retry = WRITE_QUEUE_RETRY_MIN
+            try:
+                await self.async_complete(write, created)
+            except Exception:  # noqa: BLE001
+                LOGGER.exception(f"Could not update the data after write {write.id}")
+
+    async def async_complete(
+        self, write: QueuedWrite, created: dict[str, Any] | None
+    ) -> None:
+        """Remove a write babybuddy answered and update the coordinator data."""
+        self.writes.remove(write)
+        await self.async_save()
+        await self.async_apply(write, created)
+
+    async def async_replay(self, write: QueuedWrite) -> dict[str, Any] | None:
+        """Send a deferred write unless an earlier attempt already landed."""
+        if write.attempted and write.method == METHOD_POST:
+            try:
+                existing = await self.async_find_existing(write)
+            except (TimeoutError, ClientError) as error:
+                raise ConnectError(error) from error
+            if existing is not None:
+                LOGGER.debug(f"Queued write {write.id} already reached babybuddy")
+                return existing
+        write.attempted = True
+        await self.async_save()
+        try:
+            return await self.async_send(write)
+        except ConnectError as error:
+            if not may_have_landed(error):
+                write.attempted = False
+                await self.async_save()
+            raise
+
+    async def async_find_existing(self, write: QueuedWrite) -> dict[str, Any] | None:
+        """Return the entry created by an earlier attempt of a write, if any.
+
+        A write still made from a timer, whose timer was unknown when it was
+        pinned, is never matched: babybuddy does not store the timer, and
+        rejects a replay once the timer was used.
+        """
+        if ATTR_TIMER in write.data:
+            return None
+        query = f"?limit={WRITE_QUEUE_MATCH_LIMIT}"
+        child = write.data.get(ATTR_CHILD, write.child_id)
+        if child is not None and write.endpoint != ATTR_CHILDREN:
+            query = f"{query}&child={child}"
+        entries = await self.coordinator.client.async_get(write.endpoint, query)
+        for entry in entries[ATTR_RESULTS]:
+            # The child is filtered on already and tells nothing apart.
+            compared = [key for key in write.data if key != ATTR_CHILD and key in entry]
+            if compared and all(
+                same_value(write.data[key], entry[key]) for key in compared
+            ):
+                return entry
+        return None
+
+    async def async_save(self) -> None:
+        """Persist the queue and notify listeners."""
+        await self.store.async_save([asdict(write) for write in self.writes])
+        self.async_notify()
+
+
+def may_have_landed(error: ConnectError) -> bool:
+    """Return whether a failed write may still have reached babybuddy."""
+    return not isinstance(error, CircuitOpenError) and not isinstance(
+        error.__cause__, ClientConnectorError
+    )
+
+
+def same_value(sent: Any, stored: Any) -> bool:
+    """Return whether a value sent to babybuddy matches the stored value."""
+    if isinstance(sent, list) or isinstance(stored, list):
+        return sorted(map(str, sent or [])) == sorted(map(str, stored or []))
+    if isinstance(sent, bool) or isinstance(stored, bool):
+        return str(sent).lower() == str(stored).lower()
+    if isinstance(sent, datetime) or (
+        isinstance(sent, str) and dt_util.parse_datetime(sent) is not None
+    ):
+        sent_time = sent if isinstance(sent, datetime) else dt_util.parse_datetime(sent)
+        stored_time = dt_util.parse_datetime(str(stored))
+        return stored_time is not None and dt_util.as_utc(sent_time).replace(
+            microsecond=0
+        ) == dt_util.as_utc(stored_time).replace(microsecond=0)
+    if isinstance(sent, date):
+        return sent.isoformat() == str(stored)
+    try:
+        return float(sent) == float(stored)
+    except (TypeError, ValueError):
+        return str(sent).lower() == str(stored).lower()
@@ -0,0 +1,16 @@
+"""Fixtures for babybuddy benchmarks."""
+
+import logging
+
+import pytest
+
+from custom_components.babybuddy.const import LOGGER
+
+
+@pytest.fixture(autouse=True)
+def debug_logging_off():
+    """Benchmark with debug logging off, as on a production instance."""
+    level = LOGGER.level
+    LOGGER.setLevel(logging.INFO)
+    yield
+    LOGGER.setLevel(level)
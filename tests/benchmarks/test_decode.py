@@ -0,0 +1,63 @@
+"""Benchmark decoding babybuddy API responses."""
+
+from datetime import timedelta
+import json
+
+import pytest
+
+from custom_components.babybuddy.client import decode_json
+from homeassistant.util import dt as dt_util
+
+PAGE_SIZE = 100
+
+
+def _feedings_page(count: int) -> bytes:
+    """Return a paginated feedings response as babybuddy serializes it."""
+    now = dt_util.utcnow()
+    results = [
+        {
+            "id": index,
+            "child": index % 3 + 1,
+            "start": (now - timedelta(hours=index, minutes=15)).isoformat(),
+            "end": (now - timedelta(hours=index)).isoformat(),
+            "duration": "00:15:00",
+            "type": "breast milk",
+            "method": "bottle",
+            "amount": 120.0,
+            "notes": "Lorem ipsum dolor sit amet, consectetur adipiscing elit.",
+            "tags": ["night", "bottle"],
+        }
+        for index in range(count)
+    ]
+    return json.dumps(
+        {
+            "count": count * 10,
+            "next": f"http://127.0.0.1:8000/api/feedings/?limit={count}&offset={count}",
+            "previous": None,
+            "results": results,
+        }
+    ).encode()
+
+
+def _decode_twice(body: bytes) -> object:
+    """Decode a response the way async_get used to.
+
+    The body was decoded to text for an eagerly formatted debug line, then
+    decoded again by aiohttp's resp.json() before parsing with stdlib json.
+    """
+    _ = f"GET response: {body.decode('utf-8')}"
+    return json.loads(body.decode("utf-8"))
+
+
+@pytest.mark.parametrize("page_size", [1, PAGE_SIZE])
+def test_decode_before(benchmark, page_size: int) -> None:
+    """Benchmark the previous double decode."""
+    body = _feedings_page(page_size)
+    assert benchmark(_decode_twice, body)
+
+
+@pytest.mark.parametrize("page_size", [1, PAGE_SIZE])
+def test_decode_after(benchmark, page_size: int) -> None:
+    """Benchmark the single-pass decode."""
+    body = _feedings_page(page_size)
+    assert benchmark(decode_json, body) == json.loads(body)
@@ -0,0 +1,55 @@
+"""Benchmark the memory and ingest cost of the coordinator data model."""
+
+from collections.abc import Callable
+import json
+import tracemalloc
+from typing import Any
+
+from custom_components.babybuddy.const import ATTR_CHILDREN, ATTR_ENTRIES
+from custom_components.babybuddy.models import BabyBuddySnapshot
+from tests.fake_babybuddy import ORDER_KEYS, FakeBabyBuddy
+
+CHILDREN = 100
+
+
+def _snapshot_json(children: int) -> str:
+    """Return children with the latest entry of each endpoint as JSON."""
+    fake = FakeBabyBuddy()
+    fake.seed(children)
+    entries: dict[int, dict[str, Any]] = {
+        child["id"]: {} for child in fake.records[ATTR_CHILDREN]
+    }
+    for endpoint in ORDER_KEYS:
+        for record in fake.records[endpoint]:
+            entries[record["child"]].setdefault(endpoint, record)
+    return json.dumps(
+        {ATTR_CHILDREN: fake.records[ATTR_CHILDREN], ATTR_ENTRIES: entries}
+    )
+
+
+def _retained(build: Callable[[], object]) -> int:
+    """Return the bytes still allocated by build once it returns."""
+    tracemalloc.start()
+    try:
+        data = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert data
+    return size
+
+
+def test_snapshot_memory(benchmark) -> None:
+    """Compare the memory of parsed records against the decoded JSON."""
+    body = _snapshot_json(CHILDREN)
+    raw = json.loads(body)
+
+    snapshot = benchmark(BabyBuddySnapshot.from_json, raw)
+    raw_bytes = _retained(lambda: json.loads(body))
+    model_bytes = _retained(lambda: BabyBuddySnapshot.from_json(json.loads(body)))
+    benchmark.extra_info["raw_bytes"] = raw_bytes
+    benchmark.extra_info["model_bytes"] = model_bytes
+
+    assert len(snapshot.children) == CHILDREN
+    assert snapshot.as_json() == BabyBuddySnapshot.from_json(raw).as_json()
+    assert model_bytes < raw_bytes
@@ -0,0 +1,87 @@
+"""Benchmark streaming a long history page by page from a fake server.
+
+pytest-benchmark times synchronous callables, so these tests are sync and
+drive the Home Assistant event loop themselves.
+"""
+
+import asyncio
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.babybuddy.client import BabyBuddyClient
+from custom_components.babybuddy.const import (
+    ATTR_FEEDINGS,
+    ATTR_RESULTS,
+    CONFIG_FLOW_VERSION,
+    DEFAULT_PATH,
+    DOMAIN,
+)
+from homeassistant.const import CONF_API_KEY, CONF_HOST, CONF_PATH, CONF_PORT
+from homeassistant.core import HomeAssistant
+from tests.fake_babybuddy import FakeBabyBuddy
+
+RECORDS = 1000
+PAGE_SIZE = 100
+# Seconds per request, and spent by the caller on every page.
+LATENCY = 0.005
+ROUNDS = 3
+
+
+@pytest.fixture
+async def client(hass: HomeAssistant, fake_babybuddy: FakeBabyBuddy) -> BabyBuddyClient:
+    """Set up an entry for a fake babybuddy with a long feeding history."""
+    fake_babybuddy.seed(1, RECORDS)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=CONFIG_FLOW_VERSION,
+        data={
+            CONF_HOST: "http://127.0.0.1",
+            CONF_PORT: fake_babybuddy.port,
+            CONF_PATH: DEFAULT_PATH,
+            CONF_API_KEY: fake_babybuddy.api_key,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    fake_babybuddy.latency = LATENCY
+    return entry.runtime_data.coordinator.client
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_pages(
+    benchmark,
+    hass: HomeAssistant,
+    fake_babybuddy: FakeBabyBuddy,
+    client: BabyBuddyClient,
+    prefetch: bool,
+) -> None:
+    """Benchmark working through every page of an endpoint."""
+
+    async def async_read_history() -> int:
+        records = 0
+        async for page in client.async_iter_pages(
+            ATTR_FEEDINGS, page_size=PAGE_SIZE, prefetch=prefetch
+        ):
+            records += len(page[ATTR_RESULTS])
+            await asyncio.sleep(LATENCY)
+        return records
+
+    # --benchmark-disable runs a single round, so count the rounds run.
+    rounds = 0
+
+    def read_history() -> int:
+        nonlocal rounds
+        rounds += 1
+        return hass.loop.run_until_complete(async_read_history())
+
+    cached = len(client.cache)
+    requests = fake_babybuddy.request_count
+    records = benchmark.pedantic(read_history, rounds=ROUNDS)
+    benchmark.extra_info["requests"] = (
+        fake_babybuddy.request_count - requests
+    ) / rounds
+
+    assert records == RECORDS
+    assert len(client.cache) == cached
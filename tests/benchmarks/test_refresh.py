@@ -0,0 +1,148 @@
+"""Benchmark refreshing babybuddy data against a fake server.
+
+pytest-benchmark times synchronous callables, so these tests are sync and
+drive the Home Assistant event loop themselves.
+"""
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.babybuddy.const import (
+    ATTR_CHANGES,
+    ATTR_MEDICATION,
+    ATTR_SLEEP,
+    CONF_BULK_REFRESH,
+    CONFIG_FLOW_VERSION,
+    DEFAULT_PATH,
+    DOMAIN,
+    SENSOR_TYPES,
+)
+from custom_components.babybuddy.coordinator import BabyBuddyCoordinator
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.const import CONF_API_KEY, CONF_HOST, CONF_PATH, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import async_get_platforms
+from tests.fake_babybuddy import FakeBabyBuddy
+
+CHILDREN = [1, 10, 100]
+ROUNDS = 5
+
+
+@pytest.fixture
+def bulk() -> bool:
+    """Refresh with a query per child and endpoint unless parametrized."""
+    return False
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant, fake_babybuddy: FakeBabyBuddy, children: int, bulk: bool
+) -> BabyBuddyCoordinator:
+    """Set up an entry for a fake babybuddy with children."""
+    fake_babybuddy.seed(children)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=CONFIG_FLOW_VERSION,
+        data={
+            CONF_HOST: "http://127.0.0.1",
+            CONF_PORT: fake_babybuddy.port,
+            CONF_PATH: DEFAULT_PATH,
+            CONF_API_KEY: fake_babybuddy.api_key,
+        },
+        options={CONF_BULK_REFRESH: bulk},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    # Let the rolling windows load before requests are counted.
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return entry.runtime_data.coordinator
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+@pytest.mark.parametrize("children", CHILDREN)
+def test_refresh(
+    benchmark,
+    hass: HomeAssistant,
+    fake_babybuddy: FakeBabyBuddy,
+    coordinator: BabyBuddyCoordinator,
+    children: int,
+) -> None:
+    """Benchmark a refresh that polls every endpoint, and count its requests."""
+    # --benchmark-disable runs a single round, so count the rounds run.
+    rounds = 0
+
+    def refresh() -> None:
+        nonlocal rounds
+        rounds += 1
+        hass.loop.run_until_complete(coordinator.async_refresh_all())
+
+    requests = fake_babybuddy.request_count
+    benchmark.pedantic(
+        refresh,
+        # Put every endpoint back on its base interval so all are due.
+        setup=coordinator.configure_polling,
+        rounds=ROUNDS,
+    )
+    requests_per_refresh = (fake_babybuddy.request_count - requests) / rounds
+    benchmark.extra_info["requests"] = requests_per_refresh
+
+    snapshot = coordinator.data
+    assert len(snapshot.children) == children
+    # The fake seeds every endpoint but timers.
+    assert sum(map(len, snapshot.entries.values())) == children * (
+        len(SENSOR_TYPES) - 1
+    )
+    if not coordinator.entry.options[CONF_BULK_REFRESH]:
+        assert requests_per_refresh == 1 + children * len(SENSOR_TYPES)
+
+
+@pytest.mark.parametrize("changed", [None, set()], ids=["all", "none"])
+@pytest.mark.parametrize("children", CHILDREN)
+def test_state_writes(
+    benchmark,
+    hass: HomeAssistant,
+    coordinator: BabyBuddyCoordinator,
+    children: int,
+    changed: set | None,
+) -> None:
+    """Benchmark notifying every entity of a refresh changing all or none."""
+
+    async def async_write_states() -> None:
+        for child_coordinator in coordinator.child_coordinators.values():
+            child_coordinator.changed_endpoints = changed
+            child_coordinator.async_update_listeners()
+
+    benchmark.pedantic(
+        lambda: hass.loop.run_until_complete(async_write_states()), rounds=ROUNDS
+    )
+    entities = len(hass.states.async_entity_ids(SENSOR_DOMAIN))
+    benchmark.extra_info["entities"] = entities
+
+    assert entities >= children * len(SENSOR_TYPES)
+
+
+@pytest.mark.parametrize("children", [1])
+@pytest.mark.parametrize("endpoint", [ATTR_CHANGES, ATTR_MEDICATION, ATTR_SLEEP])
+def test_entity_state_write(
+    benchmark,
+    hass: HomeAssistant,
+    coordinator: BabyBuddyCoordinator,
+    endpoint: str,
+) -> None:
+    """Benchmark computing and writing the state of a child data sensor."""
+    sensor = next(
+        entity
+        for platform in async_get_platforms(hass, DOMAIN)
+        if platform.domain == SENSOR_DOMAIN
+        for entity in platform.entities.values()
+        if getattr(entity, "entity_description", None)
+        and entity.entity_description.key == endpoint
+    )
+
+    async def async_write_state() -> None:
+        sensor.cached_state = None
+        sensor.async_write_ha_state()
+
+    benchmark(lambda: hass.loop.run_until_complete(async_write_state()))
+
+    assert hass.states.get(sensor.entity_id).state not in (None, "unknown")
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections.abc import AsyncGenerator
+
 # from unittest.mock import patch
 import pytest
 from pytest_socket import enable_socket
@@ -11,6 +13,7 @@
 from homeassistant.core import HomeAssistant
 
 from .const import MOCK_CONFIG
+from .fake_babybuddy import FakeBabyBuddy
 
 pytest_plugins = "pytest_homeassistant_custom_component"
 
@@ -39,5 +42,16 @@ async def setup_baby_buddy_entry_live(hass: HomeAssistant):
     result = await hass.config_entries.flow.async_configure(
         result["flow_id"], user_input=MOCK_CONFIG
     )
+    # Start tests once the children's recent entries are loaded.
+    await hass.async_block_till_done(wait_background_tasks=True)
 
     return result["result"]
+
+
+@pytest.fixture
+async def fake_babybuddy() -> AsyncGenerator[FakeBabyBuddy]:
+    """Serve an empty fake babybuddy."""
+    fake = FakeBabyBuddy()
+    runner = await fake.async_start()
+    yield fake
+    await runner.cleanup()
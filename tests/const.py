@@ -28,11 +28,18 @@
     ATTR_TIMER,
     ATTR_TYPE,
     ATTR_WEIGHT,
+    CONF_BULK_REFRESH,
+    CONF_DAILY_COUNTERS,
     CONF_FEEDING_UNIT,
+    CONF_IMPORT_HISTORY,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_TIMEOUTS,
     CONF_WEIGHT_UNIT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
     DEFAULT_PATH,
     DEFAULT_PORT,
     DEFAULT_SCAN_INTERVAL,
+    REQUEST_TIMEOUTS,
 )
 from homeassistant.const import (
     ATTR_DATE,
@@ -77,6 +84,11 @@
     CONF_WEIGHT_UNIT: UnitOfMass.GRAMS,
     CONF_FEEDING_UNIT: UnitOfVolume.MILLILITERS,
     CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS: DEFAULT_MAX_CONCURRENT_REQUESTS,
+    CONF_BULK_REFRESH: False,
+    **{option: REQUEST_TIMEOUTS[method] for method, option in CONF_TIMEOUTS.items()},
+    CONF_IMPORT_HISTORY: False,
+    CONF_DAILY_COUNTERS: False,
 }
 
 MOCK_DATE_NOW: Final = dt_util.now().date()
@@ -0,0 +1,396 @@
+"""In-process fake of the babybuddy REST API.
+
+Serves the endpoint index, children and every endpoint in SENSOR_TYPES with
+babybuddy's pagination, ordering and filters, and 201/204 answers to writes.
+Latency and errors can be injected, so benchmarks run reproducibly without
+a live instance.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+import hashlib
+import json
+import random
+from typing import Any
+
+from aiohttp import web
+from multidict import MultiMapping
+
+# Endpoints with their ordering field; babybuddy lists them newest first.
+ORDER_KEYS = {
+    "bmi": "date",
+    "changes": "time",
+    "feedings": "start",
+    "head-circumference": "date",
+    "height": "date",
+    "medication": "time",
+    "notes": "time",
+    "pumping": "start",
+    "sleep": "start",
+    "temperature": "time",
+    "timers": "start",
+    "tummy-times": "start",
+    "weight": "date",
+}
+DURATION_ENDPOINTS = {"feedings", "pumping", "sleep", "tummy-times"}
+TIME_ENDPOINTS = {"changes", "medication", "notes", "temperature"}
+MEASUREMENT_ENDPOINTS = {
+    "bmi": "bmi",
+    "head-circumference": "head_circumference",
+    "height": "height",
+    "weight": "weight",
+}
+# Fields of seeded entries besides child, tags and their time, span or date.
+SEED_FIELDS: dict[str, dict[str, Any]] = {
+    "changes": {"wet": True, "solid": False, "color": "", "amount": None},
+    "feedings": {"type": "formula", "method": "bottle", "amount": 60.0},
+    "medication": {
+        "name": "med",
+        "dosage": 1.0,
+        "dosage_unit": "ml",
+        "next_dose_interval": "04:00:00",
+    },
+    "notes": {"note": "note"},
+    "pumping": {"amount": 60.0},
+    "sleep": {"nap": False},
+    "temperature": {"temperature": 37.0},
+    "tummy-times": {"milestone": ""},
+}
+# Like babybuddy tokens, free of the hyphens that separate unique_id parts.
+DEFAULT_API_KEY = "0123456789abcdef0123456789abcdef01234567"
+DEFAULT_PAGE_SIZE = 100
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, assuming UTC if it has no offset."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed
+
+
+def format_duration(value: timedelta) -> str:
+    """Format a duration the way babybuddy serializes it."""
+    seconds = int(value.total_seconds())
+    return f"{seconds // 3600:02}:{seconds % 3600 // 60:02}:{seconds % 60:02}"
+
+
+def coerce(value: str) -> Any:
+    """Convert a form field to the type babybuddy would store."""
+    if value in ("True", "true"):
+        return True
+    if value in ("False", "false"):
+        return False
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+@dataclass
+class FakeBabyBuddy:
+    """State and request handlers of the fake server."""
+
+    api_key: str = DEFAULT_API_KEY
+    # Seconds added to every request, plus up to jitter seconds at random.
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Fraction of requests answered with error instead.
+    error_rate: float = 0.0
+    error: type[web.HTTPException] = web.HTTPInternalServerError
+    # Endpoints always answered with error.
+    failing: set[str] = field(default_factory=set)
+    etags: bool = False
+    page_size: int = DEFAULT_PAGE_SIZE
+    records: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    requests: Counter[str] = field(default_factory=Counter)
+    # Requests being served right now, and the most served at once.
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    not_modified: int = 0
+    last_id: int = 0
+    port: int = 0
+
+    def __post_init__(self) -> None:
+        """Initialize the record tables."""
+        self.records.setdefault("children", [])
+        for endpoint in ORDER_KEYS:
+            self.records.setdefault(endpoint, [])
+
+    @property
+    def request_count(self) -> int:
+        """Return the number of requests served."""
+        return sum(self.requests.values())
+
+    def next_id(self) -> int:
+        """Return the next primary key."""
+        self.last_id += 1
+        return self.last_id
+
+    def add_child(self, first_name: str, last_name: str, **extra: Any) -> dict:
+        """Add a child."""
+        child = {
+            "id": self.next_id(),
+            "first_name": first_name,
+            "last_name": last_name,
+            "birth_date": str(date.today()),
+            "slug": f"{first_name}-{last_name}".lower(),
+            "picture": None,
+            **extra,
+        }
+        self.records["children"].append(child)
+        return child
+
+    def add_record(self, endpoint: str, child: int, **fields: Any) -> dict:
+        """Add an entry for a child."""
+        record = {"id": self.next_id(), "child": child, "tags": [], **fields}
+        if endpoint in DURATION_ENDPOINTS and "duration" not in record:
+            record["duration"] = format_duration(
+                parse_datetime(record["end"]) - parse_datetime(record["start"])
+            )
+        self.records[endpoint].append(record)
+        return record
+
+    def seed(self, children: int, records_per_endpoint: int = 1) -> None:
+        """Add children with hourly entries on every endpoint but timers."""
+        now = datetime.now(UTC).replace(microsecond=0)
+        for index in range(children):
+            child = self.add_child(f"child{index}", "fake")
+            for number in range(records_per_endpoint):
+                end = now - timedelta(hours=number + 1)
+                for endpoint in TIME_ENDPOINTS:
+                    self.add_record(
+                        endpoint,
+                        child["id"],
+                        time=end.isoformat(),
+                        **SEED_FIELDS[endpoint],
+                    )
+                for endpoint in DURATION_ENDPOINTS:
+                    self.add_record(
+                        endpoint,
+                        child["id"],
+                        start=(end - timedelta(minutes=15)).isoformat(),
+                        end=end.isoformat(),
+                        **SEED_FIELDS[endpoint],
+                    )
+                for endpoint, key in MEASUREMENT_ENDPOINTS.items():
+                    self.add_record(
+                        endpoint, child["id"], date=str(end.date()), **{key: 1.0}
+                    )
+
+    def filter(self, endpoint: str, query: MultiMapping[str]) -> list[dict[str, Any]]:
+        """Return the entries of an endpoint matching a query, in order."""
+        items = list(self.records[endpoint])
+        if "child" in query:
+            items = [item for item in items if str(item["child"]) == query["child"]]
+        bounds: list[tuple[str, str, Callable[[Any, Any], bool]]] = []
+        if key := ORDER_KEYS.get(endpoint):
+            bounds += [
+                ("date_min", key, lambda a, b: str(a) >= b),
+                ("date_max", key, lambda a, b: str(a) <= b),
+            ]
+        for name in ("start", "end"):
+            bounds += [
+                (
+                    f"{name}_min",
+                    name,
+                    lambda a, b: parse_datetime(a) >= parse_datetime(b),
+                ),
+                (
+                    f"{name}_max",
+                    name,
+                    lambda a, b: parse_datetime(a) <= parse_datetime(b),
+                ),
+            ]
+        for param, name, compare in bounds:
+            if param in query:
+                items = [
+                    item
+                    for item in items
+                    if item.get(name) and compare(item[name], query[param])
+                ]
+
+        ordering = query.get("ordering")
+        if ordering:
+            name = ordering.lstrip("-")
+            items.sort(
+                key=lambda item: (str(item.get(name) or ""), item["id"]),
+                reverse=ordering.startswith("-"),
+            )
+        elif key := ORDER_KEYS.get(endpoint):
+            items.sort(
+                key=lambda item: (str(item.get(key) or ""), item["id"]), reverse=True
+            )
+        else:
+            items.sort(key=lambda item: (item["last_name"], item["first_name"]))
+        return items
+
+    async def handle(self, request: web.Request, name: str) -> None:
+        """Count, delay, authorize and maybe fail a request."""
+        self.requests[name] += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            delay = self.latency + random.uniform(0, self.jitter)
+            if delay:
+                await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+        if request.headers.get("Authorization") != f"Token {self.api_key}":
+            raise web.HTTPUnauthorized(
+                text=json.dumps({"detail": "Invalid token."}),
+                content_type="application/json",
+            )
+        if name in self.failing or (
+            self.error_rate and random.random() < self.error_rate
+        ):
+            raise self.error(text="Injected error.")
+
+    def json_response(
+        self, request: web.Request, payload: Any, status: int = 200
+    ) -> web.Response:
+        """Serialize a response, honouring If-None-Match if ETags are on."""
+        body = json.dumps(payload).encode()
+        headers = {}
+        if self.etags and request.method == "GET":
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                self.not_modified += 1
+                return web.Response(status=304, headers=headers)
+        return web.Response(
+            body=body, status=status, content_type="application/json", headers=headers
+        )
+
+    async def handle_index(self, request: web.Request) -> web.Response:
+        """Return the endpoint map."""
+        await self.handle(request, "index")
+        base = str(request.url.origin())
+        endpoints = ["children", *ORDER_KEYS, "profile", "tags"]
+        return self.json_response(
+            request, {name: f"{base}/api/{name}/" for name in endpoints}
+        )
+
+    async def handle_list(self, request: web.Request) -> web.Response:
+        """Return a page of entries."""
+        endpoint = request.match_info["endpoint"]
+        await self.handle(request, endpoint)
+        if endpoint not in self.records:
+            raise web.HTTPNotFound
+        items = self.filter(endpoint, request.query)
+        limit = int(request.query.get("limit", self.page_size))
+        offset = int(request.query.get("offset", 0))
+        next_url = None
+        if offset + limit < len(items):
+            next_url = str(request.url.update_query(limit=limit, offset=offset + limit))
+        return self.json_response(
+            request,
+            {
+                "count": len(items),
+                "next": next_url,
+                "previous": None,
+                "results": items[offset : offset + limit],
+            },
+        )
+
+    async def handle_create(self, request: web.Request) -> web.Response:
+        """Create an entry, filling in what babybuddy would."""
+        endpoint = request.match_info["endpoint"]
+        await self.handle(request, f"POST {endpoint}")
+        if endpoint not in self.records:
+            raise web.HTTPNotFound
+        if request.content_type == "application/json":
+            data = await request.json()
+        else:
+            form = await request.post()
+            data = {
+                key: form.getall(key) if key == "tags" else coerce(form.getall(key)[-1])
+                for key in form
+            }
+        for key in ("child", "timer"):
+            if key in data:
+                data[key] = int(data[key])
+        if isinstance(data.get("tags"), str):
+            data["tags"] = [data["tags"]]
+        if endpoint == "children":
+            child = self.add_child(
+                data.pop("first_name"), data.pop("last_name"), **data
+            )
+            return self.json_response(request, child, 201)
+
+        now = datetime.now(UTC)
+        if "timer" in data:
+            timer_id = data.pop("timer")
+            timer = next(
+                (t for t in self.records["timers"] if t["id"] == timer_id), None
+            )
+            if timer is None:
+                return self.json_response(request, {"timer": ["Invalid timer."]}, 400)
+            self.records["timers"].remove(timer)
+            data.update(child=timer["child"], start=timer["start"], end=now.isoformat())
+        for key in ("time", "start", "end"):
+            if key in data:
+                data[key] = parse_datetime(str(data[key])).isoformat()
+        if endpoint in TIME_ENDPOINTS:
+            data.setdefault("time", now.isoformat())
+        if endpoint in MEASUREMENT_ENDPOINTS:
+            data["date"] = str(data.get("date") or now.date())
+        if endpoint == "timers":
+            data.setdefault("start", now.isoformat())
+            data.setdefault("name", None)
+        if endpoint == "medication" and "next_dose_interval" in data:
+            hours, minutes, seconds = str(data["next_dose_interval"]).split(":")
+            data["next_dose_interval"] = format_duration(
+                timedelta(
+                    hours=int(hours), minutes=int(minutes), seconds=int(float(seconds))
+                )
+            )
+        child_id = data.pop("child", None)
+        if child_id is None:
+            return self.json_response(
+                request, {"child": ["This field is required."]}, 400
+            )
+        return self.json_response(
+            request, self.add_record(endpoint, child_id, **data), 201
+        )
+
+    async def handle_delete(self, request: web.Request) -> web.Response:
+        """Delete an entry."""
+        endpoint = request.match_info["endpoint"]
+        await self.handle(request, f"DELETE {endpoint}")
+        record_id = int(request.match_info["id"])
+        for record in self.records.get(endpoint, []):
+            if record["id"] == record_id:
+                self.records[endpoint].remove(record)
+                return web.Response(status=204)
+        raise web.HTTPNotFound
+
+    def make_app(self) -> web.Application:
+        """Return the aiohttp application."""
+        app = web.Application()
+        app.router.add_get("/api/", self.handle_index)
+        app.router.add_get("/api/{endpoint}/", self.handle_list)
+        app.router.add_post("/api/{endpoint}/", self.handle_create)
+        app.router.add_delete("/api/{endpoint}/{id}/", self.handle_delete)
+        return app
+
+    async def async_start(self, host: str = "127.0.0.1") -> web.AppRunner:
+        """Serve the fake on a free port, stored in port."""
+        runner = web.AppRunner(self.make_app())
+        await runner.setup()
+        await web.TCPSite(runner, host, 0).start()
+        self.port = runner.addresses[0][1]
+        return runner
+
+
+if __name__ == "__main__":
+    # Serve on babybuddy's default port, e.g. to run the live tests locally:
+    # API_KEY=0123456789abcdef0123456789abcdef01234567 BABY_BUDDY_HOST=http://127.0.0.1 pytest
+    fake = FakeBabyBuddy(etags=True)
+    fake.add_child("ci", "placeholder")
+    web.run_app(fake.make_app(), host="127.0.0.1", port=8000)
@@ -0,0 +1,80 @@
+"""Test the babybuddy client against a fake server."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from custom_components.babybuddy.client import BabyBuddyClient
+from custom_components.babybuddy.const import ATTR_NOTES, ATTR_RESULTS, DEFAULT_PATH
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .fake_babybuddy import FakeBabyBuddy
+
+
+async def async_connect_client(
+    hass: HomeAssistant, fake: FakeBabyBuddy
+) -> BabyBuddyClient:
+    """Return a client connected to the fake babybuddy."""
+    client = BabyBuddyClient(
+        "http://127.0.0.1",
+        fake.port,
+        DEFAULT_PATH,
+        fake.api_key,
+        async_get_clientsession(hass),
+    )
+    await client.async_connect()
+    return client
+
+
+async def test_get_revalidates_cached_response(
+    hass: HomeAssistant, fake_babybuddy: FakeBabyBuddy
+) -> None:
+    """Test that a second GET sends the ETag and reuses the body on a 304."""
+    fake_babybuddy.etags = True
+    fake_babybuddy.seed(1)
+    client = await async_connect_client(hass, fake_babybuddy)
+
+    first = await client.async_get(ATTR_NOTES, "?limit=1")
+    second = await client.async_get(ATTR_NOTES, "?limit=1")
+
+    assert fake_babybuddy.requests[ATTR_NOTES] == 2
+    assert fake_babybuddy.not_modified == 1
+    assert client.cache_hits == 1
+    assert second is first
+
+    # A changed response is decoded again.
+    fake_babybuddy.add_record(
+        ATTR_NOTES,
+        first[ATTR_RESULTS][0]["child"],
+        note="new",
+        time=datetime.now(UTC).isoformat(),
+    )
+    third = await client.async_get(ATTR_NOTES, "?limit=1")
+
+    assert fake_babybuddy.not_modified == 1
+    assert third[ATTR_RESULTS][0]["note"] == "new"
+
+
+async def test_get_cache_evicts_least_recently_used(
+    hass: HomeAssistant,
+    fake_babybuddy: FakeBabyBuddy,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the response cache drops the least recently used URL."""
+    monkeypatch.setattr("custom_components.babybuddy.client.RESPONSE_CACHE_SIZE", 2)
+    fake_babybuddy.etags = True
+    fake_babybuddy.seed(1)
+    client = await async_connect_client(hass, fake_babybuddy)
+
+    for limit in (1, 2, 1, 3):
+        await client.async_get(ATTR_NOTES, f"?limit={limit}")
+
+    assert [url.rsplit("=", 1)[1] for url in client.cache] == ["1", "3"]
+    assert fake_babybuddy.not_modified == 1
+
+    # The evicted response is fetched in full again.
+    misses = client.cache_misses
+    await client.async_get(ATTR_NOTES, "?limit=2")
+    assert fake_babybuddy.not_modified == 1
+    assert client.cache_misses == misses + 1
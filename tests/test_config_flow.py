@@ -2,10 +2,16 @@
 
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.babybuddy.const import CONFIG_FLOW_VERSION, DEFAULT_NAME, DOMAIN
+from custom_components.babybuddy.const import (
+    ATTR_FEEDINGS,
+    CONFIG_FLOW_VERSION,
+    DEFAULT_NAME,
+    DOMAIN,
+)
+from custom_components.babybuddy.scheduler import poll_interval_option
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.const import CONF_API_KEY, CONF_HOST
+from homeassistant.const import CONF_API_KEY, CONF_HOST, CONF_SCAN_INTERVAL
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
@@ -115,3 +121,30 @@ async def test_options_flow(
 
     # Verify that the options were updated
     assert result["data"] == MOCK_OPTIONS
+
+
+async def test_options_flow_rejects_short_poll_interval(
+    hass: HomeAssistant,
+    setup_baby_buddy_entry_live: MockConfigEntry,
+):
+    """Test that an endpoint cannot poll more often than the update interval."""
+
+    result = await hass.config_entries.options.async_init(
+        setup_baby_buddy_entry_live.entry_id
+    )
+    option = poll_interval_option(ATTR_FEEDINGS)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={**MOCK_OPTIONS, CONF_SCAN_INTERVAL: 60, option: 30},
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {option: "poll_interval_too_short"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={**MOCK_OPTIONS, CONF_SCAN_INTERVAL: 60, option: 60},
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][option] == 60
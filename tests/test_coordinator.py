@@ -0,0 +1,628 @@
+"""Test the babybuddy coordinators against a fake server."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+import time
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.babybuddy.const import (
+    ATTR_ACTION,
+    ATTR_ACTION_ADD_ENTRIES,
+    ATTR_ACTION_ADD_NOTE,
+    ATTR_ACTION_DELETE_LAST_ENTRY,
+    ATTR_CHANGES,
+    ATTR_CHILD,
+    ATTR_ENTRIES,
+    ATTR_FEEDINGS,
+    ATTR_HEIGHT,
+    ATTR_NOTE,
+    ATTR_NOTES,
+    ATTR_TIMERS,
+    ATTR_WEIGHT,
+    BREAKER_FAILURE_THRESHOLD,
+    CONF_BULK_REFRESH,
+    CONF_DAILY_COUNTERS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_TIMEOUTS,
+    CONFIG_FLOW_VERSION,
+    DEFAULT_MEASUREMENT_POLL_INTERVAL,
+    DEFAULT_PATH,
+    DOMAIN,
+)
+from custom_components.babybuddy.scheduler import poll_interval_option
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_ID,
+    CONF_API_KEY,
+    CONF_HOST,
+    CONF_PATH,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from .fake_babybuddy import ORDER_KEYS, SEED_FIELDS, FakeBabyBuddy
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry failed requests without waiting."""
+    monkeypatch.setattr("custom_components.babybuddy.resilience.RETRY_BACKOFF_BASE", 0)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, fake: FakeBabyBuddy, options: dict[str, Any] | None = None
+) -> MockConfigEntry:
+    """Set up an entry for the fake babybuddy and wait for it to settle."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=CONFIG_FLOW_VERSION,
+        data={
+            CONF_HOST: "http://127.0.0.1",
+            CONF_PORT: fake.port,
+            CONF_PATH: DEFAULT_PATH,
+            CONF_API_KEY: fake.api_key,
+        },
+        options=options or {},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return entry
+
+
+def sensor_entity_id(hass: HomeAssistant, unique_id: str) -> str:
+    """Return the entity_id of a babybuddy sensor."""
+    entity_id = er.async_get(hass).async_get_entity_id(SENSOR_DOMAIN, DOMAIN, unique_id)
+    assert entity_id
+    return entity_id
+
+
+def child_states(hass: HomeAssistant, child_id: int) -> dict[str, str]:
+    """Return the states of the entities of a child's device."""
+    device = dr.async_get(hass).async_get_device({(DOMAIN, child_id)})
+    assert device
+    return {
+        entity.entity_id: hass.states.get(entity.entity_id).state
+        for entity in er.async_entries_for_device(er.async_get(hass), device.id)
+    }
+
+
+async def test_bulk_refresh_outage_makes_children_unavailable(
+    hass: HomeAssistant, fake_babybuddy: FakeBabyBuddy
+) -> None:
+    """Test that children polled in bulk go unavailable with babybuddy."""
+
+    fake_babybuddy.seed(2)
+    entry = await async_setup_entry(hass, fake_babybuddy, {CONF_BULK_REFRESH: True})
+    coordinator = entry.runtime_data.coordinator
+    child_ids = list(coordinator.child_coordinators)
+    assert all(
+        STATE_UNAVAILABLE not in child_states(hass, child_id).values()
+        for child_id in child_ids
+    )
+
+    # The children list fails, so the refresh fails as a whole.
+    fake_babybuddy.error_rate = 1.0
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert not coordinator.last_update_success
+    for child_id in child_ids:
+        assert set(child_states(hass, child_id).values()) == {STATE_UNAVAILABLE}
+
+    fake_babybuddy.error_rate = 0.0
+    coordinator.configure_polling()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    for child_id in child_ids:
+        assert STATE_UNAVAILABLE not in child_states(hass, child_id).values()
+
+    # Every endpoint of the children fails, but not the children list.
+    fake_babybuddy.failing = set(ORDER_KEYS)
+    coordinator.configure_polling()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.last_update_success
+    for child_id in child_ids:
+        assert not coordinator.child_coordinators[child_id].last_update_success
+        assert set(child_states(hass, child_id).values()) == {STATE_UNAVAILABLE}
+
+
+async def test_bulk_refresh_pages_and_falls_back_per_child(
+    hass: HomeAssistant, fake_babybuddy: FakeBabyBuddy, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that children past the page limit are fetched on their own."""
+
+    monkeypatch.setattr("custom_components.babybuddy.coordinator.BULK_PAGE_SIZE", 2)
+    monkeypatch.setattr("custom_components.babybuddy.coordinator.BULK_MAX_PAGES", 2)
+    # Ten feedings of the first child fill both pages.
+    fake_babybuddy.seed(1, 10)
+    old = fake_babybuddy.add_child("old", "entries")
+    end = datetime.now(UTC).replace(microsecond=0) - timedelta(days=2)
+    old_feeding = fake_babybuddy.add_record(
+        ATTR_FEEDINGS,
+        old["id"],
+        start=(end - timedelta(minutes=15)).isoformat(),
+        end=end.isoformat(),
+        **SEED_FIELDS[ATTR_FEEDINGS],
+    )
+    empty = fake_babybuddy.add_child("no", "entries")
+    entry = await async_setup_entry(hass, fake_babybuddy, {CONF_BULK_REFRESH: True})
+    coordinator = entry.runtime_data.coordinator
+    first = next(
+        child_id
+        for child_id in coordinator.child_coordinators
+        if child_id not in (old["id"], empty["id"])
+    )
+
+    fake_babybuddy.requests.clear()
+    coordinator.configure_polling()
+    await coordinator.async_refresh()
+
+    data = coordinator.data
+    assert data.entry(old["id"], ATTR_FEEDINGS).id == old_feeding["id"]
+    assert data.entry(empty["id"], ATTR_FEEDINGS) is None
+    assert (
+        data.entry(first, ATTR_FEEDINGS).id
+        == max(
+            (
+                record
+                for record in fake_babybuddy.records[ATTR_FEEDINGS]
+                if record["child"] == first
+            ),
+            key=lambda record: record["start"],
+        )["id"]
+    )
+    # Two pages, then one request for each child not found on them.
+    assert fake_babybuddy.requests[ATTR_FEEDINGS] == 4
+    # No child has a timer; the first page runs out and settles all of them.
+    assert fake_babybuddy.requests[ATTR_TIMERS] == 1
+
+    # A failing endpoint is skipped and keeps its entries.
+    fake_babybuddy.failing = {ATTR_FEEDINGS}
+    coordinator.configure_polling()
+    await coordinator.async_refresh()
+
+    assert coordinator.data.entry(old["id"], ATTR_FEEDINGS).id == old_feeding["id"]
+    assert all(
+        child.last_update_success for child in coordinator.child_coordinators.values()
+    )
+
+
+async def test_poll_interval_options_override_endpoints(
+    hass: HomeAssistant,
+    fake_babybuddy: FakeBabyBuddy,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that per-endpoint options set the base polling intervals."""
+
+    fake_babybuddy.seed(1)
+    entry = await async_setup_entry(
+        hass,
+        fake_babybuddy,
+        {
+            CONF_SCAN_INTERVAL: 120,
+            poll_interval_option(ATTR_WEIGHT): 7200,
+            poll_interval_option(ATTR_FEEDINGS): 300,
+            # Saved before the options flow rejected it.
+            poll_interval_option(ATTR_NOTES): 30,
+        },
+    )
+    child = next(iter(entry.runtime_data.coordinator.child_coordinators.values()))
+    schedules = child.scheduler.schedules
+
+    assert schedules[ATTR_WEIGHT].base_interval == timedelta(seconds=7200)
+    assert schedules[ATTR_FEEDINGS].base_interval == timedelta(seconds=300)
+    assert schedules[ATTR_TIMERS].base_interval == timedelta(seconds=120)
+    assert schedules[ATTR_HEIGHT].base_interval == timedelta(
+        seconds=DEFAULT_MEASUREMENT_POLL_INTERVAL
+    )
+    assert schedules[ATTR_NOTES].base_interval == timedelta(seconds=120)
+    assert f"Update interval for {ATTR_NOTES} of 30s is shorter" in caplog.text
+
+
+async def test_service_write_through_costs_one_post(
+    hass: HomeAssistant, fake_babybuddy: FakeBabyBuddy
+) -> None:
+    """Test that a created entry is merged without refetching it."""
+
+    fake_babybuddy.seed(1)
+    entry = await async_setup_entry(hass, fake_babybuddy)
+    child_id = next(iter(entry.runtime_data.coordinator.child_coordinators))
+    prefix = f"{fake_babybuddy.api_key}-{child_id}"
+    notes_entity_id = sensor_entity_id(hass, f"{prefix}-{ATTR_NOTES}")
+
+    fake_babybuddy.requests.clear()
+    await hass.services.async_call(
+        DOMAIN,
+        ATTR_ACTION_ADD_NOTE,
+        {ATTR_CHILD: sensor_entity_id(hass, prefix), ATTR_NOTE: "Written through"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert fake_babybuddy.requests == {f"POST {ATTR_NOTES}": 1}
+    created = fake_babybuddy.records[ATTR_NOTES][-1]
+    state = hass.states.get(notes_entity_id)
+    assert state.attributes[ATTR_ID] == created[ATTR_ID]
+    assert state.attributes[ATTR_NOTE] == "Written through"
+
+
+async def test_service_delete_refetches_only_its_endpoint(
+    hass: HomeAssistant, fake_babybuddy: FakeBabyBuddy
+) -> None:
+    """Test that a write refetches the endpoints it touched, not every one."""
+
+    fake_babybuddy.seed(1, 2)
+    entry = await async_setup_entry(hass, fake_babybuddy)
+    child_id = next(iter(entry.runtime_data.coordinator.child_coordinators))
+    notes_entity_id = sensor_entity_id(
+        hass, f"{fake_babybuddy.api_key}-{child_id}-{ATTR_NOTES}"
+    )
+    latest, previous = sorted(
+        fake_babybuddy.records[ATTR_NOTES],
+        key=lambda record: record[ORDER_KEYS[ATTR_NOTES]],
+        reverse=True,
+    )
+    assert hass.states.get(notes_entity_id).attributes[ATTR_ID] == latest[ATTR_ID]
+
+    fake_babybuddy.requests.clear()
+    await hass.services.async_call(
+        DOMAIN,
+        ATTR_ACTION_DELETE_LAST_ENTRY,
+        {ATTR_ENTITY_ID: notes_entity_id},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert fake_babybuddy.requests == {f"DELETE {ATTR_NOTES}": 1, ATTR_NOTES: 1}
+    state = hass.states.get(notes_entity_id)
+    assert state.attributes[ATTR_ID] == previous[ATTR_ID]
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+async def test_refresh_stays_within_concurrent_requests(
+    hass: HomeAssistant, fake_babybuddy: FakeBabyBuddy, bulk: bool
+) -> None:
+    """Test that no refresh has more requests in flight than the option."""
+
+    fake_babybuddy.seed(3)
+    fake_babybuddy.latency = 0.01
+    entry = await async_setup_entry(
+        hass,
+        fake_babybuddy,
+        {CONF_MAX_CONCURRENT_REQUESTS: 2, CONF_BULK_REFRESH: bulk},
+    )
+    assert fake_babybuddy.peak_in_flight <= 2
+
+    coordinator = entry.runtime_data.coordinator
+    fake_babybuddy.peak_in_flight = 0
+    coordinator.configure_polling()
+    await coordinator.async_refresh_all()
+    await hass.async_block_till_done()
+
+    assert fake_babybuddy.peak_in_flight == 2
+
+
+async def test_child_refreshes_are_timed_apart_from_parent(
+    hass: HomeAssistant, fake_babybuddy: FakeBabyBuddy
+) -> None:
+    """Test that child refresh durations do not mix with the parent's."""
+
+    fake_babybuddy.seed(2)
+    entry = await async_setup_entry(hass, fake_babybuddy)
+    coordinator = entry.runtime_data.coordinator
+    stats = coordinator.client.stats
+    parent_refreshes = len(stats.refresh_durations)
+
+    await coordinator.async_refresh_all()
+    await hass.async_block_till_done()
+
+    assert len(stats.refresh_durations) == parent_refreshes + 1
+    assert stats.child_refresh_durations.keys() == coordinator.child_coordinators.keys()
+    diagnostics = stats.as_dict()
+    assert diagnostics["refresh"]["count"] == parent_refreshes + 1
+    for child_id in coordinator.child_coordinators:
+        assert diagnostics["child_refresh"][child_id]["count"] >= 2
+
+
+async def test_windows_count_every_entry_made_between_polls(
+    hass: HomeAssistant, fake_babybuddy: FakeBabyBuddy
+) -> None:
+    """Test that a poll fetches the entries it missed into the windows."""
+
+    fake_babybuddy.seed(1)
+    entry = await async_setup_entry(hass, fake_babybuddy)
+    child = next(iter(entry.runtime_data.coordinator.child_coordinators.values()))
+    window = child.windows.windows["changes_today"]
+    assert child.windows.loaded
+    changes = window.value
+
+    now = datetime.now(UTC)
+    for minutes in (3, 2, 1):
+        fake_babybuddy.add_record(
+            ATTR_CHANGES,
+            child.child.id,
+            time=(now - timedelta(minutes=minutes)).isoformat(),
+            **SEED_FIELDS[ATTR_CHANGES],
+        )
+    fake_babybuddy.requests.clear()
+    child.configure_polling()
+    await child.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert window.value == changes + 3
+    assert not child.windows.stale
+    # The poll of the latest entry, then the records since the newest counted.
+    assert fake_babybuddy.requests[ATTR_CHANGES] == 2
+
+    fake_babybuddy.requests.clear()
+    child.configure_polling()
+    await child.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert window.value == changes + 3
+    assert fake_babybuddy.requests[ATTR_CHANGES] == 1
+
+
+async def test_counters_roll_over_once_every_endpoint_is_counted(
+    hass: HomeAssistant, fake_babybuddy: FakeBabyBuddy
+) -> None:
+    """Test that a new day replaces the counts only once all are fetched."""
+
+    fake_babybuddy.seed(1)
+    entry = await async_setup_entry(hass, fake_babybuddy, {CONF_DAILY_COUNTERS: True})
+    child = next(iter(entry.runtime_data.coordinator.child_coordinators.values()))
+    counters = child.counters
+    assert counters.counts.keys() == counters.endpoints
+    counts = dict(counters.counts)
+    yesterday = counters.day - timedelta(days=1)
+
+    counters.day = yesterday
+    fake_babybuddy.failing = {ATTR_FEEDINGS}
+    counters.schedule(set())
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert counters.counts == counts
+    assert counters.day == yesterday
+    assert ATTR_FEEDINGS in counters.pending
+
+    fake_babybuddy.failing = set()
+    fake_babybuddy.add_record(
+        ATTR_CHANGES,
+        child.child.id,
+        time=datetime.now(UTC).isoformat(),
+        **SEED_FIELDS[ATTR_CHANGES],
+    )
+    counters.schedule(set())
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert counters.day == yesterday + timedelta(days=1)
+    assert counters.counts == {**counts, ATTR_CHANGES: counts[ATTR_CHANGES] + 1}
+    assert not counters.pending
+
+
+async def test_batch_writes_are_scoped_to_their_task(
+    hass: HomeAssistant, fake_babybuddy: FakeBabyBuddy
+) -> None:
+    """Test that writes of other tasks do not wait for an open batch."""
+
+    fake_babybuddy.seed(1)
+    entry = await async_setup_entry(hass, fake_babybuddy)
+    coordinator = entry.runtime_data.coordinator
+    child_id = next(iter(coordinator.child_coordinators))
+    now = datetime.now(UTC).isoformat()
+    note = fake_babybuddy.add_record(ATTR_NOTES, child_id, note="batch", time=now)
+    changes = [
+        fake_babybuddy.add_record(
+            ATTR_CHANGES, child_id, time=now, **SEED_FIELDS[ATTR_CHANGES]
+        )
+        for _ in range(3)
+    ]
+
+    def latest_id(endpoint: str) -> int:
+        return coordinator.data.entry(child_id, endpoint).id
+
+    batched = asyncio.Event()
+    release = asyncio.Event()
+    late = asyncio.Event()
+
+    async def async_write_late() -> None:
+        await late.wait()
+        await coordinator.async_apply_entry(child_id, ATTR_CHANGES, changes[2])
+
+    async def async_batch() -> asyncio.Task[None]:
+        async with coordinator.async_batch_writes():
+            await coordinator.async_apply_entry(child_id, ATTR_NOTES, note)
+            # Started inside the batch, but writes after it ended.
+            writer = hass.async_create_task(async_write_late())
+            batched.set()
+            await release.wait()
+        return writer
+
+    batch = hass.async_create_task(async_batch())
+    await batched.wait()
+    assert latest_id(ATTR_NOTES) != note[ATTR_ID]
+
+    # A write of another task is pushed straight away...
+    await coordinator.async_apply_entry(child_id, ATTR_CHANGES, changes[0])
+    assert latest_id(ATTR_CHANGES) == changes[0][ATTR_ID]
+
+    # ...and so is a batch of another task.
+    async with coordinator.async_batch_writes():
+        await coordinator.async_apply_entry(child_id, ATTR_CHANGES, changes[1])
+    assert latest_id(ATTR_CHANGES) == changes[1][ATTR_ID]
+    assert latest_id(ATTR_NOTES) != note[ATTR_ID]
+
+    release.set()
+    writer = await batch
+    assert latest_id(ATTR_NOTES) == note[ATTR_ID]
+
+    late.set()
+    await writer
+    assert latest_id(ATTR_CHANGES) == changes[2][ATTR_ID]
+
+
+async def test_poll_runs_while_batch_is_posted(
+    hass: HomeAssistant, fake_babybuddy: FakeBabyBuddy
+) -> None:
+    """Test that a large batch of writes does not hold up polls."""
+
+    fake_babybuddy.seed(1)
+    entry = await async_setup_entry(
+        hass, fake_babybuddy, {CONF_MAX_CONCURRENT_REQUESTS: 2}
+    )
+    coordinator = entry.runtime_data.coordinator
+    child_id, child = next(iter(coordinator.child_coordinators.items()))
+    child_entity_id = sensor_entity_id(hass, f"{fake_babybuddy.api_key}-{child_id}")
+    fake_babybuddy.latency = 0.05
+
+    batch = hass.async_create_task(
+        hass.services.async_call(
+            DOMAIN,
+            ATTR_ACTION_ADD_ENTRIES,
+            {
+                ATTR_ENTRIES: [
+                    {
+                        ATTR_ACTION: ATTR_ACTION_ADD_NOTE,
+                        ATTR_CHILD: child_entity_id,
+                        ATTR_NOTE: f"note {index}",
+                    }
+                    for index in range(60)
+                ]
+            },
+            blocking=True,
+            return_response=True,
+        )
+    )
+    while not fake_babybuddy.requests[f"POST {ATTR_NOTES}"]:
+        await asyncio.sleep(0.01)
+
+    fake_babybuddy.requests.clear()
+    child.configure_polling()
+    await child.async_refresh()
+
+    assert child.last_update_success
+    assert fake_babybuddy.requests[ATTR_FEEDINGS] == 1
+    assert not batch.done()
+
+    response = await batch
+    assert len(response[ATTR_ENTRIES]) == 60
+    assert fake_babybuddy.requests[f"POST {ATTR_NOTES}"] < 60
+
+
+async def async_wait_for_queue(coordinator: Any) -> None:
+    """Wait until the write queue is empty."""
+    async with asyncio.timeout(10):
+        while coordinator.write_queue.depth:
+            await asyncio.sleep(0.05)
+
+
+async def test_write_deferred_at_once_while_circuit_open(
+    hass: HomeAssistant,
+    fake_babybuddy: FakeBabyBuddy,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that writes are queued without a request while babybuddy is down."""
+
+    monkeypatch.setattr(
+        "custom_components.babybuddy.write_queue.WRITE_QUEUE_RETRY_MIN", 0.1
+    )
+    fake_babybuddy.seed(1)
+    entry = await async_setup_entry(hass, fake_babybuddy)
+    coordinator = entry.runtime_data.coordinator
+    child_id = next(iter(coordinator.child_coordinators))
+    breaker = coordinator.client.breaker
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        breaker.record_failure()
+    assert breaker.is_open
+
+    fake_babybuddy.requests.clear()
+    await hass.services.async_call(
+        DOMAIN,
+        ATTR_ACTION_ADD_NOTE,
+        {
+            ATTR_CHILD: sensor_entity_id(hass, f"{fake_babybuddy.api_key}-{child_id}"),
+            ATTR_NOTE: "while down",
+        },
+        blocking=True,
+    )
+
+    assert coordinator.write_queue.depth == 1
+    assert not fake_babybuddy.requests
+
+    breaker.record_success()
+    await async_wait_for_queue(coordinator)
+
+    assert fake_babybuddy.requests[f"POST {ATTR_NOTES}"] == 1
+    assert coordinator.data.entry(child_id, ATTR_NOTES).note == "while down"
+
+
+async def test_slow_write_is_deferred_after_short_timeout(
+    hass: HomeAssistant,
+    fake_babybuddy: FakeBabyBuddy,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a write babybuddy is slow to answer returns and is not duplicated."""
+
+    monkeypatch.setattr(
+        "custom_components.babybuddy.write_queue.WRITE_INLINE_TIMEOUT", 0.2
+    )
+    fake_babybuddy.seed(1)
+    entry = await async_setup_entry(hass, fake_babybuddy)
+    coordinator = entry.runtime_data.coordinator
+    child_id = next(iter(coordinator.child_coordinators))
+    fake_babybuddy.latency = 1.0
+
+    start = time.monotonic()
+    await hass.services.async_call(
+        DOMAIN,
+        ATTR_ACTION_ADD_NOTE,
+        {
+            ATTR_CHILD: sensor_entity_id(hass, f"{fake_babybuddy.api_key}-{child_id}"),
+            ATTR_NOTE: "slow",
+        },
+        blocking=True,
+    )
+
+    assert time.monotonic() - start < fake_babybuddy.latency
+    assert coordinator.write_queue.depth == 1
+
+    await async_wait_for_queue(coordinator)
+
+    # The answer was not waited for, so the replay finds the landed note.
+    slow = [
+        note for note in fake_babybuddy.records[ATTR_NOTES] if note[ATTR_NOTE] == "slow"
+    ]
+    assert len(slow) == 1
+    assert coordinator.data.entry(child_id, ATTR_NOTES).id == slow[0][ATTR_ID]
+
+
+async def test_request_timeouts_from_options(
+    hass: HomeAssistant, fake_babybuddy: FakeBabyBuddy
+) -> None:
+    """Test that the request timeout of each verb can be set in the options."""
+
+    fake_babybuddy.seed(1)
+    entry = await async_setup_entry(
+        hass, fake_babybuddy, {CONF_SCAN_INTERVAL: 60, CONF_TIMEOUTS["GET"]: 2}
+    )
+    client = entry.runtime_data.coordinator.client
+
+    assert client.timeouts == {"DELETE": 10, "GET": 2, "POST": 10}
+
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, CONF_TIMEOUTS["POST"]: 30}
+    )
+    await hass.async_block_till_done()
+
+    assert client.timeouts == {"DELETE": 10, "GET": 2, "POST": 30}
@@ -18,3 +18,13 @@ async def test_get_config_entry_diagnostics(hass: HomeAssistant):
     # Ensure sensitive data in config_entry is redacted
     assert diagnostics["config_entry"]["data"][CONF_API_KEY] == REDACTED
     assert diagnostics["config_entry"]["data"][CONF_HOST] == REDACTED
+    # Ensure response cache counters are exposed
+    assert diagnostics["client"]["cache_hits"] >= 0
+    assert diagnostics["client"]["cache_misses"] > 0
+    # Ensure the polling schedule of each child is exposed
+    polling = next(iter(diagnostics["polling"].values()))
+    assert polling["weight"]["base_interval"] == 3600
+    assert polling["timers"]["next_poll"] is not None
+    # Ensure request stats are exposed
+    assert diagnostics["stats"]["refresh"]["count"] > 0
+    assert diagnostics["stats"]["endpoints"]["children"]["requests"] > 0
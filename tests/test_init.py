@@ -1,17 +1,38 @@
 """Test babybuddy sensors."""
 
+import asyncio
+from contextlib import aclosing
+from datetime import timedelta
+from http import HTTPStatus
+from typing import Any
+from unittest.mock import Mock, patch
+
 import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
+from custom_components.babybuddy.client import BabyBuddyClient
 from custom_components.babybuddy.const import (
     ATTR_ACTION_ADD_CHILD,
     ATTR_BABYBUDDY_CHILD,
+    ATTR_CHILDREN,
+    ATTR_ENDPOINTS,
     ATTR_FIRST_NAME,
     ATTR_ICON_CHILD_SENSOR,
     ATTR_LAST_NAME,
+    ATTR_RESULTS,
+    BREAKER_FAILURE_THRESHOLD,
     DOMAIN,
+    SNAPSHOT_SAVE_DELAY,
 )
-from homeassistant.const import ATTR_DEVICE_CLASS, ATTR_ICON
+from custom_components.babybuddy.coordinator import BabyBuddyCoordinator
+from custom_components.babybuddy.errors import CircuitOpenError, ConnectError
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_DEVICE_CLASS, ATTR_ICON, ATTR_RESTORED
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
 from .const import MOCK_BABY_SENSOR_ID, MOCK_SERVICE_ADD_CHILD_SCHEMA
 
@@ -42,3 +63,166 @@ async def test_service_add_child(
         state.attributes[ATTR_LAST_NAME]
         == MOCK_SERVICE_ADD_CHILD_SCHEMA[ATTR_LAST_NAME]
     )
+
+
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_concurrent_gets_are_coalesced(
+    hass: HomeAssistant,
+) -> None:
+    """Test that identical concurrent GETs share one request."""
+
+    client = hass.config_entries.async_entries(DOMAIN)[
+        0
+    ].runtime_data.coordinator.client
+    coalesced = client.coalesced
+    first, second = await asyncio.gather(
+        client.async_get(ATTR_CHILDREN), client.async_get(ATTR_CHILDREN)
+    )
+
+    assert first is second
+    assert client.coalesced == coalesced + 1
+    assert not client.in_flight
+
+
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_iter_records_follows_pages(
+    hass: HomeAssistant,
+) -> None:
+    """Test that records are streamed page by page and paging can stop early."""
+
+    client = hass.config_entries.async_entries(DOMAIN)[
+        0
+    ].runtime_data.coordinator.client
+    children = (await client.async_get(ATTR_CHILDREN))[ATTR_RESULTS]
+    cached = len(client.cache)
+    requests = client.stats.requests
+
+    records = [
+        record
+        async for record in client.async_iter_records(
+            ATTR_CHILDREN, ordering="id", page_size=1
+        )
+    ]
+
+    assert [record["id"] for record in records] == sorted(
+        child["id"] for child in children
+    )
+    assert client.stats.requests == requests + len(children)
+    # Pages are not kept in the response cache.
+    assert len(client.cache) == cached
+
+    requests = client.stats.requests
+    async with aclosing(
+        client.async_iter_records(ATTR_CHILDREN, page_size=1, prefetch=False)
+    ) as stream:
+        record = await anext(stream)
+
+    assert record["id"] in {child["id"] for child in children}
+    assert client.stats.requests == requests + 1
+
+
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_write_rejected_with_html_body(
+    hass: HomeAssistant,
+) -> None:
+    """Test that writes rejected with a non-JSON error page do not raise."""
+
+    client = hass.config_entries.async_entries(DOMAIN)[
+        0
+    ].runtime_data.coordinator.client
+    resp = Mock(status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    body = b"<html><body>413 Request Entity Too Large</body></html>"
+
+    with patch.object(client, "async_request", return_value=(resp, body)):
+        assert await client.async_post(ATTR_CHILDREN, {}) is None
+        # Logged, not raised.
+        await client.async_delete(ATTR_CHILDREN, "1")
+
+
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_circuit_breaker_fails_fast_and_probes(
+    hass: HomeAssistant,
+) -> None:
+    """Test that an open circuit rejects requests until a probe succeeds."""
+
+    client = hass.config_entries.async_entries(DOMAIN)[
+        0
+    ].runtime_data.coordinator.client
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        client.breaker.record_failure()
+    assert client.breaker.is_open
+
+    with pytest.raises(CircuitOpenError):
+        await client.async_get(ATTR_CHILDREN)
+
+    # Once the reset timeout has passed, a probe closes the circuit again.
+    client.breaker.opened_at -= client.breaker.reset_timeout
+    await client.async_get(ATTR_CHILDREN)
+
+    assert not client.breaker.is_open
+
+
+async def test_endpoint_map_restored_at_startup(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    setup_baby_buddy_entry_live: MockConfigEntry,
+) -> None:
+    """Test that setup uses the saved endpoint map and revalidates it."""
+
+    entry = setup_baby_buddy_entry_live
+    client = entry.runtime_data.coordinator.client
+    endpoints = dict(client.endpoints)
+    stored = hass_storage[f"{DOMAIN}.{entry.entry_id}.endpoints"]["data"]
+    assert stored[ATTR_ENDPOINTS] == endpoints
+
+    # A reload sets up without waiting for the endpoint index.
+    with patch.object(BabyBuddyClient, "async_connect", side_effect=ConnectError):
+        await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+    client = entry.runtime_data.coordinator.client
+    assert client.endpoints == endpoints
+    assert client.endpoints_cached
+
+    # A 404 from a stale endpoint rediscovers the map.
+    client.endpoints = {**endpoints, ATTR_CHILDREN: f"{client.url}/api/lorem/"}
+    assert await client.async_get(ATTR_CHILDREN)
+    assert client.endpoints == endpoints
+    assert not client.endpoints_cached
+
+
+async def test_snapshot_restored_at_startup(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    setup_baby_buddy_entry_live: MockConfigEntry,
+) -> None:
+    """Test that entities start from the last data while the refresh runs."""
+
+    entry = setup_baby_buddy_entry_live
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    assert f"{DOMAIN}.{entry.entry_id}.snapshot" in hass_storage
+
+    refresh = asyncio.Event()
+    async_update = BabyBuddyCoordinator.async_update
+
+    async def async_update_later(self: BabyBuddyCoordinator) -> Any:
+        await refresh.wait()
+        return await async_update(self)
+
+    with patch.object(BabyBuddyCoordinator, "async_update", async_update_later):
+        await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+        assert entry.state is ConfigEntryState.LOADED
+        state = hass.states.get(MOCK_BABY_SENSOR_ID)
+        assert state
+        assert state.attributes[ATTR_RESTORED]
+
+        refresh.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    state = hass.states.get(MOCK_BABY_SENSOR_ID)
+    assert state
+    assert ATTR_RESTORED not in state.attributes
@@ -0,0 +1,56 @@
+"""Test the babybuddy per-endpoint polling schedule."""
+
+from datetime import UTC, datetime, timedelta
+
+from custom_components.babybuddy.const import ATTR_NOTES, ATTR_WEIGHT
+from custom_components.babybuddy.scheduler import BabyBuddyPollScheduler
+
+BASE = timedelta(minutes=1)
+NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def test_idle_polls_back_off_up_to_limit() -> None:
+    """Test that each idle poll doubles the interval until max_backoff."""
+    scheduler = BabyBuddyPollScheduler()
+    scheduler.configure(ATTR_NOTES, BASE, 8)
+    assert scheduler.is_due(ATTR_NOTES, NOW)
+
+    intervals = []
+    now = NOW
+    for _ in range(5):
+        scheduler.polled(ATTR_NOTES, False, now)
+        intervals.append(scheduler.schedules[ATTR_NOTES].interval)
+        now = scheduler.schedules[ATTR_NOTES].next_poll
+
+    assert intervals == [BASE * 2, BASE * 4, BASE * 8, BASE * 8, BASE * 8]
+    assert not scheduler.is_due(ATTR_NOTES, now - BASE)
+    assert scheduler.is_due(ATTR_NOTES, now)
+
+
+def test_change_and_write_reset_interval() -> None:
+    """Test that a change found by a poll or a write resets the interval."""
+    scheduler = BabyBuddyPollScheduler()
+    scheduler.configure(ATTR_NOTES, BASE, 16)
+    for _ in range(3):
+        scheduler.polled(ATTR_NOTES, False, NOW)
+    assert scheduler.schedules[ATTR_NOTES].interval == BASE * 8
+
+    scheduler.polled(ATTR_NOTES, True, NOW)
+    assert scheduler.schedules[ATTR_NOTES].interval == BASE
+    assert scheduler.schedules[ATTR_NOTES].next_poll == NOW + BASE
+
+    for _ in range(3):
+        scheduler.polled(ATTR_NOTES, False, NOW)
+    scheduler.activity(ATTR_NOTES, NOW)
+    assert scheduler.schedules[ATTR_NOTES].interval == BASE
+    assert scheduler.schedules[ATTR_NOTES].next_poll == NOW + BASE
+
+
+def test_unconfigured_endpoint_is_always_due() -> None:
+    """Test that endpoints without a schedule are polled on every tick."""
+    scheduler = BabyBuddyPollScheduler()
+    scheduler.polled(ATTR_WEIGHT, False, NOW)
+    scheduler.activity(ATTR_WEIGHT, NOW)
+
+    assert scheduler.is_due(ATTR_WEIGHT, NOW)
+    assert scheduler.as_dict() == {}
@@ -1,10 +1,23 @@
 """Test babybuddy sensors."""
 
+import asyncio
+from dataclasses import FrozenInstanceError
+from datetime import timedelta
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
 import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
 from custom_components.babybuddy.const import (
+    ATTR_ACTION,
     ATTR_ACTION_ADD_BMI,
     ATTR_ACTION_ADD_DIAPER_CHANGE,
+    ATTR_ACTION_ADD_ENTRIES,
     ATTR_ACTION_ADD_HEAD_CIRCUMFERENCE,
     ATTR_ACTION_ADD_HEIGHT,
     ATTR_ACTION_ADD_MEDICATION,
@@ -13,8 +26,10 @@
     ATTR_ACTION_ADD_WEIGHT,
     ATTR_BMI,
     ATTR_CHILD,
+    ATTR_CHILDREN,
     ATTR_DOSAGE,
     ATTR_DOSAGE_UNIT,
+    ATTR_ENTRIES,
     ATTR_HEAD_CIRCUMFERENCE_UNDERSCORE,
     ATTR_HEIGHT,
     ATTR_ICON_HEAD,
@@ -29,10 +44,20 @@
     ATTR_NEXT_DOSE_TIME,
     ATTR_NOTE,
     ATTR_NOTES,
+    ATTR_QUEUED,
+    ATTR_RESULTS,
+    ATTR_SUCCESS,
     ATTR_TAGS,
+    ATTR_TIMER,
     ATTR_WEIGHT,
+    ATTR_WET,
+    CONF_DAILY_COUNTERS,
     DOMAIN,
 )
+from custom_components.babybuddy.entity import BabyBuddyChildDataSensor
+from custom_components.babybuddy.errors import ConnectError
+from custom_components.babybuddy.write_queue import QueuedWrite
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.components.sensor.const import (
     ATTR_STATE_CLASS,
     SensorDeviceClass,
@@ -43,11 +68,18 @@
     ATTR_DEVICE_ID,
     ATTR_ENTITY_ID,
     ATTR_ICON,
+    ATTR_ID,
     ATTR_NAME,
     ATTR_TEMPERATURE,
     ATTR_TIME,
+    CONF_API_KEY,
+    STATE_OFF,
+    STATE_ON,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import entity_registry as er
 from homeassistant.util import dt as dt_util
 
@@ -55,6 +87,8 @@
     MOCK_BABY_NAME,
     MOCK_BABY_SENSOR_ID,
     MOCK_BABY_SWITCH_ID,
+    MOCK_CONFIG,
+    MOCK_OPTIONS,
     MOCK_SERVICE_ADD_BMI_SCHEMA,
     MOCK_SERVICE_ADD_DIAPER_CHANGE,
     MOCK_SERVICE_ADD_HEAD_CIRCUMFERENCE,
@@ -449,6 +483,46 @@ async def test_service_add_medication_device_id_target(
     assert dt_util.parse_datetime(state.state) == MOCK_SERVICE_ADD_MEDICATION[ATTR_TIME]
 
 
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_next_dose_sensor_turns_on_at_dose_time(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the next dose sensor turns on when the dose falls due, without a poll."""
+
+    entity_id = f"binary_sensor.{MOCK_BABY_NAME}_next_dose_ready"
+    interval = MOCK_SERVICE_ADD_MEDICATION[ATTR_NEXT_DOSE_INTERVAL]
+    # Due before the next poll, so only the dose timer can turn it on.
+    time = dt_util.now().replace(microsecond=0) - interval + timedelta(seconds=10)
+    await hass.services.async_call(
+        DOMAIN,
+        ATTR_ACTION_ADD_MEDICATION,
+        {
+            ATTR_CHILD: MOCK_BABY_SENSOR_ID,
+            **MOCK_SERVICE_ADD_MEDICATION,
+            ATTR_TIME: time,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    state = hass.states.get(entity_id)
+
+    assert state
+    assert state.state == STATE_OFF
+    assert state.attributes[ATTR_NEXT_DOSE_TIME] == time + interval
+    medication = hass.states.get(f"sensor.{MOCK_BABY_NAME}_last_medication")
+    assert medication and medication.attributes[ATTR_NEXT_DOSE_READY] is False
+
+    freezer.tick(timedelta(seconds=15))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    state = hass.states.get(entity_id)
+    medication = hass.states.get(f"sensor.{MOCK_BABY_NAME}_last_medication")
+
+    assert state and state.state == STATE_ON
+    assert medication and medication.attributes[ATTR_NEXT_DOSE_READY] is True
+
+
 @pytest.mark.usefixtures("setup_baby_buddy_entry_live")
 async def test_service_add_note(
     hass: HomeAssistant,
@@ -644,3 +718,381 @@ async def test_service_add_weight_device_id_target(
 
     assert state
     assert state.state == str(MOCK_SERVICE_ADD_WEIGHT[ATTR_WEIGHT])
+
+
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_service_add_entries(
+    hass: HomeAssistant,
+) -> None:
+    """Test the "add entries" service call."""
+
+    entity_id = f"sensor.{MOCK_BABY_NAME}_last_weight"
+    response = await hass.services.async_call(
+        DOMAIN,
+        ATTR_ACTION_ADD_ENTRIES,
+        {
+            ATTR_ENTRIES: [
+                {
+                    ATTR_ACTION: ATTR_ACTION_ADD_NOTE,
+                    ATTR_CHILD: MOCK_BABY_SENSOR_ID,
+                    **MOCK_SERVICE_ADD_NOTE,
+                },
+                {
+                    ATTR_ACTION: ATTR_ACTION_ADD_WEIGHT,
+                    ATTR_CHILD: MOCK_BABY_SENSOR_ID,
+                    **MOCK_SERVICE_ADD_WEIGHT,
+                },
+            ]
+        },
+        blocking=True,
+        return_response=True,
+    )
+    state = hass.states.get(entity_id)
+
+    assert [result[ATTR_ACTION] for result in response[ATTR_ENTRIES]] == [
+        ATTR_ACTION_ADD_NOTE,
+        ATTR_ACTION_ADD_WEIGHT,
+    ]
+    assert all(result[ATTR_SUCCESS] for result in response[ATTR_ENTRIES])
+    assert response[ATTR_ENTRIES][1][ATTR_ID] == state.attributes[ATTR_ID]
+    assert state.state == str(MOCK_SERVICE_ADD_WEIGHT[ATTR_WEIGHT])
+
+
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_service_add_entries_invalid_entry(
+    hass: HomeAssistant,
+) -> None:
+    """Test that an invalid entry rejects the whole batch."""
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            ATTR_ACTION_ADD_ENTRIES,
+            {
+                ATTR_ENTRIES: [
+                    {
+                        ATTR_ACTION: ATTR_ACTION_ADD_NOTE,
+                        ATTR_CHILD: MOCK_BABY_SENSOR_ID,
+                        **MOCK_SERVICE_ADD_NOTE,
+                    },
+                    {
+                        ATTR_ACTION: ATTR_ACTION_ADD_WEIGHT,
+                        ATTR_CHILD: MOCK_BABY_SENSOR_ID,
+                    },
+                ]
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_write_queue_replays_deferred_writes(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a write made while babybuddy is unreachable is replayed."""
+
+    monkeypatch.setattr(
+        "custom_components.babybuddy.write_queue.WRITE_QUEUE_RETRY_MIN", 0.1
+    )
+    coordinator = hass.config_entries.async_entries(DOMAIN)[0].runtime_data.coordinator
+    queue_entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{MOCK_CONFIG[CONF_API_KEY]}-write_queue"
+    )
+    assert hass.states.get(queue_entity_id).state == "0"
+
+    # Point the notes endpoint at a closed port; reconnecting restores it.
+    coordinator.client.endpoints = {
+        **coordinator.client.endpoints,
+        ATTR_NOTES: "http://127.0.0.1:9/api/notes/",
+    }
+    note = {**MOCK_SERVICE_ADD_NOTE, ATTR_NOTE: "queued note"}
+    response = await hass.services.async_call(
+        DOMAIN,
+        ATTR_ACTION_ADD_ENTRIES,
+        {
+            ATTR_ENTRIES: [
+                {
+                    ATTR_ACTION: ATTR_ACTION_ADD_NOTE,
+                    ATTR_CHILD: MOCK_BABY_SENSOR_ID,
+                    **note,
+                }
+            ]
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response[ATTR_ENTRIES][0][ATTR_QUEUED]
+    for _ in range(50):
+        if not coordinator.write_queue.depth:
+            break
+        await asyncio.sleep(0.1)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(queue_entity_id).state == "0"
+    state = hass.states.get(f"sensor.{MOCK_BABY_NAME}_last_note")
+    assert state.attributes[ATTR_NOTE] == "queued note"
+
+
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_write_queue_drops_failed_writes(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test that a write failing other than on the connection is not kept."""
+
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    queue = entry.runtime_data.coordinator.write_queue
+    stored = f"{DOMAIN}.{entry.entry_id}.write_queue"
+
+    with patch.object(queue, "async_send", side_effect=ValueError("not JSON")):
+        assert await queue.async_post(ATTR_CHILDREN, {ATTR_NOTE: "lost"}, None) is None
+    assert not queue.depth
+    assert hass_storage[stored]["data"] == []
+
+    # A failing deferred write does not stop the drainer.
+    sent: list[str] = []
+
+    async def async_send(write: QueuedWrite, call_time: Any = None) -> None:
+        sent.append(write.id)
+        if write.id == "first":
+            raise ValueError("not JSON")
+
+    queue.writes = [
+        QueuedWrite(write_id, "POST", ATTR_CHILDREN, {}, None, deferred=True)
+        for write_id in ("first", "second")
+    ]
+    with patch.object(queue, "async_send", side_effect=async_send):
+        queue.async_start_drainer()
+        await queue.drainer
+    await hass.async_block_till_done()
+
+    assert sent == ["first", "second"]
+    assert not queue.depth
+    assert hass_storage[stored]["data"] == []
+
+
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_write_queue_replay_finds_landed_write(
+    hass: HomeAssistant,
+) -> None:
+    """Test that a write whose answer was lost is not sent again."""
+
+    coordinator = hass.config_entries.async_entries(DOMAIN)[0].runtime_data.coordinator
+    queue = coordinator.write_queue
+    client = coordinator.client
+    child_id = hass.states.get(MOCK_BABY_SENSOR_ID).attributes[ATTR_ID]
+    async_post = client.async_post
+
+    async def async_post_lost(*args: Any, **kwargs: Any) -> None:
+        await async_post(*args, **kwargs)
+        raise ConnectError("answer lost")
+
+    # Made long before it was sent, so babybuddy would stamp another time.
+    write = QueuedWrite(
+        "landed",
+        "POST",
+        ATTR_NOTES,
+        {ATTR_CHILD: child_id, ATTR_NOTE: "landed once"},
+        child_id,
+        created=(MOCK_SERVICE_ADD_NOTE[ATTR_TIME] - timedelta(hours=1)).isoformat(),
+    )
+    with patch.object(client, "async_post", side_effect=async_post_lost):
+        assert await queue.async_submit(write, ()) == {ATTR_QUEUED: "landed"}
+    await queue.drainer
+    await hass.async_block_till_done()
+
+    notes = await client.async_get(ATTR_NOTES, f"?child={child_id}&limit=100")
+    assert [
+        note for note in notes[ATTR_RESULTS] if note[ATTR_NOTE] == "landed once"
+    ] == [await queue.async_find_existing(write)]
+    assert not queue.depth
+
+    # A timer write without the timer's start and end matches nothing.
+    unpinned = QueuedWrite("unpinned", "POST", ATTR_NOTES, {ATTR_TIMER: 1}, child_id)
+    assert await queue.async_find_existing(unpinned) is None
+
+
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_server_request_sensors(
+    hass: HomeAssistant,
+) -> None:
+    """Test the request stats sensors of the server device."""
+
+    registry = er.async_get(hass)
+    requests_entity_id = registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{MOCK_CONFIG[CONF_API_KEY]}-requests"
+    )
+    refresh_entity_id = registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{MOCK_CONFIG[CONF_API_KEY]}-refresh_duration"
+    )
+
+    assert int(hass.states.get(requests_entity_id).state) > 0
+    assert hass.states.get(requests_entity_id).attributes["children"] > 0
+    assert float(hass.states.get(refresh_entity_id).state) > 0
+
+
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_only_changed_entries_write_state(
+    hass: HomeAssistant,
+) -> None:
+    """Test that sensors skip the state write if their entry is unchanged."""
+
+    coordinator = hass.config_entries.async_entries(DOMAIN)[0].runtime_data.coordinator
+    child_coordinator = next(iter(coordinator.child_coordinators.values()))
+    with patch.object(
+        BabyBuddyChildDataSensor, "async_write_ha_state", autospec=True
+    ) as write:
+        await child_coordinator.async_refresh()
+        written = [sensor for (sensor,), _ in write.call_args_list]
+        assert child_coordinator.changed_endpoints is not None
+        assert all(sensor.coordinator is child_coordinator for sensor in written)
+        assert {
+            sensor.entity_description.key for sensor in written
+        } <= child_coordinator.changed_endpoints
+
+        write.reset_mock()
+        await hass.services.async_call(
+            DOMAIN,
+            ATTR_ACTION_ADD_NOTE,
+            {ATTR_CHILD: MOCK_BABY_SENSOR_ID, **MOCK_SERVICE_ADD_NOTE},
+            blocking=True,
+        )
+        written = [
+            sensor.entity_description.key for (sensor,), _ in write.call_args_list
+        ]
+
+    assert written == [ATTR_NOTES]
+
+
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_refresh_shares_unchanged_entries(
+    hass: HomeAssistant,
+) -> None:
+    """Test that a refresh keeps unchanged entries and never mutates them."""
+
+    coordinator = hass.config_entries.async_entries(DOMAIN)[0].runtime_data.coordinator
+    child_coordinator = next(iter(coordinator.child_coordinators.values()))
+    previous = child_coordinator.data
+    await child_coordinator.async_refresh()
+
+    assert child_coordinator.data
+    assert (
+        coordinator.data.entries[child_coordinator.child.id] is child_coordinator.data
+    )
+    for endpoint, entry in child_coordinator.data.items():
+        if entry == previous.get(endpoint):
+            assert entry is previous[endpoint]
+            assert endpoint not in child_coordinator.changed_endpoints
+    entry = next(iter(child_coordinator.data.values()))
+    with pytest.raises(FrozenInstanceError):
+        entry.id = 0
+
+
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_failing_child_keeps_others_available(
+    hass: HomeAssistant,
+) -> None:
+    """Test that a child whose polls fail does not take the others down."""
+
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    coordinator = entry.runtime_data.coordinator
+    failing, *others = coordinator.child_coordinators.values()
+    assert others
+    fetch = coordinator.async_fetch_child_endpoint
+
+    async def fetch_or_fail(semaphore, child, endpoint):
+        if child.id == failing.child.id:
+            return None
+        return await fetch(semaphore, child, endpoint)
+
+    with patch.object(coordinator, "async_fetch_child_endpoint", fetch_or_fail):
+        coordinator.configure_polling()
+        await coordinator.async_refresh_all()
+
+    assert coordinator.last_update_success
+    assert not failing.last_update_success
+    assert all(other.last_update_success for other in others)
+    entity_registry = er.async_get(hass)
+    for child_coordinator in (failing, *others):
+        entity_id = entity_registry.async_get_entity_id(
+            SENSOR_DOMAIN,
+            DOMAIN,
+            f"{entry.data[CONF_API_KEY]}-{child_coordinator.child.id}",
+        )
+        state = hass.states.get(entity_id)
+        assert (state.state == STATE_UNAVAILABLE) is (child_coordinator is failing)
+
+
+@pytest.mark.usefixtures("setup_baby_buddy_entry_live")
+async def test_aggregate_sensor_counts_written_entries(
+    hass: HomeAssistant,
+) -> None:
+    """Test that a today sensor counts an entry without fetching the day."""
+
+    entity_id = f"sensor.{MOCK_BABY_NAME}_changes_today"
+    state = hass.states.get(entity_id)
+    assert state
+    assert state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN)
+    changes, wet = int(state.state), state.attributes[ATTR_WET]
+
+    await hass.services.async_call(
+        DOMAIN,
+        ATTR_ACTION_ADD_DIAPER_CHANGE,
+        {
+            ATTR_CHILD: MOCK_BABY_SENSOR_ID,
+            **MOCK_SERVICE_ADD_DIAPER_CHANGE,
+            ATTR_TIME: dt_util.now(),
+        },
+        blocking=True,
+    )
+    state = hass.states.get(entity_id)
+
+    assert state.attributes[ATTR_ICON] == ATTR_ICON_PAPER_ROLL
+    assert int(state.state) == changes + 1
+    assert state.attributes[ATTR_WET] == wet + 1
+
+
+async def test_daily_counter_counts_after_changes(
+    hass: HomeAssistant,
+    setup_baby_buddy_entry_live: MockConfigEntry,
+) -> None:
+    """Test that a daily counter is refetched only when its endpoint changed."""
+
+    entry = setup_baby_buddy_entry_live
+    hass.config_entries.async_update_entry(
+        entry, options={**MOCK_OPTIONS, CONF_DAILY_COUNTERS: True}
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    entity_id = f"sensor.{MOCK_BABY_NAME}_change_count_today"
+    state = hass.states.get(entity_id)
+    assert state
+    changes = int(state.state)
+
+    await hass.services.async_call(
+        DOMAIN,
+        ATTR_ACTION_ADD_DIAPER_CHANGE,
+        {
+            ATTR_CHILD: MOCK_BABY_SENSOR_ID,
+            **MOCK_SERVICE_ADD_DIAPER_CHANGE,
+            ATTR_TIME: dt_util.now(),
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert int(hass.states.get(entity_id).state) == changes + 1
+
+    # A poll that finds nothing new does not count again.
+    coordinator = entry.runtime_data.coordinator
+    child_coordinator = coordinator.child_coordinators[
+        hass.states.get(MOCK_BABY_SENSOR_ID).attributes[ATTR_ID]
+    ]
+    counter = child_coordinator.counters.counter
+    coordinator.configure_polling()
+    await child_coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert child_coordinator.changed_endpoints == set()
+    assert child_coordinator.counters.counter is counter
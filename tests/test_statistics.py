@@ -0,0 +1,83 @@
+"""Test babybuddy history import into long-term statistics."""
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.babybuddy.const import (
+    ATTR_ACTION_ADD_FEEDING,
+    ATTR_CHILD,
+    ATTR_FEEDINGS,
+    ATTR_RESULTS,
+    CONF_IMPORT_HISTORY,
+    DOMAIN,
+    STATISTIC_TYPES,
+)
+from custom_components.babybuddy.history import statistic_id
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.statistics import get_last_statistics
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.const import ATTR_ID, CONF_API_KEY
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    MOCK_BABY_SENSOR_ID,
+    MOCK_CONFIG,
+    MOCK_OPTIONS,
+    MOCK_SERVICE_ADD_FEEDING_START_STOP,
+)
+
+
+@pytest.fixture(autouse=True)
+def mock_recorder_before_hass(async_setup_recorder_instance) -> None:
+    """Set up the recorder database before hass."""
+
+
+async def test_history_import(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    setup_baby_buddy_entry_live: MockConfigEntry,
+) -> None:
+    """Test that the feeding history is imported into long-term statistics."""
+
+    async def async_add_feeding() -> None:
+        await hass.services.async_call(
+            DOMAIN,
+            ATTR_ACTION_ADD_FEEDING,
+            {ATTR_CHILD: MOCK_BABY_SENSOR_ID, **MOCK_SERVICE_ADD_FEEDING_START_STOP},
+            blocking=True,
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    entry = setup_baby_buddy_entry_live
+    # Backfill the feedings made so far, then import the next one on its own.
+    await async_add_feeding()
+    hass.config_entries.async_update_entry(
+        entry, options={**MOCK_OPTIONS, CONF_IMPORT_HISTORY: True}
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    await async_add_feeding()
+    await async_wait_recording_done(hass)
+
+    coordinator = entry.runtime_data.coordinator
+    child = coordinator.data.children[
+        hass.states.get(MOCK_BABY_SENSOR_ID).attributes[ATTR_ID]
+    ]
+    feedings = await coordinator.client.async_get(
+        ATTR_FEEDINGS, f"?child={child.id}&limit=1000"
+    )
+    statistic = statistic_id(child, STATISTIC_TYPES[0])
+    statistics = await recorder_mock.async_add_executor_job(
+        get_last_statistics, hass, 1, statistic, False, {"sum"}
+    )
+    assert statistics[statistic][0]["sum"] == pytest.approx(
+        sum(feeding["amount"] or 0 for feeding in feedings[ATTR_RESULTS])
+    )
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        SENSOR_DOMAIN, DOMAIN, f"{MOCK_CONFIG[CONF_API_KEY]}-history"
+    )
+    assert hass.states.get(entity_id).state == "100.0"